@@ -14,10 +14,15 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
 try:
     from scraper_modules.website_scraper import WebsiteScraper
     from scraper_modules.google_scraper import GoogleScraper
+    # Busca do Instagram só com HTTP: não depende do Selenium
+    from scraper_modules.instagram_http import fetch_profile
+    from scraper_modules.deadline import Deadline, DEADLINE_CONFIG
 except ImportError as e:
     print(f"Erro ao importar módulos: {e}")
     WebsiteScraper = None
     GoogleScraper = None
+    fetch_profile = None
+    Deadline = None
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -139,8 +144,9 @@ def analisar():
             return jsonify({'error': 'Dados JSON inválidos'}), 400
         
         website_url = data.get('website_url', '').strip()
+        instagram_url = (data.get('instagram_url') or '').strip()
         incluir_google = data.get('incluir_google', True)
-        incluir_instagram = data.get('incluir_instagram', False)
+        incluir_instagram = data.get('incluir_instagram', bool(instagram_url))
         
         print(f"🔍 Analisando: {website_url}")
         
@@ -153,11 +159,16 @@ def analisar():
             'success': True
         }
         
-        # Análise do website
+        # Prazo da função (maxDuration do vercel.json): cada etapa usa o que sobrar e
+        # devolve resultado parcial em vez de a plataforma encerrar a requisição
+        prazo = Deadline(DEADLINE_CONFIG['serverless_seconds']) if Deadline else None
+        
+        # Análise do website (no máximo um terço do prazo: Google e Instagram vêm depois)
         if WebsiteScraper:
             try:
                 scraper = WebsiteScraper()
-                website_data = scraper.scrape(website_url)
+                prazo_site = prazo.child(prazo.remaining() / 3) if prazo else None
+                website_data = scraper.scrape(website_url, deadline=prazo_site)
                 result['website_analysis'] = {
                     'raw_data': website_data,
                     'analysis': AnalysisEngine.analyze_website_data(website_data)
@@ -175,11 +186,28 @@ def analisar():
                 'analysis': AnalysisEngine.analyze_website_data(None)
             }
         
+        # Análise do Instagram via HTTP (sem fallback para Selenium em ambiente serverless);
+        # antes do Google: são no máximo duas requisições, e o Google usa o restante do prazo
+        if incluir_instagram and not instagram_url:
+            result['instagram_data'] = {'error': 'URL do Instagram deve ser fornecida'}
+        elif incluir_instagram and fetch_profile:
+            try:
+                result['instagram_data'] = fetch_profile(instagram_url, deadline=prazo)
+                if result['instagram_data'].get('error'):
+                    print(f"⚠️ Instagram: {result['instagram_data']['error']}")
+                else:
+                    print("✅ Análise do Instagram concluída")
+            except Exception as e:
+                print(f"❌ Erro na análise do Instagram: {e}")
+                result['instagram_data'] = {'error': str(e)}
+        elif incluir_instagram:
+            result['instagram_data'] = {'error': 'Busca do Instagram não disponível'}
+        
         # Análise do Google (se solicitada)
         if incluir_google and GoogleScraper:
             try:
                 google_scraper = GoogleScraper()
-                google_data = google_scraper.search(website_url)
+                google_data = google_scraper.search_website_info(website_url, deadline=prazo)
                 result['google_results'] = google_data
                 print("✅ Análise do Google concluída")
             except Exception as e:
@@ -188,12 +216,16 @@ def analisar():
         elif incluir_google:
             result['google_results'] = {'error': 'GoogleScraper não disponível'}
         
-        # Análise do Instagram (placeholder)
-        if incluir_instagram:
-            result['instagram_data'] = {
-                'message': 'Análise do Instagram não implementada na versão Vercel',
-                'reason': 'Selenium não suportado em ambiente serverless'
-            }
+        # Etapas que pararam no prazo vêm marcadas com 'partial'
+        parciais = [nome for nome, dados in (
+            ('website', (result.get('website_analysis') or {}).get('raw_data')),
+            ('google', result.get('google_results')),
+            ('instagram', result.get('instagram_data'))
+        ) if (dados or {}).get('partial')]
+        result['partial'] = bool(parciais)
+        result['partial_stages'] = parciais
+        if prazo:
+            result['deadline'] = prazo.summary()
         
         return jsonify(result)
     
@@ -0,0 +1,99 @@
+# analysis_cache.py - Cache de análises por domínio com coalescência de requisições
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Tuple
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuração do cache (sobrescrevível por variáveis de ambiente)
+ANALYSIS_CACHE_CONFIG = {
+    'enabled': os.getenv('ANALYSIS_CACHE_ENABLED', 'true').lower() == 'true',
+    'ttl': int(os.getenv('ANALYSIS_CACHE_TTL', '900')),
+    'max_entries': int(os.getenv('ANALYSIS_CACHE_MAX_ENTRIES', '256'))
+}
+
+STATUS_FRESH = 'fresh'
+STATUS_CACHED = 'cached'
+STATUS_COALESCED = 'coalesced'
+
+
+class _InFlight:
+    """Cálculo em andamento aguardado pelas requisições idênticas"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class AnalysisCache:
+    """Resultados recentes por chave (LRU com TTL) e uma única execução por chave em andamento"""
+
+    def __init__(self, ttl: int = 900, max_entries: int = 256, enabled: bool = True):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], refresh: bool = False) -> Tuple[Any, str]:
+        """Retorna (resultado, status) com status 'fresh', 'cached' ou 'coalesced'"""
+        with self._lock:
+            if self.enabled and not refresh:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    expires_at, result = entry
+                    if expires_at > time.monotonic():
+                        self._entries.move_to_end(key)
+                        return result, STATUS_CACHED
+                    del self._entries[key]
+
+            call = self._in_flight.get(key)
+            if call is not None:
+                owner = False
+            else:
+                call = self._in_flight[key] = _InFlight()
+                owner = True
+
+        if not owner:
+            # Mesma chave já em cálculo: espera o resultado em vez de repetir o trabalho
+            logger.info(f"🔗 Aguardando análise em andamento de '{key}'")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, STATUS_COALESCED
+
+        try:
+            call.result = compute()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+                if call.error is None and self.enabled:
+                    self._entries[key] = (time.monotonic() + self.ttl, call.result)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            call.done.set()
+        return call.result, STATUS_FRESH
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+# Cache compartilhado pelo processo
+analysis_cache = AnalysisCache(
+    ttl=ANALYSIS_CACHE_CONFIG['ttl'],
+    max_entries=ANALYSIS_CACHE_CONFIG['max_entries'],
+    enabled=ANALYSIS_CACHE_CONFIG['enabled']
+)
@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, send_from_directory, send_file
+from flask import Flask, request, jsonify, send_from_directory, send_file, Response, stream_with_context
 from flask_cors import CORS
 from dotenv import load_dotenv
 import os
@@ -6,7 +6,22 @@ from datetime import datetime
 from supabase import create_client, Client
 from scraper_modules.website_scraper import WebsiteScraper
 from scraper_modules.google_scraper import GoogleScraper
+from scraper_modules.instagram_scraper import InstagramScraper
+from scraper_modules.instagram_config import SCRAPING_ENABLED, SELENIUM_CONFIG, HTTP_FETCH_CONFIG
+from scraper_modules.instagram_http import fetch_profile
+from scraper_modules.selector_registry import selector_registry
+from scraper_modules.profile_cache import profile_cache
+from scraper_modules.instagram_page_parser import extract_username
+from scraper_modules.deadline import Deadline, DEADLINE_CONFIG, stage_deadline
+from stage_executor import Stage, StageTimeoutError, stage_executor, STAGE_CONFIG
+from jobs import JobManager
+from batch_scheduler import BatchScheduler, BATCH_CONFIG
+from analysis_cache import analysis_cache
+from persistence import WriteBehindPersister
 import json
+import time
+import queue
+import threading
 import traceback
 
 # Carregar variáveis de ambiente
@@ -38,6 +53,17 @@ else:
     print("⚠️  Supabase não configurado - variáveis de ambiente não encontradas")
     supabase = None
 
+def inserir_analises(linhas):
+    """Insere um lote de análises no Supabase"""
+    supabase.table('analyses').insert(linhas).execute()
+
+# Gravação em segundo plano: a resposta não espera o banco
+if supabase:
+    persister = WriteBehindPersister(inserir_analises)
+    persister.start()
+else:
+    persister = None
+
 class AnalysisEngine:
     @staticmethod
     def analyze_website_data(website_data):
@@ -83,6 +109,11 @@ class AnalysisEngine:
         else:
             melhorias.append("**Otimização para SEO**: Implementar estratégias de SEO técnico e de conteúdo. Criar um calendário editorial focado em palavras-chave relevantes para o negócio, otimizar meta descrições e titles, e desenvolver conteúdo que responda às dúvidas do público-alvo.")
         
+        # Tempo de resposta do servidor (TTFB), separado do tempo de download
+        timing = website_data.get('timing') or {}
+        if timing.get('ttfb_ms', 0) > 800:
+            melhorias.append(f"**Tempo de Resposta do Servidor**: O servidor levou {timing['ttfb_ms']:.0f}ms para começar a responder (>800ms). Recomenda-se revisar hospedagem, cache de páginas no servidor e uso de CDN.")
+        
         # CRO (Conversion Rate Optimization)
         melhorias.append("**Otimização de Conversão (CRO)**: Análise detalhada do funil de conversão para identificar pontos de atrito. Implementação de CTAs mais proeminentes, otimização de formulários e criação de landing pages específicas para diferentes campanhas.")
         
@@ -198,6 +229,62 @@ class AnalysisEngine:
             'estrategias_google': estrategias_google
         }
     
+    @staticmethod
+    def analyze_instagram_data(instagram_data):
+        """Analisa dados do Instagram e gera relatório profissional"""
+        if instagram_data.get('scraping_disabled'):
+            return {
+                'perfil_analise': instagram_data.get('message', 'Scraping do Instagram desativado.'),
+                'atividade_status': 'Status de atividade não disponível.',
+                'tipo_conta': 'Não identificado',
+                'bio_status': 'Não foi possível verificar',
+                'estrategias_recomendadas': ['Recomenda-se análise manual do perfil para estratégias personalizadas.']
+            }
+
+        followers = instagram_data.get('followers')
+        following = instagram_data.get('following')
+        posts_count = instagram_data.get('posts_count')
+
+        perfil_analise = (
+            f"{AnalysisEngine._format_number(followers)} seguidores, "
+            f"{AnalysisEngine._format_number(following)} seguindo e "
+            f"{AnalysisEngine._format_number(posts_count)} publicações."
+        )
+
+        # Atividade recente
+        last_post_date = instagram_data.get('last_post_date')
+        if last_post_date:
+            try:
+                dias = (datetime.now() - datetime.strptime(last_post_date, '%Y-%m-%d')).days
+                if dias > 30:
+                    atividade_status = f"Perfil sem atividade há {dias} dias (última postagem em {last_post_date})."
+                else:
+                    atividade_status = f"Perfil ativo - última postagem em {last_post_date}."
+            except ValueError:
+                atividade_status = f"Última postagem em {last_post_date}."
+        else:
+            atividade_status = 'Status de atividade não disponível.'
+
+        tipo_conta = 'Conta comercial' if instagram_data.get('is_business_account') else 'Conta pessoal'
+        bio_status = 'Bio preenchida' if instagram_data.get('bio_complete') else 'Bio incompleta ou ausente'
+
+        estrategias = []
+        if not instagram_data.get('is_business_account'):
+            estrategias.append("**Conta Comercial**: Migrar para conta comercial para liberar métricas, botões de contato e anúncios.")
+        if not instagram_data.get('bio_complete'):
+            estrategias.append("**Bio Estratégica**: Completar a bio com proposta de valor, localização e CTA para reservas.")
+        if not instagram_data.get('profile_picture'):
+            estrategias.append("**Identidade Visual**: Definir foto de perfil com a marca para reforçar o reconhecimento.")
+        estrategias.append("**Calendário de Conteúdo**: Manter frequência de publicações com Reels e Stories mostrando a experiência do cliente.")
+
+        return {
+            'perfil_analise': perfil_analise,
+            'atividade_status': atividade_status,
+            'tipo_conta': tipo_conta,
+            'bio_status': bio_status,
+            'estrategias_recomendadas': estrategias
+        }
+
     @staticmethod
     def _format_number(num):
         """Formata números para exibição"""
@@ -210,6 +297,305 @@ class AnalysisEngine:
         else:
             return str(num)
 
+def analisar_website(website_url, deadline=None):
+    """Executa o estágio de análise do website"""
+    print(f"🔍 Iniciando análise do website: {website_url}")
+    website_scraper = WebsiteScraper()
+    website_data = website_scraper.scrape(website_url, deadline=deadline)
+    website_analysis = AnalysisEngine.analyze_website_data(website_data)
+    
+    print("✅ Análise do website concluída")
+    return {
+        'url': website_url,
+        'raw_data': website_data,
+        'relatorio': {
+            'titulo': f"Análise do Site: {website_url}",
+            'estrutura_desenvolvedor': website_analysis['estrutura_desenvolvedor'],
+            'melhorias_identificadas': website_analysis['melhorias_identificadas'],
+            'necessidades_identificadas': website_analysis['necessidades_identificadas']
+        }
+    }
+
+def fallback_website(website_url, error):
+    """Relatório padrão quando a análise do website falha"""
+    print(f"❌ Erro na análise do website: {error}")
+    return {
+        'url': website_url,
+        'raw_data': {'error': f'Erro ao analisar website: {str(error)}'},
+        'relatorio': {
+            'titulo': f"Análise do Site: {website_url}",
+            'estrutura_desenvolvedor': 'Não foi possível analisar a estrutura do site devido a problemas técnicos.',
+            'melhorias_identificadas': ['Recomenda-se uma análise técnica manual para identificar oportunidades de melhoria.'],
+            'necessidades_identificadas': ['Verificação técnica necessária para diagnóstico completo.']
+        }
+    }
+
+def analisar_google(website_url, on_section=None, cancel_event=None, deadline=None):
+    """Executa o estágio de análise do Google"""
+    print(f"🔍 Iniciando análise do Google para: {website_url}")
+    google_scraper = GoogleScraper(cancel_event=cancel_event)
+    google_data = google_scraper.search_website_info(website_url, on_section=on_section, deadline=deadline)
+    if google_data.get('partial'):
+        print(f"⏱️ Google parcial: seções puladas {google_data['deadline']['skipped_sections']}")
+    google_analysis = AnalysisEngine.analyze_google_data(google_data)
+    
+    print("✅ Análise do Google concluída")
+    return {
+        'url': website_url,
+        'raw_data': google_data,
+        'relatorio': {
+            'titulo': f"Análise do Google: {website_url}",
+            'seo_analise': google_analysis['seo_analise'],
+            'presenca_social': google_analysis['presenca_social'],
+            'presenca_publicitaria': google_analysis['presenca_publicitaria'],
+            'reputacao_online': google_analysis['reputacao_online'],
+            'posicao_mercado': google_analysis['posicao_mercado'],
+            'estrategias_google': google_analysis['estrategias_google']
+        }
+    }
+
+def fallback_google(website_url, error):
+    """Relatório padrão quando a análise do Google falha"""
+    print(f"❌ Erro na análise do Google: {error}")
+    return {
+        'url': website_url,
+        'raw_data': {'error': f'Erro ao analisar no Google: {str(error)}'},
+        'relatorio': {
+            'titulo': f"Análise do Google: {website_url}",
+            'seo_analise': 'Não foi possível realizar análise SEO via Google.',
+            'presenca_social': 'Análise de presença social não disponível.',
+            'presenca_publicitaria': 'Análise publicitária não disponível.',
+            'reputacao_online': 'Análise de reputação não disponível.',
+            'posicao_mercado': 'Análise de mercado não disponível.',
+            'estrategias_google': ['Recomenda-se análise manual para estratégias personalizadas.']
+        }
+    }
+
+def raspar_instagram(instagram_url, deadline=None):
+    """Extrai o perfil com uma sessão do pool do Selenium"""
+    instagram_scraper = None
+    try:
+        instagram_scraper = InstagramScraper()
+        if not instagram_scraper.driver and SCRAPING_ENABLED:
+            raise Exception("Driver do Selenium não disponível")
+        return instagram_scraper.scrape(instagram_url, deadline=deadline)
+    finally:
+        # Devolver a sessão ao pool de drivers
+        if instagram_scraper:
+            instagram_scraper.close_driver()
+
+def raspar_instagram_abas(instagram_urls, deadline=None):
+    """Extrai vários perfis em abas de uma única sessão do pool"""
+    instagram_scraper = None
+    try:
+        instagram_scraper = InstagramScraper()
+        if not instagram_scraper.driver and SCRAPING_ENABLED:
+            raise Exception("Driver do Selenium não disponível")
+        return instagram_scraper.scrape_many(instagram_urls, deadline=deadline)
+    finally:
+        if instagram_scraper:
+            instagram_scraper.close_driver()
+
+class BlocoInstagram:
+    """Perfis de um lote extraídos juntos; o primeiro estágio do bloco a rodar busca todos, dentro do
+    próprio prazo, e os demais esperam pelo resultado só até o fim dos seus prazos"""
+    
+    def __init__(self, instagram_urls):
+        self.instagram_urls = instagram_urls
+        self._resultados = None
+        self._erro = None
+        self._lock = threading.Lock()
+    
+    def resultado(self, instagram_url, deadline=None):
+        restante = deadline.remaining() if deadline is not None else float('inf')
+        if not self._lock.acquire(timeout=-1 if restante == float('inf') else restante):
+            raise StageTimeoutError('prazo esgotado aguardando o bloco de perfis do Instagram')
+        try:
+            if self._resultados is None and self._erro is None:
+                try:
+                    self._resultados = dict(zip(self.instagram_urls,
+                                                raspar_instagram_abas(self.instagram_urls, deadline)))
+                except Exception as e:
+                    # Guardado uma vez: os outros estágios do bloco não repetem a extração de todos
+                    self._erro = e
+        finally:
+            self._lock.release()
+        if self._erro is not None:
+            raise self._erro
+        return self._resultados[instagram_url]
+
+def montar_blocos_instagram(instagram_urls):
+    """Agrupa os perfis do lote em blocos do tamanho do limite de abas por sessão"""
+    perfis = list(dict.fromkeys(url for url in instagram_urls if url))
+    blocos = {}
+    tamanho = SELENIUM_CONFIG['max_tabs']
+    for i in range(0, len(perfis), tamanho):
+        bloco = BlocoInstagram(perfis[i:i + tamanho])
+        blocos.update(dict.fromkeys(bloco.instagram_urls, bloco))
+    return blocos
+
+def buscar_instagram(instagram_url, bloco=None, deadline=None):
+    """Perfil via HTTP; o Selenium só é usado quando o Instagram bloqueia a busca"""
+    raspar = None
+    if SCRAPING_ENABLED:
+        raspar = (lambda: bloco.resultado(instagram_url, deadline)) if bloco else (
+            lambda: raspar_instagram(instagram_url, deadline))
+    return fetch_profile(instagram_url, webdriver_fallback=raspar, deadline=deadline)
+
+def analisar_instagram(instagram_url, bloco=None, deadline=None):
+    """Executa o estágio de análise do Instagram"""
+    print(f"📱 Iniciando análise do Instagram: {instagram_url}")
+    if SCRAPING_ENABLED or HTTP_FETCH_CONFIG['enabled']:
+        # Snapshot por username: respostas imediatas, atualização em segundo plano quando vencido
+        instagram_data = profile_cache.get_or_refresh(extract_username(instagram_url),
+                                                      lambda: buscar_instagram(instagram_url, bloco, deadline))
+        if instagram_data.get('blocked') and not SCRAPING_ENABLED:
+            # HTTP bloqueado e Selenium desativado: mantém a resposta de scraping desativado
+            instagram_data = {**raspar_instagram(instagram_url), 'http_error': instagram_data['error']}
+    else:
+        instagram_data = raspar_instagram(instagram_url, deadline)
+    instagram_analysis = AnalysisEngine.analyze_instagram_data(instagram_data)
+        
+    print("✅ Análise do Instagram concluída")
+    return {
+        'url': instagram_url,
+        'raw_data': instagram_data,
+        'relatorio': {
+            'titulo': f"Análise do Instagram: @{instagram_data.get('username', instagram_url)}",
+            'perfil_analise': instagram_analysis['perfil_analise'],
+            'atividade_status': instagram_analysis['atividade_status'],
+            'tipo_conta': instagram_analysis['tipo_conta'],
+            'bio_status': instagram_analysis['bio_status'],
+            'estrategias_recomendadas': instagram_analysis['estrategias_recomendadas']
+        }
+    }
+
+def fallback_instagram(instagram_url, error):
+    """Relatório padrão quando a análise do Instagram falha"""
+    print(f"❌ Erro na análise do Instagram: {error}")
+    return {
+        'url': instagram_url,
+        'raw_data': {'error': f'Erro ao analisar Instagram: {str(error)}'},
+        'relatorio': {
+            'titulo': f"Análise do Instagram: {instagram_url}",
+            'perfil_analise': 'Não foi possível analisar o perfil devido a limitações técnicas.',
+            'atividade_status': 'Status de atividade não disponível.',
+            'tipo_conta': 'Não identificado',
+            'bio_status': 'Não foi possível verificar',
+            'estrategias_recomendadas': ['Recomenda-se análise manual do perfil para estratégias personalizadas.']
+        }
+    }
+
+def prazo_estagio(nome, deadline=None):
+    """Prazo do estágio: termina antes do timeout do executor para devolver resultado parcial, não o fallback"""
+    return stage_deadline(deadline, STAGE_CONFIG['timeouts'].get(nome, STAGE_CONFIG['default_timeout']))
+
+def estagios_parciais(stage_results):
+    """Estágios que devolveram resultado parcial por falta de tempo"""
+    return [nome for nome, resultado in stage_results.items()
+            if resultado and (resultado.get('raw_data') or {}).get('partial')]
+
+def montar_estagios(website_url=None, instagram_url=None, incluir_google=False, bloco_instagram=None, deadline=None):
+    """Monta os estágios independentes da análise para o executor"""
+    # O prazo de cada estágio é criado quando ele começa a rodar (lotes aguardam na fila)
+    stages = {}
+    if website_url:
+        stages['website'] = Stage('website', lambda: analisar_website(website_url, prazo_estagio('website', deadline)),
+                                  lambda e: fallback_website(website_url, e),
+                                  host=GoogleScraper._extract_domain(website_url))
+        if incluir_google:
+            stages['google'] = Stage('google',
+                                     lambda: analisar_google(website_url, deadline=prazo_estagio('google', deadline)),
+                                     lambda e: fallback_google(website_url, e),
+                                     host='google.com')
+    if instagram_url:
+        stages['instagram'] = Stage('instagram',
+                                    lambda: analisar_instagram(instagram_url, bloco_instagram,
+                                                               prazo_estagio('instagram', deadline)),
+                                    lambda e: fallback_instagram(instagram_url, e),
+                                    host='instagram.com')
+    return stages
+
+def executar_analise(website_url, forcar_atualizacao=False, stages=None):
+    """Análise do /analisar com cache por domínio; requisições simultâneas compartilham o cálculo"""
+    dominio = GoogleScraper._extract_domain(website_url)
+    result, cache_status = analysis_cache.get_or_compute(
+        dominio, lambda: calcular_analise(website_url, stages=stages), refresh=forcar_atualizacao
+    )
+    print(f"🗃️  Análise de {dominio}: {cache_status}")
+    if result.get('parcial'):
+        # Resultado parcial serve a esta requisição (e às que a aguardavam), mas não fica no cache
+        analysis_cache.invalidate(dominio)
+    return {**result, 'cache_status': cache_status}
+
+def calcular_analise(website_url, instagram_url=None, stages=None):
+    """Pipeline completo do /analisar: website + Google (e Instagram, no streaming) e gravação no Supabase"""
+    result = {
+        'timestamp': datetime.now().isoformat(),
+        'website_analysis': None,
+        'google_analysis': None
+    }
+    
+    # Análises do website e do Google em paralelo, dentro do prazo da requisição
+    if stages is None:
+        prazo = Deadline(DEADLINE_CONFIG['request_seconds'])
+        stages = montar_estagios(website_url, instagram_url, incluir_google=True, deadline=prazo)
+    stage_results = stage_executor.run(stages)
+    result['website_analysis'] = stage_results.get('website')
+    result['google_analysis'] = stage_results.get('google')
+    if instagram_url:
+        result['instagram_analysis'] = stage_results.get('instagram')
+    result['estagios_parciais'] = estagios_parciais(stage_results)
+    result['parcial'] = bool(result['estagios_parciais'])
+    
+    persistir_analise(website_url, instagram_url, result)
+    return result
+
+def persistir_analise(website_url, instagram_url, result):
+    """Salva a análise no Supabase (se configurado) sem bloquear a resposta"""
+    if persister:
+        persister.enqueue({
+            'website_url': website_url or None,
+            'instagram_url': instagram_url or None,
+            'analysis_data': result,
+            'created_at': datetime.now().isoformat()
+        })
+        print("📥 Análise enfileirada para o Supabase")
+    else:
+        print("⚠️  Supabase não configurado - dados não salvos")
+
+def executar_relatorio_crm(website_url, instagram_url):
+    """Pipeline completo do /relatorio-crm: website + Instagram e texto para o CRM"""
+    result = {
+        'timestamp': datetime.now().isoformat(),
+        'website_analysis': None,
+        'instagram_analysis': None
+    }
+    
+    # Análises do website e do Instagram em paralelo, dentro do prazo da requisição
+    prazo = Deadline(DEADLINE_CONFIG['request_seconds'])
+    stage_results = stage_executor.run(montar_estagios(website_url, instagram_url, deadline=prazo))
+    result['website_analysis'] = stage_results.get('website')
+    result['instagram_analysis'] = stage_results.get('instagram')
+    result['estagios_parciais'] = estagios_parciais(stage_results)
+    result['parcial'] = bool(result['estagios_parciais'])
+    
+    # Gerar relatório formatado
+    relatorio_texto = gerar_relatorio_texto(result, website_url, instagram_url)
+    
+    return {
+        'relatorio_crm': relatorio_texto,
+        'dados_completos': result,
+        'timestamp': datetime.now().isoformat()
+    }
+
+# Jobs assíncronos: os workers executam os mesmos pipelines das rotas síncronas
+job_manager = JobManager()
+job_manager.register('analisar', lambda payload: executar_analise(
+    payload['website_url'], forcar_atualizacao=payload.get('forcar_atualizacao', False)))
+job_manager.register('relatorio-crm', lambda payload: executar_relatorio_crm(
+    payload.get('website_url', ''), payload.get('instagram_url', '')))
+
 @app.route('/analisar', methods=['POST', 'OPTIONS'])
 def analisar():
     # Handle preflight CORS request
@@ -231,95 +617,7 @@ def analisar():
         if not website_url:
             return jsonify({'error': 'URL do website deve ser fornecido'}), 400
         
-        result = {
-            'timestamp': datetime.now().isoformat(),
-            'website_analysis': None,
-            'google_analysis': None
-        }
-        
-        # Análise do Website
-        if website_url:
-            print(f"🔍 Iniciando análise do website: {website_url}")
-            try:
-                website_scraper = WebsiteScraper()
-                website_data = website_scraper.scrape(website_url)
-                website_analysis = AnalysisEngine.analyze_website_data(website_data)
-                
-                result['website_analysis'] = {
-                    'url': website_url,
-                    'raw_data': website_data,
-                    'relatorio': {
-                        'titulo': f"Análise do Site: {website_url}",
-                        'estrutura_desenvolvedor': website_analysis['estrutura_desenvolvedor'],
-                        'melhorias_identificadas': website_analysis['melhorias_identificadas'],
-                        'necessidades_identificadas': website_analysis['necessidades_identificadas']
-                    }
-                }
-                print("✅ Análise do website concluída")
-            except Exception as e:
-                print(f"❌ Erro na análise do website: {e}")
-                result['website_analysis'] = {
-                    'url': website_url,
-                    'raw_data': {'error': f'Erro ao analisar website: {str(e)}'},
-                    'relatorio': {
-                        'titulo': f"Análise do Site: {website_url}",
-                        'estrutura_desenvolvedor': 'Não foi possível analisar a estrutura do site devido a problemas técnicos.',
-                        'melhorias_identificadas': ['Recomenda-se uma análise técnica manual para identificar oportunidades de melhoria.'],
-                        'necessidades_identificadas': ['Verificação técnica necessária para diagnóstico completo.']
-                    }
-                }
-        
-        # Análise do Google
-        print(f"🔍 Iniciando análise do Google para: {website_url}")
-        try:
-            google_scraper = GoogleScraper()
-            google_data = google_scraper.search_website_info(website_url)
-            google_analysis = AnalysisEngine.analyze_google_data(google_data)
-            
-            result['google_analysis'] = {
-                'url': website_url,
-                'raw_data': google_data,
-                'relatorio': {
-                    'titulo': f"Análise do Google: {website_url}",
-                    'seo_analise': google_analysis['seo_analise'],
-                    'presenca_social': google_analysis['presenca_social'],
-                    'presenca_publicitaria': google_analysis['presenca_publicitaria'],
-                    'reputacao_online': google_analysis['reputacao_online'],
-                    'posicao_mercado': google_analysis['posicao_mercado'],
-                    'estrategias_google': google_analysis['estrategias_google']
-                }
-            }
-            print("✅ Análise do Google concluída")
-        except Exception as e:
-            print(f"❌ Erro na análise do Google: {e}")
-            result['google_analysis'] = {
-                'url': website_url,
-                'raw_data': {'error': f'Erro ao analisar no Google: {str(e)}'},
-                'relatorio': {
-                    'titulo': f"Análise do Google: {website_url}",
-                    'seo_analise': 'Não foi possível realizar análise SEO via Google.',
-                    'presenca_social': 'Análise de presença social não disponível.',
-                    'presenca_publicitaria': 'Análise publicitária não disponível.',
-                    'reputacao_online': 'Análise de reputação não disponível.',
-                    'posicao_mercado': 'Análise de mercado não disponível.',
-                    'estrategias_google': ['Recomenda-se análise manual para estratégias personalizadas.']
-                }
-            }
-        
-        # Salvar no Supabase (se configurado)
-        if supabase:
-            try:
-                supabase.table('analyses').insert({
-                    'website_url': website_url or None,
-                    'instagram_url': instagram_url or None,
-                    'analysis_data': result,
-                    'created_at': datetime.now().isoformat()
-                }).execute()
-                print("✅ Dados salvos no Supabase")
-            except Exception as db_error:
-                print(f"⚠️  Erro ao salvar no banco (continuando): {db_error}")
-        else:
-            print("⚠️  Supabase não configurado - dados não salvos")
+        result = executar_analise(website_url, forcar_atualizacao=bool(data.get('forcar_atualizacao')))
         
         return jsonify(result)
     
@@ -352,97 +650,7 @@ def relatorio_crm():
         
         print(f"📋 Gerando relatório CRM - Site: {website_url}, Instagram: {instagram_url}")
         
-        # Executar análise diretamente
-        result = {
-            'timestamp': datetime.now().isoformat(),
-            'website_analysis': None,
-            'instagram_analysis': None
-        }
-        
-        # Análise do Website
-        if website_url:
-            print(f"🔍 Iniciando análise do website: {website_url}")
-            try:
-                website_scraper = WebsiteScraper()
-                website_data = website_scraper.scrape(website_url)
-                website_analysis = AnalysisEngine.analyze_website_data(website_data)
-                
-                result['website_analysis'] = {
-                    'url': website_url,
-                    'raw_data': website_data,
-                    'relatorio': {
-                        'titulo': f"Análise do Site: {website_url}",
-                        'estrutura_desenvolvedor': website_analysis['estrutura_desenvolvedor'],
-                        'melhorias_identificadas': website_analysis['melhorias_identificadas'],
-                        'necessidades_identificadas': website_analysis['necessidades_identificadas']
-                    }
-                }
-                print("✅ Análise do website concluída")
-            except Exception as e:
-                print(f"❌ Erro na análise do website: {e}")
-                result['website_analysis'] = {
-                    'url': website_url,
-                    'raw_data': {'error': f'Erro ao analisar website: {str(e)}'},
-                    'relatorio': {
-                        'titulo': f"Análise do Site: {website_url}",
-                        'estrutura_desenvolvedor': 'Não foi possível analisar a estrutura do site devido a problemas técnicos.',
-                        'melhorias_identificadas': ['Recomenda-se uma análise técnica manual para identificar oportunidades de melhoria.'],
-                        'necessidades_identificadas': ['Verificação técnica necessária para diagnóstico completo.']
-                    }
-                }
-        
-        # Análise do Instagram
-        if instagram_url:
-            print(f"📱 Iniciando análise do Instagram: {instagram_url}")
-            instagram_scraper = None
-            try:
-                instagram_scraper = InstagramScraper()
-                if not instagram_scraper.driver:
-                    raise Exception("Driver do Selenium não disponível")
-                
-                instagram_data = instagram_scraper.scrape(instagram_url)
-                instagram_analysis = AnalysisEngine.analyze_instagram_data(instagram_data)
-                
-                result['instagram_analysis'] = {
-                    'url': instagram_url,
-                    'raw_data': instagram_data,
-                    'relatorio': {
-                        'titulo': f"Análise do Instagram: @{instagram_data.get('username', instagram_url)}",
-                        'perfil_analise': instagram_analysis['perfil_analise'],
-                        'atividade_status': instagram_analysis['atividade_status'],
-                        'tipo_conta': instagram_analysis['tipo_conta'],
-                        'bio_status': instagram_analysis['bio_status'],
-                        'estrategias_recomendadas': instagram_analysis['estrategias_recomendadas']
-                    }
-                }
-                print("✅ Análise do Instagram concluída")
-            except Exception as e:
-                print(f"❌ Erro na análise do Instagram: {e}")
-                result['instagram_analysis'] = {
-                    'url': instagram_url,
-                    'raw_data': {'error': f'Erro ao analisar Instagram: {str(e)}'},
-                    'relatorio': {
-                        'titulo': f"Análise do Instagram: {instagram_url}",
-                        'perfil_analise': 'Não foi possível analisar o perfil devido a limitações técnicas.',
-                        'atividade_status': 'Status de atividade não disponível.',
-                        'tipo_conta': 'Não identificado',
-                        'bio_status': 'Não foi possível verificar',
-                        'estrategias_recomendadas': ['Recomenda-se análise manual do perfil para estratégias personalizadas.']
-                    }
-                }
-            finally:
-                # Garantir que o driver seja fechado
-                if instagram_scraper:
-                    instagram_scraper.close_driver()
-        
-        # Gerar relatório formatado
-        relatorio_texto = gerar_relatorio_texto(result, website_url, instagram_url)
-        
-        return jsonify({
-            'relatorio_crm': relatorio_texto,
-            'dados_completos': result,
-            'timestamp': datetime.now().isoformat()
-        })
+        return jsonify(executar_relatorio_crm(website_url, instagram_url))
         
     except Exception as e:
         error_msg = f'Erro interno do servidor: {str(e)}'
@@ -524,6 +732,239 @@ def gerar_relatorio_texto(analysis_data, website_url, instagram_url):
     
     return "\n".join(relatorio)
 
+def evento_sse(evento, dados):
+    """Formata um evento Server-Sent Events"""
+    return f"event: {evento}\ndata: {json.dumps(dados, ensure_ascii=False, default=str)}\n\n"
+
+@app.route('/analisar/stream', methods=['GET'])
+def analisar_stream():
+    """Versão em streaming do /analisar: envia um evento SSE a cada estágio ou seção do Google concluída.
+    Usa o mesmo cache por domínio e a mesma gravação no Supabase do /analisar"""
+    website_url = request.args.get('website_url', '').strip()
+    instagram_url = request.args.get('instagram_url', '').strip()
+    forcar_atualizacao = request.args.get('forcar_atualizacao', '').lower() in ('1', 'true')
+    
+    if not website_url and not instagram_url:
+        return jsonify({'error': 'Pelo menos um URL deve ser fornecido'}), 400
+    
+    print(f"📡 Análise em streaming - Site: {website_url}, Instagram: {instagram_url}")
+    
+    eventos = queue.Queue()
+    cancelado = threading.Event()
+    publicados = set()
+    
+    def publicar(evento, resultado):
+        # Um estágio que termina após o fallback por tempo limite não gera evento duplicado
+        if evento not in publicados:
+            publicados.add(evento)
+            eventos.put((evento, resultado))
+    
+    def secao_google(nome, resultado):
+        eventos.put(('google_secao', {'secao': nome, 'resultado': resultado}))
+    
+    def emitir(evento, funcao):
+        # Estágios que ainda não começaram são pulados se o cliente desconectou
+        def executar():
+            if cancelado.is_set():
+                raise Exception('Análise cancelada pelo cliente')
+            resultado = funcao()
+            publicar(evento, resultado)
+            return resultado
+        return executar
+    
+    def emitir_fallback(evento, fallback):
+        def executar(erro):
+            resultado = fallback(erro)
+            publicar(evento, resultado)
+            return resultado
+        return executar
+    
+    prazo = Deadline(DEADLINE_CONFIG['request_seconds'])
+    stages = {}
+    if website_url:
+        stages['website'] = Stage('website',
+                                  emitir('website', lambda: analisar_website(website_url,
+                                                                             prazo_estagio('website', prazo))),
+                                  emitir_fallback('website', lambda e: fallback_website(website_url, e)))
+        stages['google'] = Stage('google',
+                                 emitir('google', lambda: analisar_google(website_url, secao_google, cancelado,
+                                                                          prazo_estagio('google', prazo))),
+                                 emitir_fallback('google', lambda e: fallback_google(website_url, e)))
+    if instagram_url:
+        stages['instagram'] = Stage('instagram',
+                                    emitir('instagram', lambda: analisar_instagram(instagram_url,
+                                                                                   deadline=prazo_estagio('instagram', prazo))),
+                                    emitir_fallback('instagram', lambda e: fallback_instagram(instagram_url, e)))
+    
+    conclusao = {}
+    
+    def executar_estagios():
+        try:
+            if website_url and not instagram_url:
+                # Mesmo formato do /analisar: cache por domínio, coalescência e gravação
+                result = executar_analise(website_url, forcar_atualizacao, stages=stages)
+                conclusao['cache_status'] = result['cache_status']
+            else:
+                result = calcular_analise(website_url, instagram_url, stages=stages)
+            conclusao['parcial'] = result['parcial']
+            # Resultado vindo do cache (ou de outra requisição): os estágios não rodaram aqui
+            for evento, chave in (('website', 'website_analysis'), ('google', 'google_analysis'),
+                                  ('instagram', 'instagram_analysis')):
+                if evento in stages:
+                    publicar(evento, result.get(chave))
+        except Exception as e:
+            print(f"❌ Erro na análise em streaming: {e}")
+            conclusao['erro'] = str(e)
+        finally:
+            eventos.put(None)
+    
+    def gerar():
+        inicio = time.monotonic()
+        threading.Thread(target=executar_estagios, name='sse-analise', daemon=True).start()
+        try:
+            yield evento_sse('inicio', {'estagios': list(stages), 'timestamp': datetime.now().isoformat()})
+            while True:
+                try:
+                    item = eventos.get(timeout=15)
+                except queue.Empty:
+                    # Comentário SSE mantém a conexão viva através de proxies
+                    yield ': keep-alive\n\n'
+                    continue
+                if item is None:
+                    break
+                yield evento_sse(*item)
+            yield evento_sse('fim', {'tempo_total_s': round(time.monotonic() - inicio, 2), **conclusao})
+        finally:
+            # Cliente desconectou (ou terminou): buscas ainda pendentes são canceladas
+            cancelado.set()
+    
+    return Response(stream_with_context(gerar()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/analisar-lote', methods=['POST', 'OPTIONS'])
+def analisar_lote():
+    """Analisa uma lista de URLs e devolve cada resultado em NDJSON assim que fica pronto"""
+    # Handle preflight CORS request
+    if request.method == 'OPTIONS':
+        return jsonify({}), 200
+    
+    if not request.is_json:
+        return jsonify({'error': 'Content-Type deve ser application/json'}), 400
+    
+    data = request.json
+    if not data or not isinstance(data.get('urls'), list):
+        return jsonify({'error': 'Informe a lista "urls"'}), 400
+    
+    # Cada item pode ser a URL do site ou {website_url, instagram_url}
+    itens = []
+    for item in data['urls']:
+        if isinstance(item, str):
+            item = {'website_url': item}
+        if not isinstance(item, dict):
+            continue
+        website_url = (item.get('website_url') or '').strip()
+        instagram_url = (item.get('instagram_url') or '').strip()
+        if website_url or instagram_url:
+            itens.append({'website_url': website_url, 'instagram_url': instagram_url})
+    
+    if not itens:
+        return jsonify({'error': 'Nenhuma URL válida fornecida'}), 400
+    if len(itens) > BATCH_CONFIG['max_urls']:
+        return jsonify({'error': f"Máximo de {BATCH_CONFIG['max_urls']} URLs por lote"}), 400
+    
+    incluir_google = data.get('incluir_google', True)
+    print(f"📦 Lote recebido: {len(itens)} itens")
+    
+    def gerar():
+        inicio = time.monotonic()
+        # Perfis do Instagram em blocos: várias abas por sessão do Selenium
+        blocos = montar_blocos_instagram([item['instagram_url'] for item in itens]) if SCRAPING_ENABLED else {}
+        estagios = [montar_estagios(item['website_url'] or None, item['instagram_url'] or None,
+                                    incluir_google=incluir_google,
+                                    bloco_instagram=blocos.get(item['instagram_url']))
+                    for item in itens]
+        concluidos = 0
+        for index, stage_results, duracao in BatchScheduler().run(estagios):
+            concluidos += 1
+            linha = {
+                'tipo': 'resultado',
+                'indice': index,
+                'website_url': itens[index]['website_url'],
+                'instagram_url': itens[index]['instagram_url'],
+                'timestamp': datetime.now().isoformat(),
+                'duracao_s': duracao,
+                'website_analysis': stage_results.get('website'),
+                'google_analysis': stage_results.get('google'),
+                'instagram_analysis': stage_results.get('instagram')
+            }
+            yield json.dumps(linha, ensure_ascii=False, default=str) + '\n'
+        
+        # Última linha: vazão agregada do lote
+        total = time.monotonic() - inicio
+        resumo = {
+            'tipo': 'resumo',
+            'total': len(itens),
+            'concluidos': concluidos,
+            'tempo_total_s': round(total, 2),
+            'urls_por_minuto': round(concluidos / total * 60, 2) if total > 0 else None
+        }
+        print(f"✅ Lote concluído: {concluidos} itens em {total:.1f}s")
+        yield json.dumps(resumo, ensure_ascii=False) + '\n'
+    
+    return Response(stream_with_context(gerar()), mimetype='application/x-ndjson')
+
+@app.route('/jobs', methods=['POST', 'OPTIONS'])
+def criar_job():
+    """Enfileira uma análise e retorna o id do job imediatamente"""
+    # Handle preflight CORS request
+    if request.method == 'OPTIONS':
+        return jsonify({}), 200
+    
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type deve ser application/json'}), 400
+        
+        data = request.json
+        if not data:
+            return jsonify({'error': 'Dados JSON inválidos'}), 400
+        
+        tipo = data.get('tipo', 'analisar')
+        website_url = data.get('website_url', '').strip()
+        instagram_url = data.get('instagram_url', '').strip()
+        
+        if tipo == 'analisar' and not website_url:
+            return jsonify({'error': 'URL do website deve ser fornecido'}), 400
+        if tipo == 'relatorio-crm' and not website_url and not instagram_url:
+            return jsonify({'error': 'Pelo menos um URL deve ser fornecido'}), 400
+        
+        job = job_manager.submit(tipo, {
+            'website_url': website_url,
+            'instagram_url': instagram_url,
+            'forcar_atualizacao': bool(data.get('forcar_atualizacao'))
+        })
+        print(f"📥 Job {job['id']} enfileirado ({tipo})")
+        
+        return jsonify({
+            'job_id': job['id'],
+            'status': job['status'],
+            'status_url': f"/jobs/{job['id']}"
+        }), 202
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        error_msg = f'Erro interno do servidor: {str(e)}'
+        print(f"❌ {error_msg}")
+        return jsonify({'error': error_msg}), 500
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def status_job(job_id):
+    """Status e, quando concluído, resultado do job"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job não encontrado'}), 404
+    return jsonify(job)
+
 @app.route('/health', methods=['GET'])
 def health():
     return jsonify({'status': 'ok', 'message': 'Servidor funcionando'})
@@ -548,6 +989,11 @@ def ai_status():
     else:
         return jsonify({'status': 'warning', 'message': 'IA parcialmente configurada', 'details': status}), 200
 
+@app.route('/instagram/seletores', methods=['GET'])
+def instagram_seletores():
+    """Acertos, latência e seletores mortos da extração do Instagram"""
+    return jsonify(selector_registry.stats())
+
 # Rotas para servir arquivos estáticos do frontend
 @app.route('/')
 def index():
@@ -0,0 +1,186 @@
+# batch_scheduler.py - Agendamento de lotes de análises com limite por host
+
+import os
+import time
+import logging
+from collections import Counter, deque
+from concurrent.futures import wait, FIRST_COMPLETED
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from stage_executor import Stage, StageExecutor, StageRejectedError, StageTimeoutError
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuração dos lotes (sobrescrevível por variáveis de ambiente)
+BATCH_CONFIG = {
+    'max_urls': int(os.getenv('BATCH_MAX_URLS', '500')),
+    # Threads do pool próprio dos lotes
+    'max_workers': int(os.getenv('BATCH_MAX_WORKERS', '8')),
+    # Estágios simultâneos no mesmo host (gentileza com o site analisado)
+    'per_host': int(os.getenv('BATCH_PER_HOST', '2')),
+    # Limites específicos: o Google já passa pelo token bucket global das buscas
+    'host_limits': {
+        'google.com': int(os.getenv('BATCH_GOOGLE_CONCURRENCY', '2')),
+        'instagram.com': int(os.getenv('BATCH_INSTAGRAM_CONCURRENCY', '1'))
+    },
+    # Tempo que um estágio abandonado (tempo limite estourado, thread ainda rodando) segura a vaga
+    # do host; depois disso a vaga é liberada mesmo que a thread continue presa
+    'abandoned_slot_seconds': float(os.getenv('BATCH_ABANDONED_SLOT_SECONDS', '30')),
+    # Prazo do lote inteiro: estágios não concluídos até lá recebem o fallback
+    'max_seconds': float(os.getenv('BATCH_MAX_SECONDS', '3600'))
+}
+
+
+# Intervalo para conferir se um estágio despachado já começou (e seu prazo passou a contar)
+START_POLL_INTERVAL = 0.1
+
+
+class BatchScheduler:
+    """Distribui os estágios de vários itens num pool próprio dos lotes, respeitando o limite por host"""
+
+    def __init__(self, executor: Optional[StageExecutor] = None,
+                 per_host: Optional[int] = None,
+                 host_limits: Optional[Dict[str, int]] = None,
+                 abandoned_slot_seconds: Optional[float] = None,
+                 max_seconds: Optional[float] = None):
+        # Pool separado: lotes grandes não disputam threads com as análises interativas
+        self.executor = executor or batch_executor
+        self.per_host = per_host or BATCH_CONFIG['per_host']
+        self.host_limits = host_limits if host_limits is not None else BATCH_CONFIG['host_limits']
+        self.abandoned_slot_seconds = (abandoned_slot_seconds if abandoned_slot_seconds is not None
+                                       else BATCH_CONFIG['abandoned_slot_seconds'])
+        self.max_seconds = max_seconds or BATCH_CONFIG['max_seconds']
+
+    def _limit(self, host: str) -> int:
+        return max(1, self.host_limits.get(host, self.per_host))
+
+    def run(self, items: List[Dict[str, Stage]]) -> Iterator[Tuple[int, Dict[str, Any], float]]:
+        """Executa os estágios de cada item e produz (índice, resultados, duração) assim que o item termina"""
+        tasks = deque((index, name, stage) for index, stages in enumerate(items) for name, stage in stages.items())
+        remaining = [len(stages) for stages in items]
+        results = [{} for _ in items]
+        first_started = [None] * len(items)
+        batch_expires_at = time.monotonic() + self.max_seconds
+        # Estágios no pool, inclusive os que já receberam o fallback por tempo limite e ainda rodam
+        running = {}
+        # Estágios abandonados: seguram a vaga do host até a thread terminar ou até o instante guardado aqui
+        timed_out = {}
+        holding = set()
+        active = Counter()
+        max_in_flight = self.executor.max_workers
+
+        def release(future):
+            if future in holding:
+                holding.discard(future)
+                active[running[future][2].stage.host] -= 1
+
+        def complete(index, name, value, now):
+            results[index][name] = value
+            remaining[index] -= 1
+            if remaining[index] == 0:
+                finished.append((index, round(now - (first_started[index] or now), 2)))
+
+        # Itens sem estágios terminam imediatamente
+        for index, count in enumerate(remaining):
+            if count == 0:
+                yield index, {}, 0.0
+
+        while tasks or len(running) > len(timed_out):
+            now = time.monotonic()
+            finished = []
+
+            if now >= batch_expires_at:
+                # Prazo do lote: estágios em andamento são abandonados e os não despachados nem começam
+                logger.warning(f"⏱️ Prazo do lote ({self.max_seconds:g}s) esgotado com "
+                               f"{len(tasks) + len(running) - len(timed_out)} estágios pendentes")
+                error = StageTimeoutError(f"prazo do lote de {self.max_seconds:g}s excedido")
+                for future, (index, name, run) in list(running.items()):
+                    if future not in timed_out:
+                        self.executor.abandon(run)
+                        complete(index, name, run.stage.fallback(error), now)
+                for index, name, stage in tasks:
+                    complete(index, name, stage.fallback(error), now)
+                tasks.clear()
+                for index, duration in finished:
+                    yield index, results[index], duration
+                break
+
+            # Vagas de host presas por estágios abandonados expiram
+            for future, expires_at in timed_out.items():
+                if now >= expires_at:
+                    release(future)
+
+            # Despacha, na ordem dos itens, os estágios cujo host tem vaga
+            for task in list(tasks):
+                if len(running) - len(timed_out) >= max_in_flight:
+                    break
+                index, name, stage = task
+                if active[stage.host] >= self._limit(stage.host):
+                    continue
+                tasks.remove(task)
+                if first_started[index] is None:
+                    first_started[index] = now
+                if self.executor.saturated():
+                    logger.error(f"🚫 Estágio '{name}' do item {index} recusado: "
+                                 f"{self.executor.abandoned} threads presas em estágios abandonados")
+                    complete(index, name, stage.fallback(StageRejectedError('pool ocupado por estágios abandonados')), now)
+                    continue
+                run = self.executor.submit(stage)
+                running[run.future] = (index, name, run)
+                holding.add(run.future)
+                active[stage.host] += 1
+
+            if running:
+                # O prazo de cada estágio começa quando ele entra em execução; antes disso, verifica de novo
+                # em breve. A espera nunca passa do prazo do lote nem da expiração das vagas abandonadas
+                wake_at = [batch_expires_at]
+                for future, (_, _, run) in running.items():
+                    if future in timed_out:
+                        if future in holding and tasks:
+                            wake_at.append(timed_out[future])
+                    elif run.deadline() is None:
+                        wake_at.append(now + START_POLL_INTERVAL)
+                    else:
+                        wake_at.append(run.deadline())
+                done, _ = wait(list(running), timeout=max(0, min(wake_at) - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+            else:
+                done = set()
+
+            now = time.monotonic()
+            for future in list(running):
+                index, name, run = running[future]
+                stage = run.stage
+                if future in done:
+                    release(future)
+                    del running[future]
+                    if timed_out.pop(future, None) is not None:
+                        # Estágio abandonado terminou: o resultado já foi entregue pelo fallback
+                        continue
+                    try:
+                        value = future.result()
+                    except Exception as e:
+                        logger.error(f"❌ Erro no estágio '{name}' do item {index}: {e}")
+                        value = stage.fallback(e)
+                    complete(index, name, value, now)
+                elif future not in timed_out and run.deadline() is not None and now >= run.deadline():
+                    timed_out[future] = now + self.abandoned_slot_seconds
+                    self.executor.abandon(run)
+                    logger.warning(f"⏱️ Estágio '{name}' do item {index} excedeu {stage.timeout:.0f}s")
+                    complete(index, name, stage.fallback(
+                        StageTimeoutError(f"tempo limite de {stage.timeout:.0f}s excedido")
+                    ), now)
+
+            for index, duration in finished:
+                yield index, results[index], duration
+                results[index] = None
+
+        if running:
+            # Sobraram só estágios abandonados: o lote termina sem esperá-los (continuam contados no pool)
+            logger.warning(f"⏱️ Lote concluído com {len(running)} estágios abandonados ainda em execução")
+
+
+# Pool dos lotes, separado do pool das análises interativas
+batch_executor = StageExecutor(max_workers=BATCH_CONFIG['max_workers'], thread_name_prefix='batch')
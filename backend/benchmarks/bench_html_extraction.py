@@ -0,0 +1,163 @@
+"""Micro-benchmark: parse + extração de campos do WebsiteScraper.
+
+Compara a extração antiga (várias passadas: str(soup).lower() duas vezes e
+dois percursos por todos os <a href>) com o HtmlFeatureExtractor de passada
+única, medindo tempo e pico de memória (tracemalloc) em páginas grandes.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_html_extraction [--sizes 200 1000 4000] [--repeat 5]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scraper_modules.html_features import (  # noqa: E402
+    HtmlFeatureExtractor, CMS_INDICATORS, ANALYTICS_INDICATORS, SOCIAL_PLATFORMS
+)
+from scraper_modules.html_parser import parse_html  # noqa: E402
+
+HEADERS = {'Content-Type': 'text/html; charset=utf-8', 'Server': 'nginx'}
+
+
+def build_page(size_kb):
+    """Gera uma página sintética com links, scripts e rodapé até ~size_kb KB"""
+    head = (
+        '<html><head><title>Resort Exemplo - Hospedagem em Pipa</title>'
+        '<meta name="description" content="Resort pé na areia em Pipa/RN">'
+        '<script src="https://www.googletagmanager.com/gtag/js?id=G-XXXX"></script>'
+        '</head><body>'
+    )
+    block = (
+        '<div class="card"><h2>Suíte {i}</h2><p>Vista para o mar, café da manhã e piscina. '
+        'Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p>'
+        '<a href="/quartos/{i}">Ver quarto {i}</a> <a href="https://www.instagram.com/resort{i}">Instagram</a>'
+        '<img src="/img/{i}.jpg" alt="Suíte {i}"></div>'
+    )
+    footer = (
+        '<footer><a href="https://facebook.com/resort">Facebook</a> '
+        '<a href="https://wa.me/5584999999999">WhatsApp</a> '
+        '<p>Desenvolvido por Agência Exemplo | Todos os direitos reservados</p></footer>'
+        '<script src="/wp-content/themes/resort/app.js"></script></body></html>'
+    )
+    parts = [head]
+    size = len(head) + len(footer)
+    i = 0
+    while size < size_kb * 1024:
+        chunk = block.format(i=i)
+        parts.append(chunk)
+        size += len(chunk)
+        i += 1
+    parts.append(footer)
+    return ''.join(parts).encode('utf-8')
+
+
+def legacy_extract(soup, headers):
+    """Cópia da extração antiga do WebsiteScraper (referência para o benchmark)"""
+    def detect_cms():
+        page_content = str(soup).lower()
+        headers_str = str(headers).lower()
+        for cms, indicators in CMS_INDICATORS.items():
+            for indicator in indicators:
+                if indicator.lower() in page_content or indicator.lower() in headers_str:
+                    return cms
+        return None
+
+    def find_developer_info():
+        patterns = [
+            r'desenvolvido por\s*(.+?)(?:\s*\||\s*</)',
+            r'developed by\s*(.+?)(?:\s*\||\s*</)',
+            r'powered by\s*(.+?)(?:\s*\||\s*</)',
+            r'created by\s*(.+?)(?:\s*\||\s*</)'
+        ]
+        footer = soup.find('footer')
+        if footer:
+            footer_text = footer.get_text()
+            for pattern in patterns:
+                match = re.search(pattern, footer_text, re.IGNORECASE)
+                if match:
+                    return match.group(1).strip()
+        generator_tag = soup.find('meta', attrs={'name': 'generator'})
+        if generator_tag:
+            return generator_tag.get('content', '').strip()
+        for link in soup.find_all('a', href=True):
+            href = link.get('href', '').lower()
+            text = link.get_text().lower()
+            if any(k in href or k in text for k in ['agencia', 'agency', 'desenvolvedor', 'developer', 'webdesign']):
+                return link.get_text().strip()
+        return None
+
+    def find_social_links():
+        found = {}
+        for link in soup.find_all('a', href=True):
+            href = link.get('href', '').lower()
+            for platform, domains in SOCIAL_PLATFORMS.items():
+                if any(domain in href for domain in domains):
+                    found[platform] = link.get('href')
+                    break
+        return found
+
+    title_tag = soup.find('title')
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    return {
+        'cms_detected': detect_cms(),
+        'developer_info': find_developer_info(),
+        'title': title_tag.get_text().strip() if title_tag else None,
+        'meta_description': meta_desc.get('content', '').strip() if meta_desc else None,
+        'has_analytics': any(i in str(soup).lower() for i in ANALYTICS_INDICATORS),
+        'social_links': find_social_links()
+    }
+
+
+def run_legacy(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    return legacy_extract(soup, HEADERS)
+
+
+def run_single_pass(content):
+    # Mesmo parser da versão antiga, para comparar apenas a extração
+    document = parse_html(content, backend='html.parser')
+    return HtmlFeatureExtractor().extract(document, HEADERS)
+
+
+def measure(fn, content, repeat):
+    """Retorna (melhor tempo em ms, pico de memória em MB, resultado)"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(content)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / (1024 * 1024), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[200, 1000, 4000], help='tamanhos de página em KB')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'página':>10} | {'antes (ms)':>10} | {'depois (ms)':>11} | {'antes (MB)':>10} | {'depois (MB)':>11} | iguais")
+    for size_kb in args.sizes:
+        content = build_page(size_kb)
+        legacy_ms, legacy_mb, legacy_result = measure(run_legacy, content, args.repeat)
+        new_ms, new_mb, new_result = measure(run_single_pass, content, args.repeat)
+        same = all(legacy_result[key] == new_result[key] for key in legacy_result)
+        print(f"{size_kb:>8}KB | {legacy_ms:>10.1f} | {new_ms:>11.1f} | {legacy_mb:>10.1f} | {new_mb:>11.1f} | "
+              f"{'sim' if same else 'NÃO'}")
+
+
+if __name__ == '__main__':
+    main()
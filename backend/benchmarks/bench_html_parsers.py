@@ -0,0 +1,107 @@
+"""Benchmark dos backends de parsing HTML (html.parser, lxml, selectolax).
+
+Mede, para cada página do corpus, a latência de parse e de parse + extração
+(HtmlFeatureExtractor) e o pico de memória (tracemalloc) por backend. Backends
+não instalados são ignorados. O tracemalloc só enxerga alocações feitas pelo
+Python: a árvore mantida em C pelo lxml/selectolax aparece subestimada.
+
+O corpus é um diretório com arquivos .html salvos. Sem --corpus, são usadas
+páginas sintéticas do bench_html_extraction. Para salvar páginas reais:
+    python -m benchmarks.bench_html_parsers --save-corpus corpus/ https://exemplo.com.br ...
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_html_parsers [--corpus DIR] [--repeat 5]
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scraper_modules.html_features import HtmlFeatureExtractor  # noqa: E402
+from scraper_modules.html_parser import parse_html, _BACKENDS  # noqa: E402
+from benchmarks.bench_html_extraction import build_page  # noqa: E402
+
+
+def load_corpus(corpus_dir):
+    """Lista de (nome, bytes) do corpus ou das páginas sintéticas"""
+    if corpus_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(corpus_dir, '*.html'))):
+            with open(path, 'rb') as f:
+                pages.append((os.path.basename(path), f.read()))
+        return pages
+    return [(f'sintetica-{size}KB', build_page(size)) for size in (50, 500, 2000)]
+
+
+def save_corpus(corpus_dir, urls):
+    """Baixa as URLs com a sessão do WebsiteScraper e salva como .html"""
+    from scraper_modules.website_scraper import WebsiteScraper
+
+    os.makedirs(corpus_dir, exist_ok=True)
+    session = WebsiteScraper().session
+    for url in urls:
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        response = session.get(url, timeout=15)
+        name = re.sub(r'[^a-zA-Z0-9.-]+', '_', url.split('://', 1)[1]).strip('_') + '.html'
+        with open(os.path.join(corpus_dir, name), 'wb') as f:
+            f.write(response.content)
+        print(f"salvo {name} ({len(response.content) / 1024:.0f} KB)")
+
+
+def available_backends():
+    backends = []
+    for backend in _BACKENDS:
+        # parse_html volta ao html.parser quando o backend não está instalado
+        if parse_html('<p>x</p>', backend=backend).backend == backend:
+            backends.append(backend)
+    return backends
+
+
+def measure(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help='diretório com páginas .html salvas')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save-corpus', metavar='DIR', help='baixa as URLs informadas para DIR e sai')
+    parser.add_argument('urls', nargs='*')
+    args = parser.parse_args()
+
+    if args.save_corpus:
+        save_corpus(args.save_corpus, args.urls)
+        return
+
+    extractor = HtmlFeatureExtractor()
+    backends = available_backends()
+    print(f"backends: {', '.join(backends)}")
+    print(f"{'página':<24} | {'backend':<11} | {'parse (ms)':>10} | {'parse+extração (ms)':>19} | {'pico (MB)':>9}")
+
+    for name, content in load_corpus(args.corpus):
+        for backend in backends:
+            parse_ms, _ = measure(lambda: parse_html(content, backend=backend), args.repeat)
+            total_ms, peak_mb = measure(
+                lambda: extractor.extract(parse_html(content, backend=backend), {}), args.repeat
+            )
+            print(f"{name[:24]:<24} | {backend:<11} | {parse_ms:>10.1f} | {total_ms:>19.1f} | {peak_mb:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark da navegação enxuta do Instagram: economia medida, não estimada.
+
+Carrega cada perfil duas vezes no Selenium Grid, em sessões novas: uma com o
+bloqueio de imagens, mídia, fontes e rastreadores e outra sem. Os bytes vêm do
+log de desempenho do Chrome (soma de encodedDataLength dos eventos CDP
+Network.loadingFinished, inclusive de outras origens) e o tempo é o de
+driver.get até o cabeçalho do perfil aparecer. A diferença entre as duas
+cargas é a economia por perfil.
+
+Uso (a partir de backend/, com o Selenium Grid do docker-compose no ar):
+    python -m benchmarks.bench_lean_browsing https://www.instagram.com/perfil/ ... [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scraper_modules.instagram_config import SELENIUM_CONFIG  # noqa: E402
+from scraper_modules.webdriver_pool import create_driver  # noqa: E402
+
+
+def network_totals(driver):
+    """(bytes recebidos, requisições concluídas, requisições bloqueadas) desde a última leitura do log"""
+    received = finished = blocked = 0
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        if message['method'] == 'Network.loadingFinished':
+            received += message['params'].get('encodedDataLength', 0)
+            finished += 1
+        elif message['method'] == 'Network.loadingFailed' and message['params'].get('blockedReason'):
+            blocked += 1
+    return received, finished, blocked
+
+
+def load_profile(url, lean):
+    """Mede uma carga do perfil numa sessão nova: (segundos, bytes, concluídas, bloqueadas)"""
+    driver = create_driver(lean_browsing=lean, performance_log=True)
+    try:
+        network_totals(driver)  # Descarta os eventos da criação da sessão
+        start = time.perf_counter()
+        driver.get(url)
+        WebDriverWait(driver, SELENIUM_CONFIG['wait_timeouts']['perfil']).until(
+            EC.presence_of_element_located((By.TAG_NAME, 'header'))
+        )
+        elapsed = time.perf_counter() - start
+        # Recursos que terminam logo após o cabeçalho também contam na transferência
+        time.sleep(1)
+        return (elapsed, *network_totals(driver))
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('urls', nargs='+', help='URLs de perfis do Instagram')
+    parser.add_argument('--repeat', type=int, default=3, help='cargas por modo (usa a mediana)')
+    args = parser.parse_args()
+
+    print(f"{'perfil':>30} | {'modo':>7} | {'tempo (s)':>9} | {'KB':>9} | {'req.':>5} | {'bloq.':>5}")
+    for url in args.urls:
+        medians = {}
+        for lean in (False, True):
+            runs = [load_profile(url, lean) for _ in range(args.repeat)]
+            medians[lean] = tuple(sorted(column)[len(column) // 2] for column in zip(*runs))
+            elapsed, received, finished, blocked = medians[lean]
+            print(f"{url[-30:]:>30} | {'enxuta' if lean else 'normal':>7} | {elapsed:>9.2f} | "
+                  f"{received / 1024:>9.1f} | {finished:>5} | {blocked:>5}")
+        saved_kb = (medians[False][1] - medians[True][1]) / 1024
+        saved_s = medians[False][0] - medians[True][0]
+        print(f"{'economia medida':>30} | {'':>7} | {saved_s:>9.2f} | {saved_kb:>9.1f} |")
+
+
+if __name__ == '__main__':
+    main()
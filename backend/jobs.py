@@ -0,0 +1,290 @@
+# jobs.py - Fila de análises assíncronas com pool de workers
+
+import os
+import json
+import time
+import uuid
+import queue
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuração dos jobs (sobrescrevível por variáveis de ambiente)
+JOBS_CONFIG = {
+    # 'memory' (fila no próprio processo) ou 'redis' (fila compartilhada entre processos)
+    'backend': os.getenv('JOBS_BACKEND', 'memory').lower(),
+    'redis_url': os.getenv('JOBS_REDIS_URL', os.getenv('REDIS_URL', 'redis://localhost:6379/0')),
+    # Workers em background neste processo; 0 apenas enfileira (workers em outro processo)
+    'workers': int(os.getenv('JOBS_WORKERS', '4')),
+    # Tempo que o status/resultado de um job fica disponível após terminar
+    'result_ttl': int(os.getenv('JOBS_RESULT_TTL', '3600')),
+    # Intervalo em que o worker confirma que o job segue em execução
+    'heartbeat_interval': float(os.getenv('JOBS_HEARTBEAT_INTERVAL', '10')),
+    # Job 'running' sem heartbeat há mais que isso: o worker morreu e o job é marcado como falho
+    'stale_after': float(os.getenv('JOBS_STALE_AFTER', '60')),
+    # Tempo máximo de execução, mesmo com heartbeat (worker travado)
+    'max_runtime': float(os.getenv('JOBS_MAX_RUNTIME', '900')),
+    'redis_prefix': os.getenv('JOBS_REDIS_PREFIX', 'analise:jobs')
+}
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED)
+
+
+def _now():
+    return datetime.now().isoformat()
+
+
+class InMemoryJobBackend:
+    """Fila e estado dos jobs em memória (um único processo)"""
+
+    def __init__(self, result_ttl: int = 3600):
+        self.result_ttl = result_ttl
+        self._queue = queue.Queue()
+        self._jobs = {}
+        self._finished_at = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: Dict[str, Any]):
+        with self._lock:
+            self._store(job)
+
+    def save_if_status(self, job: Dict[str, Any], expected: str) -> bool:
+        """Grava o job só se o status guardado ainda for 'expected' (compare-and-set)"""
+        with self._lock:
+            current = self._jobs.get(job['id'])
+            if current is None or current['status'] != expected:
+                return False
+            self._store(job)
+            return True
+
+    def _store(self, job: Dict[str, Any]):
+        self._jobs[job['id']] = dict(job)
+        if job['status'] in FINISHED_STATUSES:
+            self._finished_at[job['id']] = time.monotonic()
+        else:
+            self._finished_at.pop(job['id'], None)
+        self._purge()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def enqueue(self, job_id: str):
+        self._queue.put(job_id)
+
+    def dequeue(self, timeout: float = 1.0) -> Optional[str]:
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _purge(self):
+        # Remove jobs terminados há mais de result_ttl
+        limit = time.monotonic() - self.result_ttl
+        for job_id in [j for j, t in self._finished_at.items() if t < limit]:
+            self._finished_at.pop(job_id, None)
+            self._jobs.pop(job_id, None)
+
+
+class RedisJobBackend:
+    """Fila (lista) e estado (chave JSON com TTL) dos jobs no Redis"""
+
+    def __init__(self, client, prefix: str = 'analise:jobs', result_ttl: int = 3600):
+        self.client = client
+        self.prefix = prefix
+        self.result_ttl = result_ttl
+        self.queue_key = f'{prefix}:queue'
+
+    def _key(self, job_id: str) -> str:
+        return f'{self.prefix}:{job_id}'
+
+    def save(self, job: Dict[str, Any]):
+        self._store(self.client, job)
+
+    def save_if_status(self, job: Dict[str, Any], expected: str) -> bool:
+        """Grava o job só se o status guardado ainda for 'expected' (WATCH/MULTI; repete se a chave mudar)"""
+        from redis.exceptions import WatchError
+
+        key = self._key(job['id'])
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    payload = pipe.get(key)
+                    if not payload or json.loads(payload)['status'] != expected:
+                        pipe.unwatch()
+                        return False
+                    pipe.multi()
+                    self._store(pipe, job)
+                    pipe.execute()
+                    return True
+                except WatchError:
+                    continue
+
+    def _store(self, client, job: Dict[str, Any]):
+        payload = json.dumps(job, ensure_ascii=False, default=str)
+        if job['status'] in FINISHED_STATUSES:
+            client.set(self._key(job['id']), payload, ex=self.result_ttl)
+        else:
+            client.set(self._key(job['id']), payload)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        payload = self.client.get(self._key(job_id))
+        return json.loads(payload) if payload else None
+
+    def enqueue(self, job_id: str):
+        self.client.lpush(self.queue_key, job_id)
+
+    def dequeue(self, timeout: float = 1.0) -> Optional[str]:
+        item = self.client.brpop(self.queue_key, timeout=max(1, int(timeout)))
+        if not item:
+            return None
+        job_id = item[1]
+        return job_id.decode() if isinstance(job_id, bytes) else job_id
+
+
+def create_job_backend(backend: Optional[str] = None, redis_client=None):
+    """Cria o backend configurado; um cliente Redis (ou fakeredis) pode ser injetado"""
+    backend = backend or JOBS_CONFIG['backend']
+    if redis_client is not None or backend == 'redis':
+        if redis_client is None:
+            import redis
+            redis_client = redis.Redis.from_url(JOBS_CONFIG['redis_url'])
+        return RedisJobBackend(redis_client, JOBS_CONFIG['redis_prefix'], JOBS_CONFIG['result_ttl'])
+    return InMemoryJobBackend(JOBS_CONFIG['result_ttl'])
+
+
+class JobManager:
+    """Recebe jobs, entrega aos workers e guarda status/resultado"""
+
+    # Jobs em execução gravam 'heartbeat_at' periodicamente; a leitura de um job 'running' cujo
+    # heartbeat parou (worker morto) ou que passou de max_runtime (worker travado) o marca como falho.
+    # Heartbeat e gravação final só escrevem enquanto o job segue 'running' (save_if_status), então
+    # um job já marcado como falho não volta a rodar nem tem o status sobrescrito pelo worker
+
+    def __init__(self, backend=None, workers: Optional[int] = None,
+                 heartbeat_interval: Optional[float] = None,
+                 stale_after: Optional[float] = None,
+                 max_runtime: Optional[float] = None):
+        self.backend = backend or create_job_backend()
+        self.workers = JOBS_CONFIG['workers'] if workers is None else workers
+        self.heartbeat_interval = heartbeat_interval or JOBS_CONFIG['heartbeat_interval']
+        self.stale_after = stale_after or JOBS_CONFIG['stale_after']
+        self.max_runtime = max_runtime or JOBS_CONFIG['max_runtime']
+        self._runners: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        self._threads = []
+        self._stop = threading.Event()
+
+    def register(self, kind: str, runner: Callable[[Dict[str, Any]], Any]):
+        """Associa um tipo de job à função que o executa (recebe o payload)"""
+        self._runners[kind] = runner
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Cria o job, enfileira e retorna imediatamente"""
+        if kind not in self._runners:
+            raise ValueError(f"Tipo de job desconhecido: {kind}")
+        job = {
+            'id': uuid.uuid4().hex,
+            'kind': kind,
+            'payload': payload,
+            'status': STATUS_QUEUED,
+            'created_at': _now(),
+            'started_at': None,
+            'heartbeat_at': None,
+            'finished_at': None,
+            'result': None,
+            'error': None
+        }
+        self.backend.save(job)
+        self.backend.enqueue(job['id'])
+        self.start()
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.backend.get(job_id)
+        if job and job['status'] == STATUS_RUNNING:
+            reason = self._stale_reason(job)
+            if reason:
+                logger.warning(f"⚠️ Job {job_id} ({job['kind']}) marcado como falho: {reason}")
+                failed = dict(job, status=STATUS_FAILED, error=reason, finished_at=_now())
+                if self.backend.save_if_status(failed, STATUS_RUNNING):
+                    return failed
+                # O worker terminou entre a leitura e a gravação: vale o status que ele gravou
+                return self.backend.get(job_id)
+        return job
+
+    def _stale_reason(self, job: Dict[str, Any]) -> Optional[str]:
+        now = time.time()
+        heartbeat_at = job.get('heartbeat_at') or 0
+        if now - heartbeat_at > self.stale_after:
+            return f'Worker parou de responder (sem heartbeat há mais de {self.stale_after:g}s)'
+        started_at = job.get('started_ts') or now
+        if now - started_at > self.max_runtime:
+            return f'Tempo máximo de execução excedido ({self.max_runtime:g}s)'
+        return None
+
+    def start(self):
+        """Inicia os workers (uma vez, sob demanda)"""
+        if self._threads or self.workers <= 0:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"🧵 {self.workers} workers de jobs iniciados")
+
+    def stop(self):
+        self._stop.set()
+
+    def _work(self):
+        while not self._stop.is_set():
+            job_id = self.backend.dequeue(timeout=1.0)
+            if job_id is None:
+                continue
+            job = self.backend.get(job_id)
+            if job is None:
+                continue
+            self.run_job(job)
+
+    def run_job(self, job: Dict[str, Any]):
+        """Executa um job e grava o resultado ou o erro"""
+        job.update(status=STATUS_RUNNING, started_at=_now(), started_ts=time.time(), heartbeat_at=time.time())
+        self.backend.save(job)
+        beating = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(dict(job), beating),
+                                     name=f"job-heartbeat-{job['id'][:8]}", daemon=True)
+        heartbeat.start()
+        try:
+            job['result'] = self._runners[job['kind']](job['payload'])
+            job['status'] = STATUS_DONE
+            logger.info(f"✅ Job {job['id']} ({job['kind']}) concluído")
+        except Exception as e:
+            job['error'] = str(e)
+            job['status'] = STATUS_FAILED
+            logger.error(f"❌ Job {job['id']} ({job['kind']}) falhou: {e}")
+        finally:
+            # O heartbeat para antes da gravação final para não sobrescrever o status
+            beating.set()
+            heartbeat.join()
+        job['finished_at'] = _now()
+        if not self.backend.save_if_status(job, STATUS_RUNNING):
+            logger.warning(f"⚠️ Job {job['id']} ({job['kind']}) já tinha sido marcado como falho; resultado descartado")
+
+    def _heartbeat(self, job: Dict[str, Any], stop: threading.Event):
+        while not stop.wait(self.heartbeat_interval):
+            job['heartbeat_at'] = time.time()
+            try:
+                if not self.backend.save_if_status(job, STATUS_RUNNING):
+                    return
+            except Exception as e:
+                logger.warning(f"Heartbeat do job {job['id']} falhou: {e}")
@@ -0,0 +1,279 @@
+# persistence.py - Gravação assíncrona (write-behind) das análises no Supabase
+
+import os
+import glob
+import json
+import time
+import uuid
+import queue
+import atexit
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from scraper_modules.cache_store import cache_path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuração da persistência (sobrescrevível por variáveis de ambiente)
+PERSIST_CONFIG = {
+    'batch_size': int(os.getenv('PERSIST_BATCH_SIZE', '50')),
+    # Espera máxima para completar um lote antes de gravar
+    'flush_interval': float(os.getenv('PERSIST_FLUSH_INTERVAL', '2')),
+    'max_retries': int(os.getenv('PERSIST_MAX_RETRIES', '5')),
+    'backoff_base': float(os.getenv('PERSIST_BACKOFF_BASE', '1')),
+    'backoff_max': float(os.getenv('PERSIST_BACKOFF_MAX', '60')),
+    # Linhas mantidas em memória; o excedente fica apenas no journal até ser reenviado
+    'max_pending': int(os.getenv('PERSIST_MAX_PENDING', '1000')),
+    # Intervalo para reenviar linhas do journal após o banco ficar indisponível
+    'replay_interval': float(os.getenv('PERSIST_REPLAY_INTERVAL', '60')),
+    # Base do journal: cada processo grava em <base>.<pid>.jsonl (reloader e vários workers não se misturam)
+    'journal_path': os.getenv('PERSIST_JOURNAL_PATH', cache_path('supabase_journal.jsonl')),
+    # Tamanho do journal a partir do qual ele é reescrito só com as linhas pendentes
+    'journal_compact_bytes': int(os.getenv('PERSIST_JOURNAL_COMPACT_BYTES', str(1024 * 1024)))
+}
+
+
+def _try_lock(handle) -> bool:
+    """Trava exclusiva sem espera; liberada pelo sistema quando o processo dono termina"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+class WriteBehindPersister:
+    """Grava linhas em lotes numa thread de fundo, com retentativas e journal local"""
+
+    # Cada linha entra no journal antes da fila e recebe um 'ack' depois de inserida;
+    # linhas sem 'ack' são reenviadas ao reiniciar o processo (entrega ao menos uma vez).
+    # O journal é do processo e fica travado enquanto ele vive; journals de processos
+    # encerrados (trava livre) são adotados no start()
+
+    def __init__(self, insert_batch: Callable[[List[Dict[str, Any]]], Any],
+                 journal_path: Optional[str] = None,
+                 batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None,
+                 max_retries: Optional[int] = None):
+        self.insert_batch = insert_batch
+        self.journal_base = journal_path or PERSIST_CONFIG['journal_path']
+        root, ext = os.path.splitext(self.journal_base)
+        self.journal_path = f'{root}.{os.getpid()}{ext}'
+        self.batch_size = batch_size or PERSIST_CONFIG['batch_size']
+        self.flush_interval = flush_interval if flush_interval is not None else PERSIST_CONFIG['flush_interval']
+        self.max_retries = max_retries if max_retries is not None else PERSIST_CONFIG['max_retries']
+        self._queue = queue.Queue()
+        self._journal_lock = threading.Lock()
+        self._unacked = {}
+        # Ids na fila em memória ou no lote em gravação (não são reenviados pelo replay)
+        self._queued = set()
+        self._journal_bytes = 0
+        self._lock_handle = None
+        self._spilled = False
+        self._last_replay = time.monotonic()
+        self._thread = None
+        self._stop = threading.Event()
+        self._counters = {'enqueued': 0, 'written': 0, 'failed_attempts': 0, 'spilled': 0, 'replayed': 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.journal_path)), exist_ok=True)
+
+    # Journal
+
+    def _append_journal(self, entry: Dict[str, Any]):
+        line = json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+        with open(self.journal_path, 'a', encoding='utf-8') as journal:
+            journal.write(line)
+            journal.flush()
+            os.fsync(journal.fileno())
+        self._journal_bytes += len(line.encode('utf-8'))
+
+    @staticmethod
+    def _read_journal(path: str) -> Dict[str, Dict[str, Any]]:
+        """Linhas do journal ainda sem confirmação, na ordem em que foram enfileiradas"""
+        rows = {}
+        if not os.path.exists(path):
+            return rows
+        with open(path, encoding='utf-8') as journal:
+            for line in journal:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Linha truncada por queda do processo
+                if 'ack' in entry:
+                    for row_id in entry['ack']:
+                        rows.pop(row_id, None)
+                elif 'id' in entry:
+                    rows[entry['id']] = entry['row']
+        return rows
+
+    def _compact_journal(self):
+        # Reescreve o journal só com as linhas pendentes
+        tmp_path = self.journal_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as journal:
+            for row_id, row in self._unacked.items():
+                journal.write(json.dumps({'id': row_id, 'row': row}, ensure_ascii=False, default=str) + '\n')
+        os.replace(tmp_path, self.journal_path)
+        self._journal_bytes = os.path.getsize(self.journal_path)
+
+    def _adopt_orphan_journals(self) -> Dict[str, Dict[str, Any]]:
+        """Linhas pendentes dos journals cujo processo dono já terminou (inclui o journal sem pid)"""
+        root, ext = os.path.splitext(self.journal_base)
+        rows = {}
+        for path in [self.journal_base] + sorted(glob.glob(f'{glob.escape(root)}.*{ext}')):
+            if path == self.journal_path or not os.path.exists(path):
+                continue
+            with open(path + '.lock', 'a') as lock_handle:
+                if not _try_lock(lock_handle):
+                    continue  # Processo dono ainda vivo
+                orphan = self._read_journal(path)
+                if orphan:
+                    logger.info(f"📒 {len(orphan)} linhas adotadas de {os.path.basename(path)}")
+                rows.update(orphan)
+                os.remove(path)
+            try:
+                os.remove(path + '.lock')
+            except OSError:
+                pass  # Outro processo adotou o mesmo journal ao mesmo tempo
+        return rows
+
+    # API
+
+    def start(self):
+        """Recupera linhas pendentes do journal e inicia a thread de gravação"""
+        if self._thread is not None:
+            return
+        with self._journal_lock:
+            self._lock_handle = open(self.journal_path + '.lock', 'a')
+            _try_lock(self._lock_handle)
+            self._unacked = self._read_journal(self.journal_path)
+            self._unacked.update(self._adopt_orphan_journals())
+            self._compact_journal()
+            pending = list(self._unacked.items())
+        if pending:
+            logger.info(f"📒 {len(pending)} linhas pendentes recuperadas do journal")
+            self._counters['replayed'] += len(pending)
+            self._enqueue_memory(pending)
+        self._thread = threading.Thread(target=self._work, name='supabase-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def enqueue(self, row: Dict[str, Any]):
+        """Registra a linha no journal e agenda a gravação (não bloqueia no banco)"""
+        self.start()
+        row_id = uuid.uuid4().hex
+        with self._journal_lock:
+            self._append_journal({'id': row_id, 'row': row})
+            self._unacked[row_id] = row
+        self._counters['enqueued'] += 1
+        self._enqueue_memory([(row_id, row)])
+
+    def _enqueue_memory(self, items):
+        with self._journal_lock:
+            for row_id, row in items:
+                if row_id in self._queued:
+                    continue  # Já está na fila ou no lote em gravação
+                if self._queue.qsize() >= PERSIST_CONFIG['max_pending']:
+                    # Fila cheia: a linha continua no journal e será reenviada depois
+                    self._spilled = True
+                    self._counters['spilled'] += 1
+                    continue
+                self._queued.add(row_id)
+                self._queue.put((row_id, row))
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Espera a fila esvaziar (ou o tempo limite); retorna True se tudo foi gravado"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self._unacked:
+                return True
+            time.sleep(0.05)
+        return not self._unacked
+
+    def close(self):
+        self.flush(timeout=PERSIST_CONFIG['flush_interval'] * 2)
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._counters, 'pending': len(self._unacked), 'queued': self._queue.qsize()}
+
+    # Thread de gravação
+
+    def _next_batch(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _work(self):
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if not batch:
+                self._maybe_replay()
+                continue
+            self._write(batch)
+
+    def _write(self, batch):
+        rows = [row for _, row in batch]
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.insert_batch(rows)
+                break
+            except Exception as e:
+                self._counters['failed_attempts'] += 1
+                if attempt == self.max_retries:
+                    # Banco indisponível: as linhas ficam no journal para nova tentativa
+                    logger.error(f"❌ Falha ao gravar {len(rows)} linhas após {attempt + 1} tentativas: {e}")
+                    with self._journal_lock:
+                        self._queued.difference_update(row_id for row_id, _ in batch)
+                    self._spilled = True
+                    self._last_replay = time.monotonic()
+                    return
+                delay = min(PERSIST_CONFIG['backoff_max'], PERSIST_CONFIG['backoff_base'] * (2 ** attempt))
+                logger.warning(f"⚠️ Erro ao gravar lote ({e}); nova tentativa em {delay:.0f}s")
+                if self._stop.wait(delay):
+                    return
+
+        ids = [row_id for row_id, _ in batch]
+        with self._journal_lock:
+            self._append_journal({'ack': ids})
+            for row_id in ids:
+                self._unacked.pop(row_id, None)
+                self._queued.discard(row_id)
+            # Sob tráfego contínuo o journal nunca esvazia: reescreve ao passar do limite
+            if not self._unacked or self._journal_bytes > PERSIST_CONFIG['journal_compact_bytes']:
+                self._compact_journal()
+        self._counters['written'] += len(rows)
+        logger.info(f"✅ {len(rows)} análises salvas no Supabase")
+
+    def _maybe_replay(self):
+        # Após falhas, recoloca na fila as linhas que só existem no journal
+        if not self._spilled or time.monotonic() - self._last_replay < PERSIST_CONFIG['replay_interval']:
+            return
+        self._spilled = False
+        self._last_replay = time.monotonic()
+        with self._journal_lock:
+            pending = [(row_id, row) for row_id, row in self._unacked.items() if row_id not in self._queued]
+        if pending:
+            logger.info(f"📒 Reenviando {len(pending)} linhas do journal")
+            self._counters['replayed'] += len(pending)
+            self._enqueue_memory(pending)
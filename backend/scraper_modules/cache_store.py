@@ -0,0 +1,27 @@
+import logging
+import os
+import sqlite3
+import tempfile
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Diretório padrão dos caches e arquivos de estado (sobrescrevível por variável de ambiente).
+# Fica no diretório temporário: o diretório do código pode ser somente leitura (ex.: Vercel)
+CACHE_DIR = os.getenv('CACHE_DIR', tempfile.gettempdir())
+
+
+def cache_path(filename):
+    """Caminho padrão de um arquivo de cache dentro de CACHE_DIR"""
+    return os.path.join(CACHE_DIR, filename)
+
+
+def open_cache(cache_class, null_class, label, path, *args, **kwargs):
+    """cache_class(path, ...); se o disco não permitir (ex.: sistema de arquivos somente leitura),
+    registra o erro e devolve null_class(), que não guarda nada"""
+    try:
+        return cache_class(path, *args, **kwargs)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"{label} desativado: não foi possível abrir {path} ({e})")
+        return null_class()
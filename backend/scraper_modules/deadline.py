@@ -0,0 +1,66 @@
+import os
+import time
+
+# Prazos das requisições (sobrescrevíveis por variáveis de ambiente)
+DEADLINE_CONFIG = {
+    # Prazo total de uma análise no servidor Flask; vazio = sem prazo além dos timeouts dos estágios
+    'request_seconds': float(os.getenv('REQUEST_DEADLINE_SECONDS')) if os.getenv('REQUEST_DEADLINE_SECONDS') else None,
+    # Função serverless: maxDuration do vercel.json (30s) menos a margem para montar a resposta
+    'serverless_seconds': float(os.getenv('SERVERLESS_DEADLINE_SECONDS', '25')),
+    # Folga reservada em cada estágio para compilar e devolver o resultado parcial
+    'safety_margin': float(os.getenv('DEADLINE_SAFETY_MARGIN', '1.5')),
+    # Tempo mínimo restante para iniciar cada tipo de operação
+    'min_page_seconds': float(os.getenv('DEADLINE_MIN_PAGE_SECONDS', '2')),
+    'min_query_seconds': float(os.getenv('DEADLINE_MIN_QUERY_SECONDS', '2')),
+    'min_webdriver_seconds': float(os.getenv('DEADLINE_MIN_WEBDRIVER_SECONDS', '8'))
+}
+
+
+class Deadline:
+    """Prazo de uma requisição, repassado aos estágios para que devolvam resultados parciais a tempo"""
+
+    def __init__(self, seconds=None, parent=None):
+        now = time.monotonic()
+        expires_at = now + seconds if seconds is not None else None
+        if parent is not None and parent.expires_at is not None:
+            expires_at = parent.expires_at if expires_at is None else min(expires_at, parent.expires_at)
+        self.expires_at = expires_at
+        self.started_at = now
+
+    def child(self, seconds=None):
+        """Prazo de um estágio: no máximo 'seconds' a partir de agora, sem passar do prazo atual"""
+        return Deadline(seconds, parent=self)
+
+    def remaining(self):
+        """Segundos restantes (infinito quando não há prazo)"""
+        if self.expires_at is None:
+            return float('inf')
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def has(self, seconds):
+        """True se ainda há pelo menos 'seconds' (mais a margem de segurança) no prazo"""
+        return self.remaining() >= seconds + DEADLINE_CONFIG['safety_margin']
+
+    def cap(self, timeout):
+        """Limita um timeout ao tempo útil restante"""
+        usable = self.remaining() - DEADLINE_CONFIG['safety_margin']
+        return max(0.1, min(timeout, usable))
+
+    def summary(self):
+        """Orçamento e tempo gasto, para incluir nas respostas"""
+        remaining = self.remaining()
+        return {
+            'budget_s': round(self.expires_at - self.started_at, 2) if self.expires_at is not None else None,
+            'elapsed_s': round(time.monotonic() - self.started_at, 2),
+            'remaining_s': round(remaining, 2) if remaining != float('inf') else None
+        }
+
+
+def stage_deadline(deadline=None, seconds=None):
+    """Prazo de um estágio a partir do prazo da requisição (ou sem pai) e do timeout do estágio"""
+    if seconds is not None:
+        seconds = max(0.0, seconds - DEADLINE_CONFIG['safety_margin'])
+    return (deadline or Deadline()).child(seconds)
@@ -0,0 +1,28 @@
+# Configuração do Google Scraper
+# Os valores podem ser sobrescritos por variáveis de ambiente do processo
+
+import os
+
+from .cache_store import cache_path
+
+# Orçamento de cortesia para buscas no Google (compartilhado por todo o processo)
+GOOGLE_SEARCH_CONFIG = {
+    # Taxa média de buscas por segundo (token bucket)
+    'queries_per_second': float(os.getenv('GOOGLE_QUERIES_PER_SECOND', '2')),
+    # Quantidade de buscas que podem sair em rajada antes de respeitar a taxa
+    'burst': int(os.getenv('GOOGLE_QUERY_BURST', '4')),
+    # Buscas simultâneas em andamento
+    'max_concurrent_queries': int(os.getenv('GOOGLE_MAX_CONCURRENT_QUERIES', '8')),
+    # Seções de search_website_info executadas em paralelo
+    'max_concurrent_sections': int(os.getenv('GOOGLE_MAX_CONCURRENT_SECTIONS', '12')),
+    'request_timeout': float(os.getenv('GOOGLE_REQUEST_TIMEOUT', '10')),
+
+    # Cache de resultados (SERP) por query normalizada
+    'serp_cache_enabled': os.getenv('GOOGLE_SERP_CACHE_ENABLED', 'true').lower() == 'true',
+    'serp_cache_path': os.getenv('GOOGLE_SERP_CACHE_PATH', cache_path('serp_cache.sqlite')),
+    'serp_cache_memory_entries': int(os.getenv('GOOGLE_SERP_CACHE_MEMORY_ENTRIES', '512')),
+    # TTL das buscas que dependem do domínio analisado
+    'serp_cache_ttl': int(os.getenv('GOOGLE_SERP_CACHE_TTL', str(24 * 3600))),
+    # TTL das buscas compartilhadas entre clientes (ex.: concorrentes do setor)
+    'serp_cache_shared_ttl': int(os.getenv('GOOGLE_SERP_CACHE_SHARED_TTL', str(7 * 24 * 3600)))
+}
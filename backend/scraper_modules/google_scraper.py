@@ -1,15 +1,57 @@
-import requests
-from bs4 import BeautifulSoup
 import re
-import time
+import threading
 from urllib.parse import quote_plus, urljoin
 import json
 from datetime import datetime
 
+from .google_config import GOOGLE_SEARCH_CONFIG
+from .query_scheduler import TokenBucket, QueryScheduler
+from .serp_cache import NullSerpCache, SerpCache
+from .cache_store import open_cache
+from .http_pool import http_sessions
+from .html_parser import parse_html
+from .deadline import DEADLINE_CONFIG
+
+# Prioridade das seções quando o prazo aperta (0 = mais importante); as de menor
+# prioridade param de buscar antes, deixando o tempo restante para as principais
+SECTION_PRIORITIES = {
+    'general_info': 0,
+    'social_presence': 1,
+    'seo_analysis': 2,
+    'reviews': 2,
+    'competitors': 3,
+    'ads_presence': 3
+}
+
+# Agendador compartilhado: o orçamento de buscas vale para o processo inteiro
+query_scheduler = QueryScheduler(
+    TokenBucket(GOOGLE_SEARCH_CONFIG['queries_per_second'], GOOGLE_SEARCH_CONFIG['burst']),
+    max_workers=GOOGLE_SEARCH_CONFIG['max_concurrent_queries'],
+    max_sections=GOOGLE_SEARCH_CONFIG['max_concurrent_sections']
+)
+
+# Cache de resultados compartilhado por todas as instâncias
+if GOOGLE_SEARCH_CONFIG['serp_cache_enabled']:
+    serp_cache = open_cache(
+        SerpCache, NullSerpCache, 'Cache de buscas', GOOGLE_SEARCH_CONFIG['serp_cache_path'],
+        max_memory_entries=GOOGLE_SEARCH_CONFIG['serp_cache_memory_entries'],
+        default_ttl=GOOGLE_SEARCH_CONFIG['serp_cache_ttl']
+    )
+else:
+    serp_cache = NullSerpCache()
+
 class GoogleScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, scheduler=None, result_cache=None, cancel_event=None):
+        self.scheduler = scheduler or query_scheduler
+        self.result_cache = result_cache or serp_cache
+        # Evento que, quando sinalizado, faz as buscas restantes serem puladas
+        self.cancel_event = cancel_event
+        # Prazo da análise em andamento (instâncias são criadas por análise, como o cancel_event)
+        self.deadline = None
+        self._skipped_queries = {}
+        self._skipped_lock = threading.Lock()
+        # Sessão compartilhada: conexões com google.com são reaproveitadas entre análises
+        self.session = http_sessions.get_session('google', headers={
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
@@ -19,25 +61,42 @@ class GoogleScraper:
             'Upgrade-Insecure-Requests': '1'
         })
     
-    def search_website_info(self, website_url):
-        """Busca informações sobre o website no Google"""
+    def search_website_info(self, website_url, on_section=None, deadline=None):
+        """Busca informações sobre o website no Google (on_section(nome, resultado) a cada seção concluída);
+        com deadline, seções e buscas de menor prioridade são puladas e o resultado vem marcado como parcial"""
         try:
+            self.deadline = deadline
+            self._skipped_queries = {}
+            
             # Extrair domínio da URL
             domain = self._extract_domain(website_url)
             
-            # Realizar múltiplas buscas para coletar informações
-            search_results = {
-                'general_info': self._search_general_info(domain),
-                'seo_analysis': self._search_seo_info(domain),
-                'social_presence': self._search_social_presence(domain),
-                'ads_presence': self._search_ads_presence(domain),
-                'reviews': self._search_reviews(domain),
-                'competitors': self._search_competitors(domain)
-            }
+            # Realizar múltiplas buscas em paralelo para coletar informações
+            search_results = self.scheduler.run_sections({
+                'general_info': self._section('general_info', lambda: self._search_general_info(domain)),
+                'seo_analysis': self._section('seo_analysis', lambda: self._search_seo_info(domain)),
+                'social_presence': self._section('social_presence', lambda: self._search_social_presence(domain)),
+                'ads_presence': self._section('ads_presence', lambda: self._search_ads_presence(domain)),
+                'reviews': self._section('reviews', lambda: self._search_reviews(domain)),
+                'competitors': self._section('competitors', lambda: self._search_competitors(domain))
+            }, on_section=on_section)
             
             # Compilar análise final
             analysis = self._compile_analysis(website_url, search_results)
             
+            if deadline is not None:
+                skipped_sections = [name for name, result in search_results.items()
+                                    if isinstance(result, dict) and result.get('skipped')]
+                truncated_sections = {name: count for name, count in self._skipped_queries.items()
+                                      if name not in skipped_sections}
+                analysis['partial'] = bool(skipped_sections or truncated_sections)
+                analysis['deadline'] = {
+                    **deadline.summary(),
+                    'skipped_sections': skipped_sections,
+                    # Seções que rodaram com parte das buscas puladas: {seção: buscas puladas}
+                    'truncated_sections': truncated_sections
+                }
+            
             return analysis
             
         except Exception as e:
@@ -47,20 +106,41 @@ class GoogleScraper:
                 'timestamp': datetime.now().isoformat()
             }
     
-    def _extract_domain(self, url):
-        """Extrai o domínio da URL"""
+    def _has_budget(self, section):
+        """True se ainda cabe uma busca da seção no prazo (seções de menor prioridade exigem mais folga)"""
+        if self.deadline is None:
+            return True
+        priority = SECTION_PRIORITIES.get(section, 0)
+        return self.deadline.has(DEADLINE_CONFIG['min_query_seconds'] * (priority + 1))
+    
+    def _section(self, name, search):
+        """Envolve a seção para que seja pulada (com marcação explícita) quando o prazo não comporta"""
+        def run():
+            if not self._has_budget(name):
+                return {'error': 'Seção pulada: prazo da análise esgotado', 'skipped': True}
+            return search()
+        return run
+    
+    def _skip_query(self, section):
+        with self._skipped_lock:
+            self._skipped_queries[section] = self._skipped_queries.get(section, 0) + 1
+    
+    @staticmethod
+    def _extract_domain(url):
+        """Extrai o domínio canônico da URL (sem www., em minúsculas)"""
+        url = url.strip()
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
         
         from urllib.parse import urlparse
         parsed = urlparse(url)
-        return parsed.netloc.replace('www.', '')
+        return parsed.netloc.lower().replace('www.', '')
     
     def _search_general_info(self, domain):
         """Busca informações gerais sobre o site"""
         try:
             query = f'site:{domain}'
-            results = self._perform_google_search(query)
+            results = self._perform_google_search(query, section='general_info')
             
             return {
                 'indexed_pages': self._count_indexed_pages(results),
@@ -80,8 +160,7 @@ class GoogleScraper:
             ]
             
             seo_info = []
-            for query in queries:
-                results = self._perform_google_search(query)
+            for results in self._perform_google_searches(queries, section='seo_analysis'):
                 seo_info.extend(self._extract_seo_insights(results))
             
             return {
@@ -97,9 +176,11 @@ class GoogleScraper:
             social_platforms = ['instagram', 'facebook', 'youtube', 'linkedin', 'twitter']
             social_presence = {}
             
-            for platform in social_platforms:
-                query = f'site:{platform}.com "{domain}" OR "{domain.replace(".com", "")}"'
-                results = self._perform_google_search(query)
+            queries = [
+                f'site:{platform}.com "{domain}" OR "{domain.replace(".com", "")}"'
+                for platform in social_platforms
+            ]
+            for platform, results in zip(social_platforms, self._perform_google_searches(queries, section='social_presence')):
                 social_presence[platform] = self._extract_social_links(results, platform)
             
             return social_presence
@@ -117,8 +198,7 @@ class GoogleScraper:
             ]
             
             ads_info = []
-            for query in queries:
-                results = self._perform_google_search(query)
+            for results in self._perform_google_searches(queries, section='ads_presence'):
                 ads_info.extend(self._extract_ads_info(results))
             
             return {
@@ -139,8 +219,7 @@ class GoogleScraper:
             ]
             
             reviews = []
-            for query in queries:
-                results = self._perform_google_search(query)
+            for results in self._perform_google_searches(queries, section='reviews'):
                 reviews.extend(self._extract_reviews(results))
             
             return {
@@ -157,9 +236,12 @@ class GoogleScraper:
             sector_keywords = self._identify_sector_keywords(domain)
             
             competitors = []
-            for keyword in sector_keywords:
-                query = f'{keyword} -site:{domain}'
-                results = self._perform_google_search(query)
+            # As palavras-chave do setor são as mesmas para todos os clientes: a busca
+            # sai sem "-site:" para ser compartilhada no cache e o domínio é filtrado aqui
+            shared_ttl = GOOGLE_SEARCH_CONFIG['serp_cache_shared_ttl']
+            for results in self._perform_google_searches(sector_keywords, cache_ttl=shared_ttl,
+                                                          section='competitors'):
+                results = [r for r in results if domain not in r.get('url', '')]
                 competitors.extend(self._extract_competitor_sites(results))
             
             return {
@@ -169,27 +251,55 @@ class GoogleScraper:
         except Exception as e:
             return {'error': str(e)}
     
-    def _perform_google_search(self, query, num_results=10):
+    def _perform_google_searches(self, queries, cache_ttl=None, section=None):
+        """Realiza várias buscas em paralelo, mantendo a ordem das queries"""
+        return self.scheduler.map(
+            lambda query: self._perform_google_search(query, cache_ttl=cache_ttl, section=section), queries
+        )
+    
+    def _perform_google_search(self, query, num_results=10, cache_ttl=None, section=None):
         """Realiza busca no Google"""
+        cached = self.result_cache.get(query, num_results)
+        if cached is not None:
+            return cached
+        
+        # Análise cancelada: não gasta o orçamento de buscas
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            return []
+        
+        # Prazo curto: a busca é pulada e contada para marcar o resultado como parcial
+        if not self._has_budget(section):
+            self._skip_query(section)
+            return []
+        
         try:
             # Codificar query para URL
             encoded_query = quote_plus(query)
             url = f'https://www.google.com/search?q={encoded_query}&num={num_results}&hl=pt-BR'
             
-            # Adicionar delay para evitar rate limiting
-            time.sleep(1)
+            # Respeitar o orçamento de buscas compartilhado para evitar rate limiting
+            timeout = GOOGLE_SEARCH_CONFIG['request_timeout']
+            if self.deadline is None:
+                self.scheduler.rate_limiter.acquire()
+            else:
+                # Sem token a tempo de ainda fazer a busca: desiste em vez de estourar o prazo
+                wait = self.deadline.remaining() - DEADLINE_CONFIG['safety_margin'] - DEADLINE_CONFIG['min_query_seconds']
+                if not self.scheduler.rate_limiter.acquire(timeout=max(0.0, wait)):
+                    self._skip_query(section)
+                    return []
+                timeout = self.deadline.cap(timeout)
             
-            response = self.session.get(url, timeout=10)
+            response = self.session.get(url, timeout=timeout)
             response.raise_for_status()
             
             # Definir encoding explicitamente para evitar problemas de decodificação
             response.encoding = 'utf-8'
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            document = parse_html(response.text)
             
             # Extrair resultados de busca
             results = []
-            search_results = soup.find_all('div', class_='g')
+            search_results = document.find_all('div', class_='g')
             
             for result in search_results:
                 title_elem = result.find('h3')
@@ -203,6 +313,10 @@ class GoogleScraper:
                         'snippet': snippet_elem.get_text(strip=True) if snippet_elem else ''
                     })
             
+            # Página sem resultados costuma ser bloqueio/captcha: não guardar no cache
+            if results:
+                self.result_cache.set(query, results, num_results, ttl=cache_ttl)
+            
             return results
             
         except Exception as e:
@@ -0,0 +1,147 @@
+import html
+import re
+
+from .signatures import Regex, SignatureSet
+
+# Indicadores de CMS, verificados na ordem declarada
+CMS_INDICATORS = {
+    'WordPress': [
+        'wp-content', 'wp-includes', 'wordpress',
+        'X-Powered-By: WordPress', Regex(r'generator[^>]*wordpress')
+    ],
+    'Shopify': [
+        'shopify', 'cdn.shopify.com', 'myshopify.com'
+    ],
+    'Magento': [
+        'magento', 'mage/cookies.js', 'skin/frontend'
+    ],
+    'Joomla': [
+        'joomla', '/media/jui/', 'option=com_'
+    ],
+    'Drupal': [
+        'drupal', 'sites/default/files', 'misc/drupal.js'
+    ],
+    'Wix': [
+        'wix.com', 'static.wixstatic.com'
+    ],
+    'Squarespace': [
+        'squarespace', 'static1.squarespace.com'
+    ]
+}
+
+ANALYTICS_INDICATORS = [
+    'google-analytics.com',
+    'googletagmanager.com',
+    'gtag(',
+    'ga(',
+    'gtm'
+]
+
+SOCIAL_PLATFORMS = {
+    'facebook': ['facebook.com', 'fb.com'],
+    'instagram': ['instagram.com'],
+    'twitter': ['twitter.com', 'x.com'],
+    'linkedin': ['linkedin.com'],
+    'youtube': ['youtube.com', 'youtu.be'],
+    'whatsapp': ['whatsapp.com', 'wa.me']
+}
+
+DEVELOPER_PATTERNS = [
+    re.compile(r'desenvolvido por\s*(.+?)(?:\s*\||\s*</)', re.IGNORECASE),
+    re.compile(r'developed by\s*(.+?)(?:\s*\||\s*</)', re.IGNORECASE),
+    re.compile(r'powered by\s*(.+?)(?:\s*\||\s*</)', re.IGNORECASE),
+    re.compile(r'created by\s*(.+?)(?:\s*\||\s*</)', re.IGNORECASE)
+]
+
+DEVELOPER_LINK_KEYWORDS = ['agencia', 'agency', 'desenvolvedor', 'developer', 'webdesign']
+
+# Assinaturas compiladas uma única vez na importação do módulo
+PAGE_SIGNATURES = SignatureSet({**CMS_INDICATORS, 'analytics': ANALYTICS_INDICATORS})
+SOCIAL_SIGNATURES = SignatureSet(SOCIAL_PLATFORMS)
+
+
+class HtmlFeatureExtractor:
+    """Extrai todos os campos do WebsiteScraper em uma única travessia do documento"""
+
+    def extract(self, document, headers):
+        """Percorre a árvore uma vez e devolve CMS, analytics, desenvolvedor, redes sociais, título e meta"""
+        title = None
+        meta_description = None
+        generator = None
+        footer = None
+        anchors = []
+
+        for element in document.iter_elements():
+            name = element.name
+            if name == 'a':
+                href = element.get('href')
+                if href is not None:
+                    anchors.append((href, element))
+            elif name == 'meta':
+                meta_name = element.get('name')
+                if meta_name == 'description' and meta_description is None:
+                    meta_description = element.get('content', '').strip()
+                elif meta_name == 'generator' and generator is None:
+                    generator = element.get('content', '').strip()
+            elif name == 'title' and title is None:
+                title = element.get_text().strip()
+            elif name == 'footer' and footer is None:
+                footer = element
+
+        # Cabeçalhos no formato "nome: valor", um por linha, para casar com as assinaturas
+        headers_text = '\n'.join(f'{name}: {value}' for name, value in (headers or {}).items())
+
+        # CMS e analytics saem da mesma varredura da página; referências de caractere são
+        # decodificadas (ex.: 'wp&#45;content'), como no str(soup) da extração original
+        page_hits = PAGE_SIGNATURES.scan(html.unescape(document.markup))
+        header_hits = PAGE_SIGNATURES.scan(headers_text)
+        cms_detected, cms_evidence = PAGE_SIGNATURES.first_of([page_hits, header_hits], labels=CMS_INDICATORS)
+        analytics_evidence = page_hits.get('analytics', [])
+        social_links, social_evidence = self._find_social_links(anchors)
+
+        return {
+            'cms_detected': cms_detected,
+            'developer_info': self._find_developer_info(footer, generator, anchors),
+            'title': title,
+            'meta_description': meta_description,
+            'has_analytics': bool(analytics_evidence),
+            'social_links': social_links,
+            # Quais assinaturas dispararam cada detecção
+            'detection_evidence': {
+                'cms': cms_evidence,
+                'analytics': analytics_evidence,
+                'social': social_evidence
+            }
+        }
+
+    def _find_developer_info(self, footer, generator, anchors):
+        """Procura informações do desenvolvedor: rodapé, meta generator e links de agências"""
+        if footer is not None:
+            footer_text = footer.get_text()
+            for pattern in DEVELOPER_PATTERNS:
+                match = pattern.search(footer_text)
+                if match:
+                    return match.group(1).strip()
+
+        if generator is not None:
+            return generator
+
+        for href, link in anchors:
+            href = href.lower()
+            text = link.get_text()
+            text_lower = text.lower()
+            if any(keyword in href or keyword in text_lower for keyword in DEVELOPER_LINK_KEYWORDS):
+                return text.strip()
+
+        return None
+
+    def _find_social_links(self, anchors):
+        """Encontra links para redes sociais (e o domínio que identificou cada um)"""
+        found_socials = {}
+        evidence = {}
+        hrefs = [href for href, _ in anchors]
+        for href, (platform, domains) in zip(hrefs, SOCIAL_SIGNATURES.first_each(hrefs)):
+            if platform:
+                found_socials[platform] = href
+                evidence[platform] = domains
+        return found_socials, evidence
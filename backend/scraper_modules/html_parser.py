@@ -0,0 +1,222 @@
+import logging
+import os
+
+from bs4 import BeautifulSoup
+from bs4.dammit import UnicodeDammit
+
+logger = logging.getLogger(__name__)
+
+# Backend de parsing: 'lxml' (padrão), 'selectolax' (opcional) ou 'html.parser'
+HTML_PARSER_CONFIG = {
+    'backend': os.getenv('HTML_PARSER_BACKEND', 'lxml')
+}
+
+# Conteúdo destas tags não conta como texto (mesmo comportamento do get_text do BeautifulSoup)
+_NON_TEXT_TAGS = ('script', 'style', 'template')
+
+
+def _has_class(value, class_):
+    """Confere o atributo class contra um nome ou lista de nomes, como o class_ do BeautifulSoup"""
+    if class_ is None:
+        return True
+    classes = (value or '').split()
+    wanted = [class_] if isinstance(class_, str) else class_
+    return any(name in classes for name in wanted)
+
+
+def _join_text(strings, strip):
+    if strip:
+        return ''.join(s.strip() for s in strings if s.strip())
+    return ''.join(strings)
+
+
+class SoupNode:
+    """Elemento do BeautifulSoup (html.parser)"""
+
+    def __init__(self, tag):
+        self._tag = tag
+        self.name = tag.name
+
+    def get(self, attr, default=None):
+        value = self._tag.get(attr, default)
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def get_text(self, strip=False):
+        return self._tag.get_text(strip=strip)
+
+    def find(self, tag, class_=None):
+        found = self._tag.find(tag, class_=class_) if class_ else self._tag.find(tag)
+        return SoupNode(found) if found is not None else None
+
+    def find_all(self, tag, class_=None):
+        found = self._tag.find_all(tag, class_=class_) if class_ else self._tag.find_all(tag)
+        return [SoupNode(element) for element in found]
+
+    def iter_elements(self):
+        for element in self._tag.find_all(True):
+            yield SoupNode(element)
+
+
+class LxmlNode:
+    """Elemento do lxml.html"""
+
+    def __init__(self, element):
+        self._element = element
+        self.name = element.tag
+
+    def get(self, attr, default=None):
+        return self._element.get(attr, default)
+
+    def get_text(self, strip=False):
+        strings = []
+
+        def collect(element):
+            if element.tag in _NON_TEXT_TAGS:
+                return
+            if element.text:
+                strings.append(element.text)
+            for child in element:
+                if isinstance(child.tag, str):
+                    collect(child)
+                if child.tail:
+                    strings.append(child.tail)
+
+        collect(self._element)
+        return _join_text(strings, strip)
+
+    def find(self, tag, class_=None):
+        for element in self._iter(tag):
+            if _has_class(element.get('class'), class_):
+                return LxmlNode(element)
+        return None
+
+    def find_all(self, tag, class_=None):
+        return [LxmlNode(element) for element in self._iter(tag) if _has_class(element.get('class'), class_)]
+
+    def iter_elements(self):
+        for element in self._iter(None):
+            yield LxmlNode(element)
+
+    def _iter(self, tag):
+        # Apenas descendentes (como no BeautifulSoup) e só elementos, sem comentários
+        for element in self._element.iterdescendants(tag):
+            if isinstance(element.tag, str):
+                yield element
+
+
+class SelectolaxNode:
+    """Elemento do selectolax (lexbor)"""
+
+    def __init__(self, node):
+        self._node = node
+        self.name = node.tag
+
+    def get(self, attr, default=None):
+        value = self._node.attributes.get(attr)
+        return default if value is None else value
+
+    def get_text(self, strip=False):
+        strings = [
+            text_node.text_content or ''
+            for text_node in self._node.traverse(include_text=True)
+            if text_node.tag == '-text' and text_node.parent.tag not in _NON_TEXT_TAGS
+        ]
+        return _join_text(strings, strip)
+
+    def find(self, tag, class_=None):
+        for node in self._descendants(tag):
+            if _has_class(node.attributes.get('class'), class_):
+                return SelectolaxNode(node)
+        return None
+
+    def find_all(self, tag, class_=None):
+        return [SelectolaxNode(node) for node in self._descendants(tag)
+                if _has_class(node.attributes.get('class'), class_)]
+
+    def iter_elements(self):
+        for node in self._node.traverse():
+            if node.mem_id != self._node.mem_id and not node.tag.startswith('-'):
+                yield SelectolaxNode(node)
+
+    def _descendants(self, tag):
+        return [node for node in self._node.css(tag) if node.mem_id != self._node.mem_id]
+
+
+class HtmlDocument:
+    """Documento HTML parseado, com a mesma superfície de consulta para qualquer backend"""
+
+    def __init__(self, root, backend, markup, encoding):
+        self.root = root
+        self.backend = backend
+        # Texto decodificado do documento (para buscas por assinatura)
+        self.markup = markup
+        self.encoding = encoding
+
+    def find(self, tag, class_=None):
+        return self.root.find(tag, class_)
+
+    def find_all(self, tag, class_=None):
+        return self.root.find_all(tag, class_)
+
+    def iter_elements(self):
+        """Todos os elementos do documento, em ordem"""
+        return self.root.iter_elements()
+
+    def get_text(self, strip=False):
+        return self.root.get_text(strip)
+
+
+def _parse_soup(markup):
+    return SoupNode(BeautifulSoup(markup, 'html.parser'))
+
+
+def _parse_lxml(markup):
+    import lxml.html
+    from lxml.etree import ParserError
+
+    try:
+        root = lxml.html.document_fromstring(markup)
+    except ValueError:
+        # Strings com declaração de encoding XML não são aceitas pelo lxml
+        root = lxml.html.document_fromstring(markup.encode('utf-8'))
+    except ParserError:
+        raise ValueError('documento vazio')
+
+    # document_fromstring devolve o <html>: as buscas cobrem todos os seus descendentes
+    return LxmlNode(root)
+
+
+def _parse_selectolax(markup):
+    try:
+        from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    except ImportError:
+        from selectolax.parser import HTMLParser
+    return SelectolaxNode(HTMLParser(markup).root)
+
+
+_BACKENDS = {
+    'html.parser': _parse_soup,
+    'lxml': _parse_lxml,
+    'selectolax': _parse_selectolax
+}
+
+
+def parse_html(content, backend=None):
+    """Parseia bytes ou texto com o backend configurado, voltando ao html.parser se ele falhar"""
+    backend = backend or HTML_PARSER_CONFIG['backend']
+
+    if isinstance(content, bytes) and content:
+        dammit = UnicodeDammit(content, is_html=True)
+        markup = dammit.unicode_markup or ''
+        encoding = dammit.original_encoding
+    else:
+        markup = content.decode('utf-8') if isinstance(content, bytes) else (content or '')
+        encoding = None
+
+    if backend != 'html.parser':
+        try:
+            return HtmlDocument(_BACKENDS[backend](markup), backend, markup, encoding)
+        except Exception as e:
+            logger.debug(f"Backend '{backend}' indisponível, usando html.parser: {e}")
+
+    return HtmlDocument(_parse_soup(markup), 'html.parser', markup, encoding)
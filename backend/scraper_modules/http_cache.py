@@ -0,0 +1,159 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .cache_store import cache_path, open_cache
+
+# Cache HTTP em disco para páginas reanalisadas (sobrescrevível por variáveis de ambiente)
+HTTP_CACHE_CONFIG = {
+    'enabled': os.getenv('WEBSITE_CACHE_ENABLED', 'true').lower() == 'true',
+    'path': os.getenv('WEBSITE_CACHE_PATH', cache_path('http_cache.sqlite')),
+    # Tamanho total dos corpos armazenados; acima disso remove os menos usados (LRU)
+    'max_bytes': int(os.getenv('WEBSITE_CACHE_MAX_BYTES', str(200 * 1024 * 1024))),
+    # Idade máxima de um corpo baixado: depois disso a página é baixada de novo mesmo com 304
+    'max_age': int(os.getenv('WEBSITE_CACHE_MAX_AGE', str(7 * 24 * 3600)))
+}
+
+
+class CachedPage:
+    """Página armazenada: corpo, validadores e resultado da extração"""
+
+    def __init__(self, url, status_code, etag, last_modified, body, extraction, stored_at):
+        self.url = url
+        self.status_code = status_code
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.extraction = extraction
+        self.stored_at = stored_at
+
+    @property
+    def age_seconds(self):
+        return round(time.time() - self.stored_at, 1)
+
+    def conditional_headers(self):
+        """Cabeçalhos If-None-Match / If-Modified-Since para revalidar a página"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class NullHttpCache:
+    """Cache que não armazena nada (desativa a revalidação condicional)"""
+
+    def get(self, url):
+        return None
+
+    def set(self, url, response, body, extraction):
+        pass
+
+    def touch(self, url):
+        pass
+
+    def stats(self):
+        return {'enabled': False}
+
+
+class HttpCache:
+    """Cache HTTP em SQLite com validadores ETag/Last-Modified, limite de tamanho (LRU) e idade máxima"""
+
+    def __init__(self, path, max_bytes=200 * 1024 * 1024, max_age=7 * 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._counters = {'revalidated': 0, 'misses': 0, 'expired': 0, 'stores': 0, 'evictions': 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS http_cache ('
+            'url TEXT PRIMARY KEY, status_code INTEGER, etag TEXT, last_modified TEXT, '
+            'body BLOB NOT NULL, extraction TEXT NOT NULL, size INTEGER NOT NULL, '
+            'stored_at REAL NOT NULL, last_used REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS http_cache_last_used ON http_cache (last_used)')
+        self._db.commit()
+
+    def get(self, url):
+        """Retorna a CachedPage da URL, ou None se ausente ou mais velha que max_age"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT status_code, etag, last_modified, body, extraction, stored_at '
+                'FROM http_cache WHERE url = ?', (url,)
+            ).fetchone()
+            if not row:
+                self._counters['misses'] += 1
+                return None
+            if time.time() - row[5] > self.max_age:
+                self._db.execute('DELETE FROM http_cache WHERE url = ?', (url,))
+                self._db.commit()
+                self._counters['expired'] += 1
+                return None
+            return CachedPage(url, row[0], row[1], row[2], row[3], json.loads(row[4]), row[5])
+
+    def set(self, url, response, body, extraction):
+        """Armazena a página se a resposta trouxer ETag ou Last-Modified"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        if len(body) > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO http_cache '
+                '(url, status_code, etag, last_modified, body, extraction, size, stored_at, last_used) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, response.status_code, etag, last_modified, sqlite3.Binary(body),
+                 json.dumps(extraction, ensure_ascii=False), len(body), now, now)
+            )
+            self._counters['stores'] += 1
+            self._evict()
+            self._db.commit()
+
+    def touch(self, url):
+        """Registra uso após um 304 (a idade do corpo não muda)"""
+        with self._lock:
+            self._db.execute('UPDATE http_cache SET last_used = ? WHERE url = ?', (time.time(), url))
+            self._db.commit()
+            self._counters['revalidated'] += 1
+
+    def _evict(self):
+        # Remove as entradas vencidas e depois as menos usadas até caber em max_bytes
+        self._db.execute('DELETE FROM http_cache WHERE stored_at < ?', (time.time() - self.max_age,))
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM http_cache').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self._db.execute('SELECT url, size FROM http_cache ORDER BY last_used').fetchall():
+            self._db.execute('DELETE FROM http_cache WHERE url = ?', (url,))
+            self._counters['evictions'] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        """Contadores de revalidação e ocupação do cache"""
+        with self._lock:
+            entries, total = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache'
+            ).fetchone()
+            return {'enabled': True, **self._counters, 'entries': entries, 'size_bytes': total}
+
+
+# Cache compartilhado pelo processo
+if HTTP_CACHE_CONFIG['enabled']:
+    http_cache = open_cache(
+        HttpCache, NullHttpCache, 'Cache HTTP', HTTP_CACHE_CONFIG['path'],
+        max_bytes=HTTP_CACHE_CONFIG['max_bytes'],
+        max_age=HTTP_CACHE_CONFIG['max_age']
+    )
+else:
+    http_cache = NullHttpCache()
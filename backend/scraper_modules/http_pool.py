@@ -0,0 +1,228 @@
+import ipaddress
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import allowed_gai_family
+
+# Configuração do pool HTTP compartilhado (sobrescrevível por variáveis de ambiente)
+HTTP_POOL_CONFIG = {
+    # Quantidade de hosts com pool de conexões mantido por sessão
+    'pool_connections': int(os.getenv('HTTP_POOL_CONNECTIONS', '32')),
+    # Conexões simultâneas por host
+    'pool_maxsize': int(os.getenv('HTTP_POOL_MAXSIZE', '8')),
+    # Aguardar conexão livre em vez de abrir conexões extras acima do limite por host
+    'pool_block': os.getenv('HTTP_POOL_BLOCK', 'true').lower() == 'true',
+    # Hosts sem uso por mais tempo que isso têm suas conexões fechadas
+    'idle_timeout': float(os.getenv('HTTP_POOL_IDLE_TIMEOUT', '300')),
+    # Intervalo mínimo entre varreduras de conexões ociosas
+    'eviction_interval': float(os.getenv('HTTP_POOL_EVICTION_INTERVAL', '30'))
+}
+
+
+# Medições de conexão da requisição em andamento, por thread
+_timing = threading.local()
+
+
+@contextmanager
+def connection_timing():
+    """Coleta DNS, conexão TCP e handshake TLS das conexões abertas nesta thread"""
+    record = {'dns': 0.0, 'connect': 0.0, 'tls': 0.0, 'new_connections': 0}
+    previous = getattr(_timing, 'record', None)
+    _timing.record = record
+    try:
+        yield record
+    finally:
+        _timing.record = previous
+
+
+def _add_timing(phase, seconds):
+    record = getattr(_timing, 'record', None)
+    if record is not None:
+        record[phase] += seconds
+
+
+def _is_ip_address(host):
+    try:
+        ipaddress.ip_address(host.strip('[]'))
+        return True
+    except ValueError:
+        return False
+
+
+class _TimedConnectionMixin:
+    """Mede separadamente a resolução DNS e o connect TCP de uma conexão urllib3"""
+
+    def _new_conn(self):
+        record = getattr(_timing, 'record', None)
+        if record is None or _is_ip_address(self._dns_host):
+            return super()._new_conn()
+
+        hostname = self._dns_host
+        started = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(hostname, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror:
+            # O super() reporta o erro de resolução no formato do urllib3
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        record['dns'] += resolved - started
+
+        try:
+            # Conectar direto no endereço resolvido para que o tempo de connect não inclua DNS
+            self._dns_host = addresses[0][4][0]
+            sock = super()._new_conn()
+        except Exception:
+            # Primeiro endereço inacessível: deixar o urllib3 tentar todos os endereços
+            self._dns_host = hostname
+            sock = super()._new_conn()
+        finally:
+            self._dns_host = hostname
+
+        record['connect'] += time.perf_counter() - resolved
+        record['new_connections'] += 1
+        return sock
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    """Conexão HTTPS que separa também o handshake TLS"""
+
+    def connect(self):
+        record = getattr(_timing, 'record', None)
+        if record is None:
+            return super().connect()
+        before = record['dns'] + record['connect']
+        started = time.perf_counter()
+        super().connect()
+        elapsed = time.perf_counter() - started
+        # O que não foi DNS nem connect TCP dentro do connect() é o handshake TLS
+        record['tls'] += max(0.0, elapsed - (record['dns'] + record['connect'] - before))
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter cujos pools usam as conexões instrumentadas"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool
+        }
+
+
+class SessionRegistry:
+    """Registro de sessões requests compartilhadas pelo processo, uma por perfil"""
+
+    def __init__(self, pool_connections, pool_maxsize, pool_block=True,
+                 idle_timeout=300, eviction_interval=30):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.idle_timeout = idle_timeout
+        self.eviction_interval = eviction_interval
+        self._sessions = {}
+        self._last_used = {}
+        self._last_eviction = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _new_adapter(self):
+        return TimedHTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+
+    def get_session(self, name, headers=None, share_cookies=True):
+        """Empresta a sessão do perfil, criando-a na primeira chamada"""
+        self.evict_idle()
+
+        with self._lock:
+            session = self._sessions.get(name)
+            if session is None:
+                session = requests.Session()
+                if headers:
+                    session.headers.update(headers)
+                if not share_cookies:
+                    # Sessão compartilhada entre clientes: não carregar cookies de uma análise para outra
+                    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                session.mount('https://', self._new_adapter())
+                session.mount('http://', self._new_adapter())
+                session.hooks['response'].append(self._touch_hook(name))
+                self._sessions[name] = session
+            return session
+
+    def _touch_hook(self, name):
+        def touch(response, *args, **kwargs):
+            host = urlparse(response.url).hostname
+            with self._lock:
+                self._last_used[(name, host)] = time.monotonic()
+        return touch
+
+    def evict_idle(self, force=False):
+        """Fecha as conexões de hosts ociosos há mais de idle_timeout segundos"""
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_eviction < self.eviction_interval:
+                return
+            self._last_eviction = now
+            idle = [key for key, last in self._last_used.items() if now - last > self.idle_timeout]
+            for key in idle:
+                del self._last_used[key]
+            sessions = dict(self._sessions)
+
+        for name, host in idle:
+            session = sessions.get(name)
+            if session is None:
+                continue
+            for adapter in session.adapters.values():
+                pools = adapter.poolmanager.pools
+                for pool_key in list(pools.keys()):
+                    if pool_key.key_host == host:
+                        # Remover do container fecha o pool e suas conexões
+                        pools.pop(pool_key, None)
+
+    def close_all(self):
+        """Fecha todas as sessões e conexões"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._last_used.clear()
+        for session in sessions:
+            session.close()
+
+    def stats(self):
+        """Hosts com pool ativo por perfil"""
+        with self._lock:
+            sessions = dict(self._sessions)
+        return {
+            name: sorted({
+                pool_key.key_host
+                for adapter in session.adapters.values()
+                for pool_key in adapter.poolmanager.pools.keys()
+            })
+            for name, session in sessions.items()
+        }
+
+
+# Registro compartilhado por todos os scrapers do processo
+http_sessions = SessionRegistry(**HTTP_POOL_CONFIG)
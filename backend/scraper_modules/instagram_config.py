@@ -1,6 +1,8 @@
 # Configuração do Instagram Scraper
 # Para reativar o scraping, mude SCRAPING_ENABLED para True
 
+import os
+
 # Status do scraping do Instagram
 SCRAPING_ENABLED = False
 
@@ -9,7 +11,51 @@ SELENIUM_CONFIG = {
     'command_executor': 'http://selenium:4444/wd/hub',
     'timeout': 10,
     'headless': True,
-    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    # Pool de sessões reaproveitadas: perfis analisados em paralelo
+    'pool_size': int(os.getenv('SELENIUM_POOL_SIZE', '2')),
+    # Sessão é descartada e recriada após N usos (evita acúmulo de memória no Chrome)
+    'max_uses': int(os.getenv('SELENIUM_MAX_USES', '50')),
+    # Espera máxima por uma sessão livre
+    'checkout_timeout': float(os.getenv('SELENIUM_CHECKOUT_TIMEOUT', '30')),
+    # Prazos das esperas por eventos da página (segundos) e intervalo de verificação
+    'wait_timeouts': {
+        'perfil': float(os.getenv('INSTAGRAM_WAIT_PROFILE', '10'))
+    },
+    'poll_frequency': float(os.getenv('INSTAGRAM_WAIT_POLL', '0.1')),
+    # 'script': todos os campos em um único execute_script; 'selectors': um find_elements por seletor
+    'extraction_mode': os.getenv('INSTAGRAM_EXTRACTION_MODE', 'script').lower(),
+    # Posts da grade usados para datar a última postagem (cobre os até 3 posts fixados)
+    'grid_posts': int(os.getenv('INSTAGRAM_GRID_POSTS', '12')),
+    # Abas abertas ao mesmo tempo no modo multi-abas (scrape_many) de uma sessão
+    'max_tabs': int(os.getenv('INSTAGRAM_MAX_TABS', '4')),
+    # Navegação enxuta: só o texto e os atributos lidos são necessários
+    'lean_browsing': {
+        'enabled': os.getenv('INSTAGRAM_LEAN_BROWSING', 'true').lower() == 'true',
+        'block_images': True,
+        'block_media': True,
+        'block_fonts': True,
+        'block_trackers': True,
+        'tracker_hosts': [
+            'google-analytics.com',
+            'googletagmanager.com',
+            'doubleclick.net',
+            'connect.facebook.net',
+            'facebook.com/tr'
+        ],
+        # Tamanho médio suposto de cada recurso bloqueado (bytes): só para a estimativa do relatório por perfil
+        'estimated_bytes': {'image': 45000, 'media': 400000, 'font': 35000, 'tracker': 60000}
+    }
+}
+
+# Busca do perfil só com HTTP (sem Selenium); o WebDriver fica como alternativa quando bloqueado
+HTTP_FETCH_CONFIG = {
+    'enabled': os.getenv('INSTAGRAM_HTTP_ENABLED', 'true').lower() == 'true',
+    # App id público do site web, exigido pelo endpoint web_profile_info
+    'app_id': os.getenv('INSTAGRAM_APP_ID', '936619743392459'),
+    'connect_timeout': float(os.getenv('INSTAGRAM_HTTP_CONNECT_TIMEOUT', '5')),
+    'read_timeout': float(os.getenv('INSTAGRAM_HTTP_READ_TIMEOUT', '10')),
+    'max_bytes': int(os.getenv('INSTAGRAM_HTTP_MAX_BYTES', str(2 * 1024 * 1024)))
 }
 
 # Dados mock para quando o scraping estiver desativado
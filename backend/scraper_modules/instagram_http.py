@@ -0,0 +1,142 @@
+import logging
+
+import requests
+
+from .http_pool import http_sessions
+from .page_fetcher import fetch_page
+from .instagram_config import HTTP_FETCH_CONFIG, SELENIUM_CONFIG
+from .instagram_page_parser import parse_profile_info, parse_profile_page, profile_from_parsed, extract_username
+from .deadline import DEADLINE_CONFIG
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PROFILE_INFO_URL = 'https://www.instagram.com/api/v1/users/web_profile_info/?username={username}'
+PROFILE_PAGE_URL = 'https://www.instagram.com/{username}/'
+
+# Respostas que indicam bloqueio (login obrigatório, desafio ou limite de requisições)
+BLOCKED_STATUS_CODES = (401, 403, 429)
+BLOCKED_URL_MARKERS = ('/accounts/login', '/challenge')
+
+# Campos sem os quais o resultado HTTP não substitui o WebDriver
+REQUIRED_FIELDS = ('followers', 'following', 'posts_count')
+
+
+class InstagramBlockedError(Exception):
+    """Instagram recusou a busca via HTTP ou não entregou os dados do perfil"""
+
+
+class InstagramProfileNotFound(Exception):
+    """Perfil inexistente"""
+
+
+class InstagramDeadlineExceeded(Exception):
+    """Prazo da análise acabou antes de a busca terminar"""
+
+
+class InstagramHttpFetcher:
+    """Perfil público do Instagram via requests (endpoint web_profile_info e, em seguida, o HTML do perfil)"""
+
+    def __init__(self, session=None):
+        # Sessão compartilhada: conexões keep-alive com o Instagram sobrevivem entre análises
+        self.session = session or http_sessions.get_session('instagram', headers={
+            'User-Agent': SELENIUM_CONFIG['user_agent'],
+            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8'
+        }, share_cookies=False)
+
+    def _get(self, url, headers=None, deadline=None):
+        timeout = (HTTP_FETCH_CONFIG['connect_timeout'], HTTP_FETCH_CONFIG['read_timeout'])
+        if deadline is not None:
+            if not deadline.has(DEADLINE_CONFIG['min_page_seconds']):
+                raise InstagramDeadlineExceeded(url)
+            timeout = tuple(deadline.cap(value) for value in timeout)
+        result = fetch_page(self.session, url, headers=headers,
+                            max_bytes=HTTP_FETCH_CONFIG['max_bytes'], timeout=timeout,
+                            max_transfer_seconds=deadline.cap(HTTP_FETCH_CONFIG['read_timeout']) if deadline else None)
+        response = result.response
+        if response.status_code == 404:
+            raise InstagramProfileNotFound(url)
+        if response.status_code in BLOCKED_STATUS_CODES or any(
+                marker in (response.url or '') for marker in BLOCKED_URL_MARKERS):
+            raise InstagramBlockedError(f'HTTP {response.status_code} em {response.url}')
+        if response.status_code != 200:
+            raise InstagramBlockedError(f'HTTP {response.status_code} em {url}')
+        return result.content.decode(response.encoding or 'utf-8', errors='replace')
+
+    def fetch(self, instagram_url, deadline=None):
+        """Campos do perfil no formato do InstagramScraper; InstagramBlockedError se bloqueado"""
+        username = extract_username(instagram_url)
+        if not username:
+            raise InstagramProfileNotFound(instagram_url)
+
+        parsed = {}
+        source = None
+        try:
+            # JSON do perfil: contagens exatas, bio, foto, tipo de conta e os últimos posts
+            parsed = parse_profile_info(self._get(PROFILE_INFO_URL.format(username=username), headers={
+                'X-IG-App-ID': HTTP_FETCH_CONFIG['app_id'],
+                'Accept': 'application/json'
+            }, deadline=deadline))
+            source = 'web_profile_info'
+        except InstagramBlockedError as e:
+            logger.info(f"Endpoint de perfil indisponível para @{username} ({e}); tentando o HTML")
+
+        if any(field not in parsed for field in REQUIRED_FIELDS):
+            # HTML público: meta description com as contagens (arredondadas) e blobs JSON, quando presentes
+            parsed = {**parse_profile_page(self._get(PROFILE_PAGE_URL.format(username=username),
+                                                     deadline=deadline), username), **parsed}
+            source = 'html'
+
+        missing = [field for field in REQUIRED_FIELDS if field not in parsed]
+        if missing:
+            raise InstagramBlockedError(f"Perfil @{username} sem {', '.join(missing)} na resposta")
+
+        data = profile_from_parsed(instagram_url, parsed)
+        data['username'] = data['username'] or username
+        data['source'] = f'http:{source}'
+        return data
+
+
+def _error_result(instagram_url, message, blocked=False, partial=False):
+    data = {
+        'url': instagram_url,
+        'error': message,
+        'blocked': blocked,
+        'followers': None,
+        'following': None,
+        'posts_count': None,
+        'last_post_date': None,
+        'bio_complete': False,
+        'profile_picture': False,
+        'is_business_account': False,
+        'username': None
+    }
+    if partial:
+        data['partial'] = True
+    return data
+
+
+def fetch_profile(instagram_url, webdriver_fallback=None, fetcher=None, deadline=None):
+    """Busca via HTTP e, se bloqueada, pelo WebDriver (quando houver fallback e o prazo comportar)"""
+    if not HTTP_FETCH_CONFIG['enabled']:
+        if webdriver_fallback is None:
+            return _error_result(instagram_url, 'Busca do Instagram via HTTP desativada', blocked=True)
+        return webdriver_fallback()
+
+    try:
+        return (fetcher or InstagramHttpFetcher()).fetch(instagram_url, deadline=deadline)
+    except InstagramProfileNotFound:
+        return _error_result(instagram_url, 'Perfil não encontrado')
+    except InstagramDeadlineExceeded:
+        return _error_result(instagram_url, 'Prazo da análise esgotado antes da busca do Instagram', partial=True)
+    except (InstagramBlockedError, requests.RequestException) as e:
+        logger.warning(f"Busca do Instagram via HTTP falhou: {e}")
+        if webdriver_fallback is None:
+            return _error_result(instagram_url, f'Instagram bloqueou a busca via HTTP: {e}', blocked=True)
+        if deadline is not None and not deadline.has(DEADLINE_CONFIG['min_webdriver_seconds']):
+            # Abrir o navegador estouraria o prazo: devolve o bloqueio marcado como parcial
+            logger.warning("Sem prazo para o WebDriver; Instagram fica sem dados nesta análise")
+            return _error_result(instagram_url, f'Instagram bloqueou a busca via HTTP: {e}',
+                                 blocked=True, partial=True)
+        return webdriver_fallback()
@@ -0,0 +1,200 @@
+import html
+import json
+import re
+from datetime import datetime, timezone
+
+# Meta description do perfil, em inglês ou português:
+# "1,234 Followers, 56 Following, 78 Posts - See Instagram photos and videos from Nome (@usuario)"
+# "1.234 seguidores, 56 seguindo, 78 publicações - Veja as fotos e vídeos do Instagram de Nome (@usuario)"
+META_DESCRIPTION_RE = re.compile(
+    r'<meta[^>]+(?:property|name)=["\'](?:og:description|description)["\'][^>]*content=["\']([^"\']+)["\']'
+    r'|<meta[^>]+content=["\']([^"\']+)["\'][^>]*(?:property|name)=["\'](?:og:description|description)["\']',
+    re.IGNORECASE
+)
+COUNT = r'([\d][\d.,]*\s*(?:k|m|mi|mil|mil\.|b)?)'
+META_COUNT_RES = {
+    'followers': re.compile(COUNT + r'\s+(?:followers|seguidores)', re.IGNORECASE),
+    'following': re.compile(COUNT + r'\s+(?:following|seguindo)', re.IGNORECASE),
+    'posts_count': re.compile(COUNT + r'\s+(?:posts|publicações|publicacoes)', re.IGNORECASE)
+}
+META_USERNAME_RE = re.compile(r'\(@([A-Za-z0-9._]{1,30})\)')
+
+# Objeto do dono do perfil nos blobs JSON embutidos: '"user":{...}' (os nós de perfis relacionados,
+# marcados ou sugeridos trazem os mesmos campos, então nada é lido fora desse objeto)
+USER_OBJECT_RE = re.compile(r'"user"\s*:\s*\{')
+JSON_DECODER = json.JSONDecoder()
+
+# Textos de interface que não são bio
+AVOID_BIO_TEXTS = [
+    'followers', 'following', 'posts', 'reels', 'tagged',
+    'follow', 'message', 'share', 'more', 'edit profile',
+    'view profile', 'story highlights', 'highlights',
+    'activity', 'archive', 'settings', 'switch accounts',
+    'log out', 'meta', 'about', 'help', 'press', 'api',
+    'jobs', 'privacy', 'terms', 'locations', 'language'
+]
+
+
+def parse_meta_count(text):
+    """Converte contagens da meta description ('1,234', '12.5K', '1,2 mi', '3 mil') em inteiro"""
+    if not text:
+        return None
+    text = text.strip().lower().rstrip('.')
+    match = re.match(r'([\d.,]+)\s*([a-z]*)', text)
+    if not match:
+        return None
+    number, suffix = match.groups()
+    multiplier = {'k': 1000, 'mil': 1000, 'm': 1000000, 'mi': 1000000, 'b': 1000000000}.get(suffix, 1)
+
+    try:
+        if multiplier == 1:
+            # Sem sufixo, ponto e vírgula são separadores de milhar
+            return int(re.sub(r'[.,]', '', number))
+        # Com sufixo, o separador é decimal ('12.5K', '1,2 mi')
+        return int(float(number.replace(',', '.')) * multiplier)
+    except ValueError:
+        return None
+
+
+def extract_username(instagram_url):
+    """Username do perfil a partir da URL, de '@usuario' ou do próprio username (minúsculo)"""
+    if not instagram_url:
+        return None
+    text = instagram_url.strip()
+    if 'instagram.com/' in text:
+        text = text.split('instagram.com/', 1)[1]
+    text = text.split('?')[0].split('#')[0].strip('/@').split('/')[0]
+    return text.lower() or None
+
+
+def _edge_count(user, edge, count_field):
+    value = (user.get(edge) or {}).get('count')
+    if value is None:
+        value = user.get(count_field)
+    return value if isinstance(value, int) else None
+
+
+def _user_fields(user):
+    """Campos do perfil a partir do objeto JSON do usuário (GraphQL antigo ou API atual)"""
+    data = {}
+    for field, edge, count_field in (('followers', 'edge_followed_by', 'follower_count'),
+                                     ('following', 'edge_follow', 'following_count'),
+                                     ('posts_count', 'edge_owner_to_timeline_media', 'media_count')):
+        count = _edge_count(user, edge, count_field)
+        if count is not None:
+            data[field] = count
+
+    if user.get('username'):
+        data['username'] = user['username']
+    if user.get('biography') is not None:
+        data['biography'] = user['biography']
+    picture = user.get('profile_pic_url_hd') or user.get('profile_pic_url')
+    if picture:
+        data['profile_pic_url'] = picture
+    for flag in ('is_business_account', 'is_business', 'is_professional_account'):
+        if isinstance(user.get(flag), bool):
+            data['is_business_account'] = user[flag]
+            break
+
+    # Post mais recente entre os do próprio perfil (posts fixados podem vir primeiro)
+    edges = (user.get('edge_owner_to_timeline_media') or {}).get('edges') or []
+    timestamps = [edge['node']['taken_at_timestamp'] for edge in edges
+                  if isinstance((edge.get('node') or {}).get('taken_at_timestamp'), int)]
+    if timestamps:
+        data['last_post_date'] = datetime.fromtimestamp(max(timestamps), tz=timezone.utc).strftime('%Y-%m-%d')
+
+    return data
+
+
+def _owner_user(page_source, username=None):
+    """Objeto '"user":{...}' do dono do perfil no HTML: o do username pedido ou, sem ele, o primeiro
+    com contagens de seguidores; None se a página não trouxer esse objeto"""
+    for match in USER_OBJECT_RE.finditer(page_source):
+        try:
+            user, _ = JSON_DECODER.raw_decode(page_source, match.end() - 1)
+        except ValueError:
+            continue
+        if not isinstance(user, dict) or not isinstance(user.get('username'), str):
+            continue
+        if username is not None:
+            if user['username'].lower() == username.lower():
+                return user
+        elif _edge_count(user, 'edge_followed_by', 'follower_count') is not None:
+            return user
+    return None
+
+
+def parse_profile_page(page_source, username=None):
+    """Extrai do HTML do perfil os campos do dono (username da URL, quando informado); campos não
+    encontrados ficam de fora. Sem o objeto do dono, só a meta description: contagens e username"""
+    data = {}
+    if not page_source:
+        return data
+
+    # 1) Objeto JSON do dono: contagens exatas, bio, foto, tipo de conta e últimos posts
+    user = _owner_user(page_source, username)
+    if user is not None:
+        data = _user_fields(user)
+
+    # 2) Meta description: contagens arredondadas e username, se for a do perfil pedido
+    meta = META_DESCRIPTION_RE.search(page_source)
+    if meta:
+        description = html.unescape(meta.group(1) or meta.group(2))
+        meta_username = META_USERNAME_RE.search(description)
+        if meta_username and username is not None and meta_username.group(1).lower() != username.lower():
+            return data
+        for field, pattern in META_COUNT_RES.items():
+            if field not in data:
+                match = pattern.search(description)
+                if match:
+                    count = parse_meta_count(match.group(1))
+                    if count is not None:
+                        data[field] = count
+        if meta_username and 'username' not in data:
+            data['username'] = meta_username.group(1)
+
+    return data
+
+
+def parse_profile_info(body):
+    """Campos do perfil a partir do JSON do endpoint web_profile_info (lidos de data.user, sem regex:
+    o payload traz nós de outros usuários, como perfis relacionados); {} se o JSON não tiver o usuário"""
+    try:
+        user = ((json.loads(body) or {}).get('data') or {}).get('user')
+    except (ValueError, AttributeError):
+        return {}
+    if not isinstance(user, dict):
+        return {}
+    return _user_fields(user)
+
+
+def is_valid_bio(bio_text):
+    """Valida se o texto parece ser uma bio válida do Instagram"""
+    # Bio muito curta ou muito longa provavelmente não é uma bio
+    if not bio_text or len(bio_text) < 5 or len(bio_text) > 500:
+        return False
+
+    # Evitar textos que claramente não são bio
+    bio_lower = bio_text.lower()
+    if any(avoid_text in bio_lower for avoid_text in AVOID_BIO_TEXTS):
+        return False
+
+    # Bio deve ter pelo menos 10 caracteres para ser considerada válida
+    return len(bio_text) >= 10
+
+
+def profile_from_parsed(instagram_url, parsed):
+    """Campos do resultado do scraper a partir de parse_profile_page; None nos campos ausentes"""
+    picture = parsed.get('profile_pic_url')
+    return {
+        'url': instagram_url,
+        'username': parsed.get('username'),
+        'followers': parsed.get('followers'),
+        'following': parsed.get('following'),
+        'posts_count': parsed.get('posts_count'),
+        'last_post_date': parsed.get('last_post_date'),
+        'bio_complete': is_valid_bio(parsed['biography']) if 'biography' in parsed else None,
+        'profile_picture': (not any(default in picture.lower() for default in ['default', 'anonymous', 'avatar'])
+                            if picture else None),
+        'is_business_account': parsed.get('is_business_account')
+    }
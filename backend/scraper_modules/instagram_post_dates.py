@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+
+# Shortcode do post (/p/<shortcode>/) é o id da mídia em base64 com alfabeto próprio
+SHORTCODE_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'
+SHORTCODE_VALUES = {char: index for index, char in enumerate(SHORTCODE_ALPHABET)}
+
+# Um id de 64 bits cabe em 11 caracteres; posts de perfis privados têm um sufixo extra
+SHORTCODE_ID_LENGTH = 11
+
+# Ids de mídia: 41 bits altos = milissegundos desde a época do Instagram (24/08/2011),
+# seguidos de 13 bits de shard e 10 bits de sequência
+INSTAGRAM_EPOCH_MS = 1314220021721
+MEDIA_ID_TIMESTAMP_SHIFT = 23
+
+
+def shortcode_to_media_id(shortcode):
+    """Converte o shortcode da URL do post no id numérico da mídia; None se inválido"""
+    if not shortcode:
+        return None
+    media_id = 0
+    for char in shortcode[:SHORTCODE_ID_LENGTH]:
+        value = SHORTCODE_VALUES.get(char)
+        if value is None:
+            return None
+        media_id = media_id * 64 + value
+    return media_id
+
+
+def media_id_to_datetime(media_id):
+    """Momento da publicação embutido no id da mídia (UTC)"""
+    timestamp_ms = (media_id >> MEDIA_ID_TIMESTAMP_SHIFT) + INSTAGRAM_EPOCH_MS
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc)
+
+
+def shortcode_date(shortcode):
+    """Data de publicação do post a partir do shortcode, sem nenhuma requisição"""
+    media_id = shortcode_to_media_id(shortcode)
+    if media_id is None:
+        return None
+    try:
+        return media_id_to_datetime(media_id)
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+def resolve_last_post_date(grid_posts):
+    """Data (YYYY-MM-DD) do post mais recente entre os itens da grade [{shortcode, pinned}]"""
+    # Posts fixados ficam no topo da grade independentemente da data: só contam se não houver outros
+    posts = [post for post in grid_posts or [] if not post.get('pinned')] or list(grid_posts or [])
+    dates = [date for date in (shortcode_date(post.get('shortcode')) for post in posts) if date]
+    if not dates:
+        return None
+    return max(dates).strftime('%Y-%m-%d')
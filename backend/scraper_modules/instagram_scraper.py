@@ -1,29 +1,397 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 import time
 import re
-from datetime import datetime
+from collections import deque
 import logging
 
 # Importar configuração do scraping
 from .instagram_config import SCRAPING_ENABLED, SELENIUM_CONFIG, MOCK_DATA
+from .webdriver_pool import webdriver_pool, lean_browsing_report, apply_lean_browsing
+from .instagram_page_parser import parse_profile_page, profile_from_parsed, is_valid_bio, extract_username
+from .selector_registry import selector_registry
+from .instagram_post_dates import resolve_last_post_date
+from .deadline import DEADLINE_CONFIG
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Contagens de posts/seguidores/seguindo no cabeçalho: perfil renderizado
+PROFILE_READY_SELECTOR = "header section ul li span, a[href*='/followers/'] span"
+
+# Mesma condição de prontidão, verificada em cada aba no modo multi-abas
+PROFILE_READY_SCRIPT = """
+return document.querySelector(arguments[0]) !== null || document.title.includes('Page Not Found');
+"""
+
+# Palavras que validam o texto de cada contagem (além de texto só com dígitos)
+FOLLOWERS_KEYWORDS = ('seguidor', 'follower')
+FOLLOWING_KEYWORDS = ('seguindo', 'following')
+POSTS_KEYWORDS = ('post', 'publicaç')
+
+# Máximo de elementos devolvidos por seletor na extração via script
+SCRIPT_MAX_CANDIDATES = 20
+
+# Listas de seletores em ordem de prioridade inicial; em execução, selector_registry
+# coloca primeiro os que mais acertaram recentemente (os de FALLBACK_SELECTORS sempre por último)
+
+# Seletores do número de seguidores (Instagram 2025)
+FOLLOWERS_SELECTORS = [
+    # Seletores específicos para followers - ordem de prioridade
+    "a[href*='/followers/'] span[title]",
+    "a[href*='/followers/'] span:not([title])",
+    "header section ul li:nth-child(2) button span[title]",
+    "header section ul li:nth-child(2) a span[title]",
+    "header section ul li:nth-child(2) span[title]",
+
+    # Seletores alternativos com texto específico
+    "span[title*='follower' i]",
+    "span[title*='seguidor' i]",
+    "button span[title*='follower' i]",
+    "button span[title*='seguidor' i]",
+
+    # Seletores por posição (estrutura padrão do Instagram)
+    "header section div div ul li:nth-child(2) button span",
+    "header section div div ul li:nth-child(2) a span",
+    "main header section ul li:nth-child(2) span",
+
+    # Seletores genéricos com validação posterior
+    "ul li button span[title]",
+    "ul li a span[title]",
+    "header span[title]",
+
+    # Fallbacks para estruturas diferentes
+    "div[role='tablist'] ~ div span[title]",
+    "[data-testid*='follower'] span",
+    "span:contains('followers')",
+    "span:contains('seguidores')"
+]
+
+# Seletores do número de seguindo
+FOLLOWING_SELECTORS = [
+    # Seletores específicos para following - ordem de prioridade
+    "a[href*='/following/'] span[title]",
+    "a[href*='/following/'] span:not([title])",
+    "header section ul li:nth-child(3) button span[title]",
+    "header section ul li:nth-child(3) a span[title]",
+    "header section ul li:nth-child(3) span[title]",
+
+    # Seletores alternativos com texto específico
+    "span[title*='following' i]",
+    "span[title*='seguindo' i]",
+    "button span[title*='following' i]",
+    "button span[title*='seguindo' i]",
+
+    # Seletores por posição (estrutura padrão do Instagram)
+    "header section div div ul li:nth-child(3) button span",
+    "header section div div ul li:nth-child(3) a span",
+    "main header section ul li:nth-child(3) span",
+
+    # Seletores genéricos com validação posterior
+    "ul li:nth-child(3) button span",
+    "ul li:nth-child(3) a span",
+
+    # Fallbacks para estruturas diferentes
+    "[data-testid*='following'] span",
+    "span:contains('following')",
+    "span:contains('seguindo')"
+]
+
+# Seletores do número de posts
+POSTS_SELECTORS = [
+    # Seletores específicos para posts - ordem de prioridade
+    "header section ul li:first-child button span[title]",
+    "header section ul li:first-child a span[title]",
+    "header section ul li:first-child span[title]",
+
+    # Seletores alternativos com texto específico
+    "span[title*='post' i]",
+    "span[title*='publicaç' i]",
+    "span[title*='publication' i]",
+    "button span[title*='post' i]",
+    "button span[title*='publicaç' i]",
+
+    # Seletores por posição (estrutura padrão do Instagram)
+    "header section div div ul li:first-child button span",
+    "header section div div ul li:first-child a span",
+    "main header section ul li:first-child span",
+
+    # Seletores genéricos com validação posterior
+    "ul li:first-child button span[title]",
+    "ul li:first-child a span[title]",
+    "ul li:first-child span[title]",
+
+    # Fallbacks para estruturas diferentes
+    "[data-testid*='post'] span",
+    "span:contains('posts')",
+    "span:contains('publicações')",
+
+    # Seletores alternativos para layouts diferentes
+    "div[role='button'] span[title*='post' i]",
+    "article span[title*='post' i]"
+]
+
+# Links dos posts na grade do perfil
+POST_LINK_SELECTORS = [
+    "article div div div div a",
+    "article a[href*='/p/']",
+    "div[role='tabpanel'] a[href*='/p/']",
+    "main article a",
+    "main a[href*='/p/'], main a[href*='/reel/']"
+]
+
+# Ícone que marca posts fixados no topo da grade
+PINNED_POST_SELECTOR = "svg[aria-label*='pinned' i], svg[aria-label*='fixad' i]"
+
+# Seletores da bio
+BIO_SELECTORS = [
+    # Seletores específicos para bio 2025
+    "header section div[dir='auto'] span",
+    "header section div span[dir='auto']",
+    "div[data-testid='user-description'] span",
+    "header div[role='main'] div span",
+    "section div div span[style*='word-wrap']",
+
+    # Seletores alternativos mais específicos
+    "header section div:nth-child(2) span",
+    "header div[style*='flex-direction'] span",
+    "article header section div span",
+
+    # Seletores gerais de fallback
+    "header section div span",
+    "header div span",
+    "h1 + div span",
+    "section span",
+    "div[style*='word-wrap'] span",
+
+    # Seletores por posição
+    "header section > div:nth-child(2) span",
+    "header > div > div > div:nth-child(2) span"
+]
+
+# Com a navegação enxuta as imagens não carregam e a largura renderizada da foto não é confiável:
+# a foto de perfil é avaliada só pelo src
+IMAGES_BLOCKED = SELENIUM_CONFIG['lean_browsing']['enabled'] and SELENIUM_CONFIG['lean_browsing']['block_images']
+
+# Seletores da foto de perfil
+PROFILE_PICTURE_SELECTORS = [
+    # Seletores específicos para foto de perfil 2025
+    "header img[data-testid='user-avatar']",
+    "header button img[alt*='foto']",
+    "header div[role='button'] img",
+    "header span img[crossorigin='anonymous']",
+    "article header img[style*='border-radius']",
+
+    # Seletores alternativos mais específicos
+    "header img[alt*='foto de perfil']",
+    "header img[alt*='profile picture']",
+    "header img[alt*='foto']",
+    "header img[alt*='profile']",
+    "header img[alt*='picture']",
+
+    # Seletores por estrutura
+    "header > div img:first-child",
+    "header section img:first-child",
+    "header div:first-child img",
+
+    # Seletores gerais de fallback
+    "header img",
+    "canvas + img",
+    "div[role='button'] img"
+]
+
+# Indicadores textuais de conta comercial no HTML da página
+BUSINESS_INDICATORS = [
+    'conta comercial',
+    'business account',
+    'entrar em contato',
+    'contact',
+    'categoria',
+    'category',
+    'website',
+    'site',
+    'email',
+    'telefone',
+    'phone',
+    'endereço',
+    'address'
+]
+
+# Elementos típicos de conta comercial
+BUSINESS_ELEMENT_SELECTORS = [
+    "button[aria-label*='Contact']",
+    "button[aria-label*='Contato']",
+    "a[href*='mailto:']",
+    "a[href*='tel:']",
+    "span[title*='Category']",
+    "span[title*='Categoria']"
+]
+
+# Seletores do nome de usuário (Instagram 2025)
+USERNAME_SELECTORS = [
+    # Seletores específicos para nome de usuário
+    "header section div h2",
+    "header section div h1",
+    "main header section div h2",
+    "main header section div h1",
+
+    # Seletores alternativos
+    "header h1:not([title])",
+    "header h2:not([title])",
+    "[data-testid='user-name']",
+    "[data-testid='username']",
+
+    # Seletores genéricos com validação
+    "header section span:first-child",
+    "header div span:first-of-type",
+    "h1[dir='auto']",
+    "h2[dir='auto']",
+
+    # Fallbacks
+    "header span[title]:not([title*='follower']):not([title*='seguidor']):not([title*='post']):not([title*='following']):not([title*='seguindo'])",
+    "header section div:first-child span"
+]
+
+# Seletores genéricos e fallbacks: podem casar com elementos de outro campo (ex.: a contagem de
+# seguindo no lugar da de seguidores), então só são reordenados entre si, depois dos específicos
+FALLBACK_SELECTORS = frozenset([
+    "ul li button span[title]",
+    "ul li a span[title]",
+    "header span[title]",
+    "div[role='tablist'] ~ div span[title]",
+    "[data-testid*='follower'] span",
+    "span:contains('followers')",
+    "span:contains('seguidores')",
+    "ul li:nth-child(3) button span",
+    "ul li:nth-child(3) a span",
+    "[data-testid*='following'] span",
+    "span:contains('following')",
+    "span:contains('seguindo')",
+    "ul li:first-child button span[title]",
+    "ul li:first-child a span[title]",
+    "ul li:first-child span[title]",
+    "[data-testid*='post'] span",
+    "span:contains('posts')",
+    "span:contains('publicações')",
+    "div[role='button'] span[title*='post' i]",
+    "article span[title*='post' i]",
+    "header section div span",
+    "header div span",
+    "h1 + div span",
+    "section span",
+    "div[style*='word-wrap'] span",
+    "header section > div:nth-child(2) span",
+    "header > div > div > div:nth-child(2) span",
+    "header img",
+    "canvas + img",
+    "div[role='button'] img",
+    "header section span:first-child",
+    "header div span:first-of-type",
+    "h1[dir='auto']",
+    "h2[dir='auto']",
+    "header span[title]:not([title*='follower']):not([title*='seguidor']):not([title*='post']):not([title*='following']):not([title*='seguindo'])",
+    "header section div:first-child span"
+])
+
+# Primeiros posts da grade (shortcode e se está fixado), pelo primeiro seletor que encontrar links
+GRID_POSTS_FUNCTION = """
+function gridPosts(selectors, pinnedSelector, limit) {
+    for (const selector of selectors) {
+        let links;
+        try {
+            links = document.querySelectorAll(selector);
+        } catch (e) {
+            continue;
+        }
+        const posts = [];
+        const seen = new Set();
+        for (const link of links) {
+            const match = (link.getAttribute('href') || '').match(/\\/(?:p|reel|tv)\\/([A-Za-z0-9_-]+)/);
+            if (!match || seen.has(match[1])) {
+                continue;
+            }
+            seen.add(match[1]);
+            posts.push({shortcode: match[1], pinned: link.querySelector(pinnedSelector) !== null});
+            if (posts.length >= limit) {
+                break;
+            }
+        }
+        if (posts.length) {
+            return {selector: selector, posts: posts};
+        }
+    }
+    return {selector: null, posts: []};
+}
+"""
+
+GRID_POSTS_SCRIPT = GRID_POSTS_FUNCTION + "return gridPosts(arguments[0], arguments[1], arguments[2]);"
+
+# Extração em uma única chamada: o navegador aplica todas as listas de seletores
+# e devolve os candidatos (e o tempo) de cada seletor; a validação continua no Python
+PROFILE_EXTRACTION_SCRIPT = GRID_POSTS_FUNCTION + """
+const spec = arguments[0];
+function collect(selectors) {
+    const groups = [];
+    for (const selector of selectors) {
+        const started = performance.now();
+        const candidates = [];
+        let nodes;
+        try {
+            nodes = document.querySelectorAll(selector);
+        } catch (e) {
+            nodes = [];  // Seletor não suportado pelo navegador (ex.: :contains)
+        }
+        for (let i = 0; i < nodes.length && i < spec.max_candidates; i++) {
+            const el = nodes[i];
+            candidates.push({
+                title: el.getAttribute('title'),
+                text: el.innerText || '',
+                src: el.getAttribute('src'),
+                width: el.getBoundingClientRect().width
+            });
+        }
+        groups.push({selector: selector, ms: performance.now() - started, candidates: candidates});
+    }
+    return groups;
+}
+function exists(selector) {
+    try {
+        return document.querySelector(selector) !== null;
+    } catch (e) {
+        return false;
+    }
+}
+const fields = {};
+for (const name in spec.fields) {
+    fields[name] = collect(spec.fields[name]);
+}
+const html = document.documentElement.outerHTML.toLowerCase();
+return {
+    fields: fields,
+    business_indicators: spec.business_indicators.filter(indicator => html.includes(indicator)).length,
+    business_elements: spec.business_elements.filter(exists).length,
+    url: location.href,
+    grid: gridPosts(spec.post_links, spec.pinned_selector, spec.grid_posts)
+};
+"""
+
 class InstagramScraper:
-    def __init__(self):
+    def __init__(self, pool=None):
         self.driver = None
         self.wait = None
+        self.pool = pool or webdriver_pool
+        self._session = None
+        # Tempo efetivamente esperado em cada condição (ms), exposto no resultado
+        self.wait_times = {}
+        # Prazo da análise em andamento: limita as esperas e a consulta ao DOM
+        self.deadline = None
         self.setup_driver()
     
     def setup_driver(self):
-        """Configura o driver do Selenium baseado na configuração"""
+        """Obtém uma sessão do Selenium do pool compartilhado"""
         
         # Verificar se o scraping está habilitado
         if not SCRAPING_ENABLED:
@@ -33,55 +401,169 @@ class InstagramScraper:
             return
         
         try:
-            # Configurar opções do Chrome
-            chrome_options = Options()
-            chrome_options.add_argument('--headless' if SELENIUM_CONFIG['headless'] else '--no-headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_argument(f'--user-agent={SELENIUM_CONFIG["user_agent"]}')
-            
-            # Conectar ao container Selenium
-            self.driver = webdriver.Remote(
-                command_executor=SELENIUM_CONFIG['command_executor'],
-                options=chrome_options
-            )
+            # Sessão reaproveitada (ou criada, se o pool ainda não tiver uma livre)
+            self._session = self.pool.checkout()
+            self.driver = self._session.driver
             
             # Configurar WebDriverWait
             self.wait = WebDriverWait(self.driver, SELENIUM_CONFIG['timeout'])
             
-            # Executar script para remover detecção de webdriver
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            logger.info("Driver do Selenium configurado com sucesso")
+            logger.info(f"Driver do Selenium obtido do pool (uso {self._session.uses + 1})")
             
         except Exception as e:
             logger.error(f"Erro ao configurar Selenium: {e}")
             self.driver = None
             self.wait = None
     
-    def scrape(self, instagram_url):
-        """Extrai informações do perfil do Instagram"""
+    def _wait_for(self, name, condition):
+        """Espera a condição até o prazo configurado e registra quanto tempo esperou"""
+        timeout = SELENIUM_CONFIG['wait_timeouts'][name]
+        if self.deadline is not None:
+            timeout = self.deadline.cap(timeout)
+        started = time.monotonic()
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=SELENIUM_CONFIG['poll_frequency']).until(condition)
+        except TimeoutException:
+            logger.warning(f"Timeout ({timeout:g}s) aguardando '{name}'")
+            return None
+        finally:
+            self.wait_times[name] = round((time.monotonic() - started) * 1000)
+    
+    def _start_round_trip_count(self):
+        """Conta cada comando enviado ao grid (driver.execute) até _stop_round_trip_count"""
+        counter = {'count': 0}
+        original = self.driver.execute
+        
+        def execute(driver_command, params=None):
+            counter['count'] += 1
+            return original(driver_command, params)
+        
+        self._round_trip_counter = (counter, original, 'execute' in vars(self.driver))
+        self.driver.execute = execute
+        return counter
+    
+    def _stop_round_trip_count(self):
+        """Remove o contador e retorna o total de round trips (None se não estava ativo)"""
+        state = getattr(self, '_round_trip_counter', None)
+        if state is None or not self.driver:
+            return None
+        counter, original, had_own = state
+        self._round_trip_counter = None
+        if had_own:
+            self.driver.execute = original
+        else:
+            del self.driver.execute
+        return counter['count']
+    
+    def _first_match(self, field, selectors, extract):
+        """Testa os seletores (mais bem-sucedidos primeiro) até extract devolver um valor; registra cada tentativa"""
+        for selector in selector_registry.ordered(field, selectors, FALLBACK_SELECTORS):
+            started = time.monotonic()
+            value = None
+            try:
+                for element in self.driver.find_elements(By.CSS_SELECTOR, selector):
+                    value = extract(element)
+                    if value is not None:
+                        break
+            except Exception as e:
+                logger.debug(f"Erro com seletor {selector}: {e}")
+            selector_registry.record(field, selector, value is not None, (time.monotonic() - started) * 1000)
+            if value is not None:
+                return value
+        return None
+    
+    def _record_grid_selector(self, post_links, grid_selector):
+        # Links de posts: os anteriores ao encontrado falharam, os seguintes não foram testados
+        for selector in post_links:
+            selector_registry.record('post_link', selector, selector == grid_selector)
+            if selector == grid_selector:
+                break
+    
+    def _profile_from_page_source(self, instagram_url, page_source):
+        """Campos do perfil a partir do HTML; None nos campos que o HTML não traz"""
+        return profile_from_parsed(instagram_url, parse_profile_page(page_source, extract_username(instagram_url)))
+    
+    def _extract_profile_with_script(self, instagram_url):
+        """Extrai todos os campos do perfil com um único execute_script; None em caso de falha"""
+        field_selectors = {
+            'username': USERNAME_SELECTORS,
+            'followers': FOLLOWERS_SELECTORS,
+            'following': FOLLOWING_SELECTORS,
+            'posts_count': POSTS_SELECTORS,
+            'bio': BIO_SELECTORS,
+            'profile_picture': PROFILE_PICTURE_SELECTORS
+        }
+        post_links = selector_registry.ordered('post_link', POST_LINK_SELECTORS)
+        try:
+            raw = self.driver.execute_script(PROFILE_EXTRACTION_SCRIPT, {
+                'fields': {name: selector_registry.ordered(name, selectors, FALLBACK_SELECTORS)
+                           for name, selectors in field_selectors.items()},
+                'post_links': post_links,
+                'pinned_selector': PINNED_POST_SELECTOR,
+                'grid_posts': SELENIUM_CONFIG['grid_posts'],
+                'business_indicators': BUSINESS_INDICATORS,
+                'business_elements': BUSINESS_ELEMENT_SELECTORS,
+                'max_candidates': SCRIPT_MAX_CANDIDATES
+            })
+        except Exception as e:
+            logger.warning(f"Extração via script falhou, usando seletores individuais: {e}")
+            return None
+        
+        fields = raw.get('fields') or {}
+        
+        def first_valid(name, extract):
+            # Todos os seletores foram consultados: o valor é o do primeiro que acertou, e só conta
+            # acerto para quem concorda com ele (um seletor genérico pode trazer a contagem de outro campo)
+            groups = fields.get(name, [])
+            values = [next((v for v in map(extract, group.get('candidates', [])) if v is not None), None)
+                      for group in groups]
+            found = next((value for value in values if value is not None), None)
+            for group, value in zip(groups, values):
+                selector_registry.record(name, group['selector'], value is not None and value == found,
+                                         group.get('ms'))
+            return found
+        
+        def first_count(name, keywords):
+            return first_valid(name, lambda c: self._match_count(c.get('title') or c.get('text') or '', keywords))
+        
+        grid = raw.get('grid') or {}
+        self._record_grid_selector(post_links, grid.get('selector'))
+        
+        username = first_valid('username', lambda c: c['text'].strip()
+                               if c.get('text') and self._is_valid_username(c['text'].strip()) else None)
+        if not username:
+            # Fallback: username da URL atual
+            current_url = raw.get('url') or ''
+            if 'instagram.com/' in current_url:
+                username = current_url.split('instagram.com/')[-1].split('/')[0] or None
+                if username == 'www':
+                    username = None
+        
+        profile_picture = first_valid('profile_picture', lambda c: True if self._is_custom_picture(
+            c.get('src'), c.get('width')) else None) or False
+        
+        return {
+            'url': instagram_url,
+            'username': username,
+            'followers': first_count('followers', FOLLOWERS_KEYWORDS),
+            'following': first_count('following', FOLLOWING_KEYWORDS),
+            'posts_count': first_count('posts_count', POSTS_KEYWORDS),
+            'last_post_date': resolve_last_post_date(grid.get('posts')),
+            'bio_complete': first_valid('bio', lambda c: True if self._is_valid_bio((c.get('text') or '').strip())
+                                        else None) or False,
+            'profile_picture': profile_picture,
+            'is_business_account': (raw.get('business_indicators', 0) + raw.get('business_elements', 0)) >= 2
+        }
+    
+    def scrape(self, instagram_url, deadline=None):
+        """Extrai informações do perfil do Instagram (com deadline, devolve os campos obtidos até o prazo)"""
         
         # Verificar se o scraping está habilitado
         if not SCRAPING_ENABLED:
             logger.info("🚫 Scraping do Instagram desativado por configuração")
             
             # Extrair username da URL para dados mock
-            username = "usuario_exemplo"
-            try:
-                if 'instagram.com/' in instagram_url:
-                    username = instagram_url.split('instagram.com/')[-1].strip('/')
-                    if '/' in username:
-                        username = username.split('/')[0]
-                elif not instagram_url.startswith('http'):
-                    username = instagram_url.strip("/@")
-            except:
-                pass
+            username = extract_username(instagram_url) or "usuario_exemplo"
             
             # Retornar dados mock
             mock_response = MOCK_DATA.copy()
@@ -93,92 +575,222 @@ class InstagramScraper:
         
         # Scraping normal quando habilitado
         if not self.driver:
-            return {
-                'url': instagram_url,
-                'error': 'Driver do Selenium não disponível',
-                'followers': None,
-                'following': None,
-                'posts_count': None,
-                'last_post_date': None,
-                'bio_complete': False,
-                'profile_picture': False,
-                'is_business_account': False,
-                'username': None
-            }
+            return self._error_result(instagram_url, 'Driver do Selenium não disponível')
         
+        if deadline is not None and not deadline.has(DEADLINE_CONFIG['min_webdriver_seconds']):
+            return {**self._error_result(instagram_url, 'Prazo da análise esgotado antes do WebDriver'),
+                    'partial': True}
+        
+        self.deadline = deadline
         try:
-            # Garantir que a URL esteja no formato correto
-            if not instagram_url.startswith('http'):
-                if 'instagram.com' not in instagram_url:
-                    username = instagram_url.strip("/@")
-                    instagram_url = f'https://instagram.com/{username}/'
-                else:
-                    instagram_url = f'https://{instagram_url}'
+            instagram_url = self._normalize_url(instagram_url)
             
             logger.info(f"Acessando URL: {instagram_url}")
+            round_trips = self._start_round_trip_count()
             self.driver.get(instagram_url)
             
-            # Aguardar carregamento da página principal
-            try:
-                self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "main")))
-                time.sleep(3)  # Aguardar carregamento completo
-            except TimeoutException:
-                logger.warning("Timeout ao aguardar carregamento da página")
-            
-            # Verificar se a página carregou corretamente
-            if "Page Not Found" in self.driver.title or "Página não encontrada" in self.driver.page_source:
-                return {
-                    'url': instagram_url,
-                    'error': 'Perfil não encontrado',
-                    'followers': None,
-                    'following': None,
-                    'posts_count': None,
-                    'last_post_date': None,
-                    'bio_complete': False,
-                    'profile_picture': False,
-                    'is_business_account': False,
-                    'username': None
-                }
-            
-            data = {
-                'url': instagram_url,
-                'username': self._get_username(),
-                'followers': self._get_followers_count(),
-                'following': self._get_following_count(),
-                'posts_count': self._get_posts_count(),
-                'last_post_date': self._get_last_post_date(),
-                'bio_complete': self._check_bio_completeness(),
-                'profile_picture': self._has_profile_picture(),
-                'is_business_account': self._is_business_account()
-            }
+            # Aguardar as contagens do cabeçalho do perfil (ou a página de perfil inexistente)
+            self.wait_times = {}
+            self._wait_for('perfil', EC.any_of(
+                EC.presence_of_element_located((By.CSS_SELECTOR, PROFILE_READY_SELECTOR)),
+                EC.title_contains('Page Not Found')
+            ))
             
-            logger.info(f"Dados extraídos com sucesso para {data.get('username', 'usuário desconhecido')}")
+            data = self._harvest_profile(instagram_url)
+            if 'error' not in data:
+                data['webdriver_round_trips'] = round_trips['count']
             return data
             
         except Exception as e:
             logger.error(f"Erro ao extrair dados: {str(e)}")
-            return {
-                'url': instagram_url,
-                'error': f'Erro ao extrair dados: {str(e)}',
-                'followers': None,
-                'following': None,
-                'posts_count': None,
-                'last_post_date': None,
-                'bio_complete': False,
-                'profile_picture': False,
-                'is_business_account': False,
-                'username': None
-            }
+            # Sessão travada ou encerrada pelo grid: será recriada ao voltar ao pool
+            if isinstance(e, WebDriverException) and self._session:
+                self._session.broken = True
+            return self._error_result(instagram_url, f'Erro ao extrair dados: {str(e)}')
+        finally:
+            self.deadline = None
+            count = self._stop_round_trip_count()
+            if count is not None:
+                logger.info(f"🔁 {count} round trips ao Selenium Grid para {instagram_url}")
+    
+    def scrape_many(self, instagram_urls, max_tabs=None, deadline=None):
+        """Extrai vários perfis em abas da mesma sessão; as abas carregam em paralelo e são lidas
+        na ordem em que foram abertas (com deadline, perfis não lidos até o prazo voltam como parciais)"""
+        if not SCRAPING_ENABLED or not self.driver:
+            return [self.scrape(instagram_url, deadline=deadline) for instagram_url in instagram_urls]
+        
+        max_tabs = max(1, max_tabs or SELENIUM_CONFIG['max_tabs'])
+        timeout = SELENIUM_CONFIG['wait_timeouts']['perfil']
+        pending = deque(enumerate(self._normalize_url(url) for url in instagram_urls))
+        results = [None] * len(instagram_urls)
+        open_tabs = {}
+        original_handle = self.driver.current_window_handle
+        round_trips = self._start_round_trip_count()
+        self.deadline = deadline
+        
+        try:
+            while pending or open_tabs:
+                if deadline is not None and deadline.expired():
+                    logger.warning(f"Prazo esgotado com {len(pending) + len(open_tabs)} perfis sem leitura")
+                    for index, instagram_url in [(i, url) for i, url, _ in open_tabs.values()] + list(pending):
+                        results[index] = {**self._error_result(instagram_url, 'Prazo da análise esgotado antes da leitura do perfil'),
+                                          'partial': True}
+                    break
+                # Abre abas até o limite; a navegação de todas segue em paralelo no navegador
+                if pending and len(open_tabs) < max_tabs:
+                    # Nova aba precisa de uma janela atual válida (a última lida já foi fechada)
+                    self.driver.switch_to.window(original_handle)
+                while pending and len(open_tabs) < max_tabs:
+                    index, instagram_url = pending.popleft()
+                    self.driver.switch_to.new_window('tab')
+                    open_tabs[self.driver.current_window_handle] = (index, instagram_url, time.monotonic())
+                    if SELENIUM_CONFIG['lean_browsing']['enabled']:
+                        # Bloqueio via CDP vale por aba
+                        apply_lean_browsing(self.driver)
+                    # Atribuir location não espera o carregamento (driver.get esperaria)
+                    self.driver.execute_script('window.location.href = arguments[0];', instagram_url)
+                    logger.info(f"Acessando URL em nova aba: {instagram_url}")
+                
+                # Espera só pela aba mais antiga: verificar todas a cada intervalo custaria dois
+                # round trips (switch_to.window + execute_script) por aba; as outras seguem carregando
+                handle, (index, instagram_url, started) = next(iter(open_tabs.items()))
+                self.driver.switch_to.window(handle)
+                remaining = timeout - (time.monotonic() - started)
+                if deadline is not None:
+                    remaining = deadline.cap(remaining)
+                try:
+                    WebDriverWait(self.driver, max(0, remaining), poll_frequency=SELENIUM_CONFIG['poll_frequency']).until(
+                        lambda driver: driver.execute_script(PROFILE_READY_SCRIPT, PROFILE_READY_SELECTOR)
+                    )
+                except TimeoutException:
+                    logger.warning(f"Timeout ({timeout:g}s) aguardando 'perfil' em {instagram_url}")
+                
+                self.wait_times = {'perfil': round((time.monotonic() - started) * 1000)}
+                try:
+                    results[index] = self._harvest_profile(instagram_url)
+                except Exception as e:
+                    logger.error(f"Erro ao extrair dados de {instagram_url}: {e}")
+                    results[index] = self._error_result(instagram_url, f'Erro ao extrair dados: {str(e)}')
+                self.driver.close()
+                del open_tabs[handle]
+        
+        except WebDriverException as e:
+            logger.error(f"Erro na sessão durante o modo multi-abas: {e}")
+            if self._session:
+                self._session.broken = True
+            for index, instagram_url in [(i, url) for i, url, _ in open_tabs.values()] + list(pending):
+                results[index] = self._error_result(instagram_url, f'Erro ao extrair dados: {str(e)}')
+        
+        finally:
+            self.deadline = None
+            try:
+                self.driver.switch_to.window(original_handle)
+            except WebDriverException:
+                pass
+            count = self._stop_round_trip_count()
+            if count is not None:
+                logger.info(f"🔁 {count} round trips ao Selenium Grid para {len(instagram_urls)} perfis")
+        
+        return results
+    
+    def _normalize_url(self, instagram_url):
+        """Garantir que a URL esteja no formato correto"""
+        if not instagram_url.startswith('http'):
+            if 'instagram.com' not in instagram_url:
+                return f'https://instagram.com/{extract_username(instagram_url)}/'
+            return f'https://{instagram_url}'
+        return instagram_url
+    
+    def _error_result(self, instagram_url, message):
+        return {
+            'url': instagram_url,
+            'error': message,
+            'followers': None,
+            'following': None,
+            'posts_count': None,
+            'last_post_date': None,
+            'bio_complete': False,
+            'profile_picture': False,
+            'is_business_account': False,
+            'username': None
+        }
+    
+    def _harvest_profile(self, instagram_url):
+        """Lê o perfil já carregado na aba atual: HTML primeiro, DOM para os campos que faltarem"""
+        # Verificar se a página carregou corretamente
+        page_source = self.driver.page_source
+        if "Page Not Found" in self.driver.title or "Página não encontrada" in page_source:
+            return self._error_result(instagram_url, 'Perfil não encontrado')
+        
+        # Caminho rápido: campos do JSON embutido e da meta description, sem consultar o DOM
+        data = self._profile_from_page_source(instagram_url, page_source)
+        missing = [field for field, value in data.items() if value is None]
+        field_sources = {field: 'html' for field in data if field != 'url' and field not in missing}
+        
+        if missing and self.deadline is not None and self.deadline.expired():
+            # Sem prazo para consultar o DOM: devolve o que o HTML trouxe, marcado como parcial
+            logger.warning(f"Prazo esgotado; campos sem valor: {', '.join(missing)}")
+            data['partial'] = True
+            data['missing_fields'] = missing
+            missing = []
+        
+        if missing:
+            logger.info(f"Campos não encontrados no HTML, consultando o DOM: {', '.join(missing)}")
+            
+            # Extração em uma chamada; se falhar, volta aos seletores individuais
+            dom_data = None
+            if SELENIUM_CONFIG['extraction_mode'] == 'script':
+                dom_data = self._extract_profile_with_script(instagram_url)
+            
+            if dom_data is None:
+                getters = {
+                    'username': self._get_username,
+                    'followers': self._get_followers_count,
+                    'following': self._get_following_count,
+                    'posts_count': self._get_posts_count,
+                    'last_post_date': self._get_last_post_date,
+                    'bio_complete': self._check_bio_completeness,
+                    'profile_picture': self._has_profile_picture,
+                    'is_business_account': self._is_business_account
+                }
+                dom_data = {}
+                for field in missing:
+                    # Seletores individuais são o caminho lento: param no prazo
+                    if self.deadline is not None and self.deadline.expired():
+                        break
+                    dom_data[field] = getters[field]()
+            
+            skipped = [field for field in missing if field not in dom_data]
+            for field in missing:
+                if field not in skipped:
+                    data[field] = dom_data.get(field)
+                    field_sources[field] = 'dom'
+            
+            if skipped:
+                logger.warning(f"Prazo esgotado; campos sem valor: {', '.join(skipped)}")
+                data['partial'] = True
+                data['missing_fields'] = skipped
+        
+        data['field_sources'] = field_sources
+        data['wait_times_ms'] = dict(self.wait_times)
+        try:
+            data['lean_browsing'] = lean_browsing_report(self.driver)
+        except WebDriverException as e:
+            logger.debug(f"Relatório da navegação enxuta indisponível: {e}")
+            data['lean_browsing'] = None
+        logger.info(f"Dados extraídos com sucesso para {data.get('username', 'usuário desconhecido')}")
+        return data
     
     def close_driver(self):
-        """Fecha o driver do Selenium"""
-        if self.driver:
+        """Devolve o driver do Selenium ao pool"""
+        if self._session:
             try:
-                self.driver.quit()
-                logger.info("Driver fechado com sucesso")
+                self.pool.checkin(self._session)
+                logger.info("Driver devolvido ao pool")
             except Exception as e:
-                logger.error(f"Erro ao fechar driver: {e}")
+                logger.error(f"Erro ao devolver driver: {e}")
             finally:
+                self._session = None
                 self.driver = None
                 self.wait = None
     
@@ -186,30 +798,7 @@ class InstagramScraper:
         """
         Valida se o texto parece ser uma bio válida do Instagram
         """
-        if not bio_text or len(bio_text) < 5:
-            return False
-            
-        # Bio muito longa provavelmente não é uma bio
-        if len(bio_text) > 500:
-            return False
-            
-        # Evitar textos que claramente não são bio
-        avoid_bio_texts = [
-            'followers', 'following', 'posts', 'reels', 'tagged',
-            'follow', 'message', 'share', 'more', 'edit profile',
-            'view profile', 'story highlights', 'highlights',
-            'activity', 'archive', 'settings', 'switch accounts',
-            'log out', 'meta', 'about', 'help', 'press', 'api',
-            'jobs', 'privacy', 'terms', 'locations', 'language'
-        ]
-        
-        bio_lower = bio_text.lower()
-        for avoid_text in avoid_bio_texts:
-            if avoid_text in bio_lower:
-                return False
-                
-        # Bio deve ter pelo menos 10 caracteres para ser considerada válida
-        return len(bio_text) >= 10
+        return is_valid_bio(bio_text)
 
     def _is_valid_username(self, username):
         """
@@ -256,51 +845,11 @@ class InstagramScraper:
             return None
             
         try:
-            # Seletores robustos atualizados para Instagram 2025
-            selectors = [
-                # Seletores específicos para followers - ordem de prioridade
-                "a[href*='/followers/'] span[title]",
-                "a[href*='/followers/'] span:not([title])",
-                "header section ul li:nth-child(2) button span[title]",
-                "header section ul li:nth-child(2) a span[title]",
-                "header section ul li:nth-child(2) span[title]",
-                
-                # Seletores alternativos com texto específico
-                "span[title*='follower' i]",
-                "span[title*='seguidor' i]",
-                "button span[title*='follower' i]",
-                "button span[title*='seguidor' i]",
-                
-                # Seletores por posição (estrutura padrão do Instagram)
-                "header section div div ul li:nth-child(2) button span",
-                "header section div div ul li:nth-child(2) a span",
-                "main header section ul li:nth-child(2) span",
-                
-                # Seletores genéricos com validação posterior
-                "ul li button span[title]",
-                "ul li a span[title]",
-                "header span[title]",
-                
-                # Fallbacks para estruturas diferentes
-                "div[role='tablist'] ~ div span[title]",
-                "[data-testid*='follower'] span",
-                "span:contains('followers')",
-                "span:contains('seguidores')"
-            ]
-            
-            for selector in selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        text = element.get_attribute('title') or element.text or ''
-                        if text and ('seguidor' in text.lower() or 'follower' in text.lower() or text.replace(',', '').replace('.', '').isdigit()):
-                            followers = self._parse_count(text)
-                            if followers is not None:
-                                logger.debug(f"Seguidores encontrados: {followers}")
-                                return followers
-                except Exception as e:
-                    logger.debug(f"Erro com seletor {selector}: {e}")
-                    continue
+            followers = self._first_match('followers', FOLLOWERS_SELECTORS, lambda element: self._match_count(
+                element.get_attribute('title') or element.text or '', FOLLOWERS_KEYWORDS))
+            if followers is not None:
+                logger.debug(f"Seguidores encontrados: {followers}")
+                return followers
             
             logger.warning("Não foi possível extrair o número de seguidores")
             return None
@@ -314,49 +863,11 @@ class InstagramScraper:
             return None
             
         try:
-            # Seletores robustos atualizados para Instagram 2025
-            selectors = [
-                # Seletores específicos para following - ordem de prioridade
-                "a[href*='/following/'] span[title]",
-                "a[href*='/following/'] span:not([title])",
-                "header section ul li:nth-child(3) button span[title]",
-                "header section ul li:nth-child(3) a span[title]",
-                "header section ul li:nth-child(3) span[title]",
-                
-                # Seletores alternativos com texto específico
-                "span[title*='following' i]",
-                "span[title*='seguindo' i]",
-                "button span[title*='following' i]",
-                "button span[title*='seguindo' i]",
-                
-                # Seletores por posição (estrutura padrão do Instagram)
-                "header section div div ul li:nth-child(3) button span",
-                "header section div div ul li:nth-child(3) a span",
-                "main header section ul li:nth-child(3) span",
-                
-                # Seletores genéricos com validação posterior
-                "ul li:nth-child(3) button span",
-                "ul li:nth-child(3) a span",
-                
-                # Fallbacks para estruturas diferentes
-                "[data-testid*='following'] span",
-                "span:contains('following')",
-                "span:contains('seguindo')"
-            ]
-            
-            for selector in selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        text = element.get_attribute('title') or element.text or ''
-                        if text and ('seguindo' in text.lower() or 'following' in text.lower() or text.replace(',', '').replace('.', '').isdigit()):
-                            following = self._parse_count(text)
-                            if following is not None:
-                                logger.debug(f"Seguindo encontrados: {following}")
-                                return following
-                except Exception as e:
-                    logger.debug(f"Erro com seletor {selector}: {e}")
-                    continue
+            following = self._first_match('following', FOLLOWING_SELECTORS, lambda element: self._match_count(
+                element.get_attribute('title') or element.text or '', FOLLOWING_KEYWORDS))
+            if following is not None:
+                logger.debug(f"Seguindo encontrados: {following}")
+                return following
             
             logger.warning("Não foi possível extrair o número de seguindo")
             return None
@@ -370,53 +881,11 @@ class InstagramScraper:
             return None
             
         try:
-            # Seletores robustos atualizados para Instagram 2025
-            selectors = [
-                # Seletores específicos para posts - ordem de prioridade
-                "header section ul li:first-child button span[title]",
-                "header section ul li:first-child a span[title]",
-                "header section ul li:first-child span[title]",
-                
-                # Seletores alternativos com texto específico
-                "span[title*='post' i]",
-                "span[title*='publicaç' i]",
-                "span[title*='publication' i]",
-                "button span[title*='post' i]",
-                "button span[title*='publicaç' i]",
-                
-                # Seletores por posição (estrutura padrão do Instagram)
-                "header section div div ul li:first-child button span",
-                "header section div div ul li:first-child a span",
-                "main header section ul li:first-child span",
-                
-                # Seletores genéricos com validação posterior
-                "ul li:first-child button span[title]",
-                "ul li:first-child a span[title]",
-                "ul li:first-child span[title]",
-                
-                # Fallbacks para estruturas diferentes
-                "[data-testid*='post'] span",
-                "span:contains('posts')",
-                "span:contains('publicações')",
-                
-                # Seletores alternativos para layouts diferentes
-                "div[role='button'] span[title*='post' i]",
-                "article span[title*='post' i]"
-            ]
-            
-            for selector in selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        text = element.get_attribute('title') or element.text or ''
-                        if text and ('post' in text.lower() or 'publicaç' in text.lower() or text.replace(',', '').replace('.', '').isdigit()):
-                            posts = self._parse_count(text)
-                            if posts is not None:
-                                logger.debug(f"Posts encontrados: {posts}")
-                                return posts
-                except Exception as e:
-                    logger.debug(f"Erro com seletor {selector}: {e}")
-                    continue
+            posts = self._first_match('posts_count', POSTS_SELECTORS, lambda element: self._match_count(
+                element.get_attribute('title') or element.text or '', POSTS_KEYWORDS))
+            if posts is not None:
+                logger.debug(f"Posts encontrados: {posts}")
+                return posts
             
             logger.warning("Não foi possível extrair o número de posts")
             return None
@@ -425,84 +894,24 @@ class InstagramScraper:
             return None
     
     def _get_last_post_date(self):
-        """Tenta extrair a data da última postagem de forma mais robusta"""
+        """Data da última postagem pelos shortcodes da grade, sem abrir nenhum post"""
         if not self.driver:
             return None
             
         try:
-            # Primeiro verificar se há posts
-            post_selectors = [
-                "article div div div div a",
-                "article a[href*='/p/']",
-                "div[role='tabpanel'] a[href*='/p/']",
-                "main article a"
-            ]
-            
-            first_post = None
-            for selector in post_selectors:
-                try:
-                    posts = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if posts:
-                        first_post = posts[0]
-                        break
-                except:
-                    continue
+            post_links = selector_registry.ordered('post_link', POST_LINK_SELECTORS)
+            grid = self.driver.execute_script(GRID_POSTS_SCRIPT, post_links, PINNED_POST_SELECTOR,
+                                              SELENIUM_CONFIG['grid_posts']) or {}
+            self._record_grid_selector(post_links, grid.get('selector'))
             
-            if not first_post:
+            if not grid.get('posts'):
                 logger.warning("Nenhum post encontrado")
                 return None
             
-            # Tentar obter a data através do atributo href primeiro
-            try:
-                href = first_post.get_attribute('href')
-                if href and '/p/' in href:
-                    # Extrair código do post da URL
-                    post_code = href.split('/p/')[-1].rstrip('/')
-                    logger.debug(f"Código do post encontrado: {post_code}")
-            except:
-                pass
-            
-            # Tentar clicar no post para ver detalhes
-            try:
-                self.driver.execute_script("arguments[0].click();", first_post)
-                time.sleep(2)
-                
-                # Procurar por elementos de tempo no modal
-                time_selectors = [
-                    "time[datetime]",
-                    "time",
-                    "span[title*='UTC']",
-                    "a time[datetime]"
-                ]
-                
-                for selector in time_selectors:
-                    try:
-                        time_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        for time_elem in time_elements:
-                            datetime_attr = time_elem.get_attribute('datetime')
-                            if datetime_attr:
-                                # Converter para formato de data
-                                try:
-                                    post_date = datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
-                                    formatted_date = post_date.strftime('%Y-%m-%d')
-                                    logger.debug(f"Data da última postagem: {formatted_date}")
-                                    
-                                    # Fechar modal
-                                    self.driver.execute_script("window.history.back();")
-                                    time.sleep(1)
-                                    
-                                    return formatted_date
-                                except ValueError:
-                                    continue
-                    except:
-                        continue
-                
-                # Se não encontrou via modal, fechar e continuar
-                self.driver.execute_script("window.history.back();")
-                time.sleep(1)
-                
-            except Exception as e:
-                logger.debug(f"Erro ao abrir modal do post: {e}")
+            last_post_date = resolve_last_post_date(grid['posts'])
+            if last_post_date:
+                logger.debug(f"Data da última postagem: {last_post_date}")
+                return last_post_date
             
             logger.warning("Não foi possível extrair a data da última postagem")
             return None
@@ -517,43 +926,12 @@ class InstagramScraper:
             return False
             
         try:
-            bio_selectors = [
-                # Seletores específicos para bio 2025
-                "header section div[dir='auto'] span",
-                "header section div span[dir='auto']",
-                "div[data-testid='user-description'] span",
-                "header div[role='main'] div span",
-                "section div div span[style*='word-wrap']",
-                
-                # Seletores alternativos mais específicos
-                "header section div:nth-child(2) span",
-                "header div[style*='flex-direction'] span",
-                "article header section div span",
-                
-                # Seletores gerais de fallback
-                "header section div span",
-                "header div span",
-                "h1 + div span",
-                "section span",
-                "div[style*='word-wrap'] span",
-                
-                # Seletores por posição
-                "header section > div:nth-child(2) span",
-                "header > div > div > div:nth-child(2) span"
-            ]
-            
-            for selector in bio_selectors:
-                try:
-                    bio_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for bio_element in bio_elements:
-                        bio_text = bio_element.text.strip() if bio_element else ""
-                        
-                        # Validação mais rigorosa para bio
-                        if self._is_valid_bio(bio_text):
-                            logger.debug(f"Bio encontrada: {bio_text[:50]}...")
-                            return True
-                except:
-                    continue
+            # Validação mais rigorosa para bio
+            bio_text = self._first_match('bio', BIO_SELECTORS, lambda element: element.text.strip()
+                                         if self._is_valid_bio(element.text.strip()) else None)
+            if bio_text:
+                logger.debug(f"Bio encontrada: {bio_text[:50]}...")
+                return True
             
             logger.debug("Bio não encontrada ou muito curta")
             return False
@@ -567,48 +945,9 @@ class InstagramScraper:
             return False
             
         try:
-            profile_img_selectors = [
-                # Seletores específicos para foto de perfil 2025
-                "header img[data-testid='user-avatar']",
-                "header button img[alt*='foto']",
-                "header div[role='button'] img",
-                "header span img[crossorigin='anonymous']",
-                "article header img[style*='border-radius']",
-                
-                # Seletores alternativos mais específicos
-                "header img[alt*='foto de perfil']",
-                "header img[alt*='profile picture']",
-                "header img[alt*='foto']",
-                "header img[alt*='profile']", 
-                "header img[alt*='picture']",
-                
-                # Seletores por estrutura
-                "header > div img:first-child",
-                "header section img:first-child",
-                "header div:first-child img",
-                
-                # Seletores gerais de fallback
-                "header img",
-                "canvas + img",
-                "div[role='button'] img"
-            ]
-            
-            for selector in profile_img_selectors:
-                try:
-                    profile_imgs = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for profile_img in profile_imgs:
-                        src = profile_img.get_attribute('src')
-                        alt = profile_img.get_attribute('alt') or ''
-                        
-                        # Verificar se não é a imagem padrão
-                        if src and not any(default in src.lower() for default in ['default', 'anonymous', 'avatar']):
-                            # Verificar tamanho da imagem (profile pics são geralmente maiores que 44px)
-                            size = profile_img.size
-                            if size and size.get('width', 0) > 44:
-                                logger.debug("Foto de perfil personalizada encontrada")
-                                return True
-                except:
-                    continue
+            if self._first_match('profile_picture', PROFILE_PICTURE_SELECTORS, self._custom_profile_picture):
+                logger.debug("Foto de perfil personalizada encontrada")
+                return True
             
             logger.debug("Foto de perfil padrão ou não encontrada")
             return False
@@ -616,6 +955,18 @@ class InstagramScraper:
             logger.error(f"Erro ao verificar foto de perfil: {e}")
             return False
     
+    def _custom_profile_picture(self, profile_img):
+        """True se a imagem é uma foto de perfil personalizada, None caso contrário"""
+        src = profile_img.get_attribute('src')
+        width = None if IMAGES_BLOCKED else (profile_img.size or {}).get('width', 0)
+        return True if self._is_custom_picture(src, width) else None
+    
+    def _is_custom_picture(self, src, width):
+        """Foto personalizada: src que não é a imagem padrão e, com imagens carregadas, maior que 44px"""
+        if not src or any(default in src.lower() for default in ['default', 'anonymous', 'avatar']):
+            return False
+        return IMAGES_BLOCKED or (width or 0) > 44
+    
     def _is_business_account(self):
         """Verifica se é conta comercial"""
         if not self.driver:
@@ -624,37 +975,11 @@ class InstagramScraper:
         try:
             page_source = self.driver.page_source.lower()
             
-            # Indicadores mais específicos para conta comercial
-            business_indicators = [
-                'conta comercial',
-                'business account', 
-                'entrar em contato',
-                'contact',
-                'categoria',
-                'category',
-                'website',
-                'site',
-                'email',
-                'telefone',
-                'phone',
-                'endereço',
-                'address'
-            ]
-            
             # Contar quantos indicadores foram encontrados
-            found_indicators = sum(1 for indicator in business_indicators if indicator in page_source)
+            found_indicators = sum(1 for indicator in BUSINESS_INDICATORS if indicator in page_source)
             
             # Também verificar por elementos específicos de conta comercial
-            business_elements = [
-                "button[aria-label*='Contact']",
-                "button[aria-label*='Contato']",
-                "a[href*='mailto:']",
-                "a[href*='tel:']",
-                "span[title*='Category']",
-                "span[title*='Categoria']"
-            ]
-            
-            for selector in business_elements:
+            for selector in BUSINESS_ELEMENT_SELECTORS:
                 try:
                     if self.driver.find_elements(By.CSS_SELECTOR, selector):
                         found_indicators += 1
@@ -676,43 +1001,12 @@ class InstagramScraper:
             return None
             
         try:
-            # Seletores robustos para username - Instagram 2025
-            username_selectors = [
-                # Seletores específicos para nome de usuário
-                "header section div h2",
-                "header section div h1", 
-                "main header section div h2",
-                "main header section div h1",
-                
-                # Seletores alternativos
-                "header h1:not([title])",
-                "header h2:not([title])",
-                "[data-testid='user-name']",
-                "[data-testid='username']",
-                
-                # Seletores genéricos com validação
-                "header section span:first-child",
-                "header div span:first-of-type",
-                "h1[dir='auto']",
-                "h2[dir='auto']",
-                
-                # Fallbacks
-                "header span[title]:not([title*='follower']):not([title*='seguidor']):not([title*='post']):not([title*='following']):not([title*='seguindo'])",
-                "header section div:first-child span"
-            ]
-            
-            for selector in username_selectors:
-                try:
-                    username_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in username_elements:
-                        text = element.text.strip()
-                        
-                        # Validação mais rigorosa para username do Instagram
-                        if text and self._is_valid_username(text):
-                            logger.debug(f"Username encontrado: {text}")
-                            return text
-                except:
-                    continue
+            # Validação mais rigorosa para username do Instagram
+            text = self._first_match('username', USERNAME_SELECTORS, lambda element: element.text.strip()
+                                     if self._is_valid_username(element.text.strip()) else None)
+            if text:
+                logger.debug(f"Username encontrado: {text}")
+                return text
             
             # Fallback: tentar extrair da URL atual
             try:
@@ -731,6 +1025,12 @@ class InstagramScraper:
             logger.error(f"Erro ao extrair username: {e}")
             return None
     
+    def _match_count(self, text, keywords):
+        """Valida o texto de uma contagem (palavra-chave ou apenas dígitos) e converte com _parse_count"""
+        if text and (any(keyword in text.lower() for keyword in keywords) or text.replace(',', '').replace('.', '').isdigit()):
+            return self._parse_count(text)
+        return None
+    
     def _parse_count(self, text):
         """Converte texto de contagem em número de forma mais robusta"""
         if not text:
@@ -0,0 +1,76 @@
+import os
+import time
+
+from .http_pool import connection_timing
+
+# Limites da busca da página (sobrescrevíveis por variáveis de ambiente)
+PAGE_FETCH_CONFIG = {
+    # Bytes (já descomprimidos) lidos no máximo; o restante da resposta é descartado
+    'max_bytes': int(os.getenv('WEBSITE_MAX_BYTES', str(5 * 1024 * 1024))),
+    'chunk_size': int(os.getenv('WEBSITE_CHUNK_SIZE', str(64 * 1024))),
+    'connect_timeout': float(os.getenv('WEBSITE_CONNECT_TIMEOUT', '5')),
+    # Tempo máximo sem receber dados
+    'read_timeout': float(os.getenv('WEBSITE_READ_TIMEOUT', '10')),
+    # Tempo máximo de transferência do corpo (respostas lentas e intermináveis)
+    'max_transfer_seconds': float(os.getenv('WEBSITE_MAX_TRANSFER_SECONDS', '15'))
+}
+
+
+class FetchResult:
+    """Resposta lida em streaming, com o corpo (possivelmente truncado) e as fases de tempo"""
+
+    def __init__(self, response, content, truncated, timing):
+        self.response = response
+        self.content = content
+        self.truncated = truncated
+        self.timing = timing
+
+    @property
+    def total_seconds(self):
+        return self.timing['total_ms'] / 1000
+
+
+def fetch_page(session, url, headers=None, max_bytes=None, timeout=None, max_transfer_seconds=None):
+    """GET em streaming que para após max_bytes e registra DNS, connect, TLS, TTFB e transferência"""
+    max_bytes = max_bytes or PAGE_FETCH_CONFIG['max_bytes']
+    timeout = timeout or (PAGE_FETCH_CONFIG['connect_timeout'], PAGE_FETCH_CONFIG['read_timeout'])
+    max_transfer_seconds = max_transfer_seconds or PAGE_FETCH_CONFIG['max_transfer_seconds']
+
+    with connection_timing() as connection:
+        started = time.perf_counter()
+        response = session.get(url, headers=headers, timeout=timeout, stream=True)
+        headers_received = time.perf_counter()
+
+    chunks = []
+    received = 0
+    truncated = False
+    transfer_deadline = headers_received + max_transfer_seconds
+    try:
+        for chunk in response.iter_content(chunk_size=PAGE_FETCH_CONFIG['chunk_size']):
+            chunks.append(chunk)
+            received += len(chunk)
+            if received >= max_bytes or time.perf_counter() > transfer_deadline:
+                truncated = True
+                break
+    finally:
+        # Resposta incompleta: fecha a conexão em vez de devolvê-la ao pool
+        response.close()
+    finished = time.perf_counter()
+
+    content = b''.join(chunks)
+    if len(content) > max_bytes:
+        content = content[:max_bytes]
+
+    setup = connection['dns'] + connection['connect'] + connection['tls']
+    timing = {
+        'dns_ms': round(connection['dns'] * 1000, 1),
+        'connect_ms': round(connection['connect'] * 1000, 1),
+        'tls_ms': round(connection['tls'] * 1000, 1),
+        # Espera do servidor: da requisição enviada ao primeiro byte (sem a abertura da conexão)
+        'ttfb_ms': round(max(0.0, headers_received - started - setup) * 1000, 1),
+        'transfer_ms': round((finished - headers_received) * 1000, 1),
+        'total_ms': round((finished - started) * 1000, 1),
+        'connection_reused': connection['new_connections'] == 0,
+        'redirects': len(response.history)
+    }
+    return FetchResult(response, content, truncated, timing)
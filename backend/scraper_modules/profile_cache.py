@@ -0,0 +1,242 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .cache_store import cache_path, open_cache
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cache de perfis do Instagram (sobrescrevível por variáveis de ambiente)
+PROFILE_CACHE_CONFIG = {
+    'enabled': os.getenv('INSTAGRAM_PROFILE_CACHE_ENABLED', 'true').lower() == 'true',
+    'path': os.getenv('INSTAGRAM_PROFILE_CACHE_PATH', cache_path('instagram_profiles.sqlite')),
+    # Validade de cada campo (segundos): contagens mudam em horas, dados do perfil em dias
+    'field_ttls': {
+        'followers': int(os.getenv('INSTAGRAM_PROFILE_TTL_COUNTS', str(6 * 3600))),
+        'following': int(os.getenv('INSTAGRAM_PROFILE_TTL_COUNTS', str(6 * 3600))),
+        'posts_count': int(os.getenv('INSTAGRAM_PROFILE_TTL_COUNTS', str(6 * 3600))),
+        'last_post_date': int(os.getenv('INSTAGRAM_PROFILE_TTL_COUNTS', str(6 * 3600))),
+        'bio_complete': int(os.getenv('INSTAGRAM_PROFILE_TTL_PROFILE', str(24 * 3600))),
+        'profile_picture': int(os.getenv('INSTAGRAM_PROFILE_TTL_PROFILE', str(24 * 3600))),
+        'is_business_account': int(os.getenv('INSTAGRAM_PROFILE_TTL_PROFILE', str(24 * 3600)))
+    },
+    # Snapshots mais velhos que isso não são servidos nem enquanto atualizam
+    'max_stale': int(os.getenv('INSTAGRAM_PROFILE_MAX_STALE', str(7 * 24 * 3600))),
+    # Snapshots mantidos em memória (os demais ficam só no SQLite)
+    'max_entries': int(os.getenv('INSTAGRAM_PROFILE_CACHE_MAX_ENTRIES', '512'))
+}
+
+STATUS_FRESH = 'fresh'
+STATUS_STALE = 'stale'
+STATUS_MISS = 'miss'
+
+# Marcações que valem só para a resposta em que vieram (não entram no snapshot)
+TRANSIENT_FIELDS = ('partial', 'missing_fields')
+
+
+class ProfileSnapshot:
+    """Último valor conhecido de cada campo do perfil e quando foi obtido"""
+
+    def __init__(self, username, data, field_times):
+        self.username = username
+        self.data = data
+        self.field_times = field_times
+
+    def age_seconds(self, now=None):
+        """Idade do campo mais antigo do snapshot"""
+        if not self.field_times:
+            return None
+        return round((now or time.time()) - min(self.field_times.values()), 1)
+
+    def stale_fields(self, field_ttls, now=None):
+        now = now or time.time()
+        return [field for field, ttl in field_ttls.items()
+                if now - self.field_times.get(field, 0) > ttl]
+
+
+class NullProfileCache:
+    """Cache que não armazena nada (toda consulta busca o perfil)"""
+
+    enabled = False
+
+    def get(self, username):
+        return None
+
+    def store(self, username, data):
+        return None
+
+    def get_or_refresh(self, username, fetch, refresh=False):
+        return fetch()
+
+    def stats(self):
+        return {'enabled': False}
+
+
+class ProfileCache:
+    """Snapshots de perfis por username em memória (LRU) e SQLite, com stale-while-revalidate"""
+
+    def __init__(self, path, field_ttls, max_stale=7 * 24 * 3600, max_entries=512, enabled=True):
+        self.path = path
+        self.field_ttls = field_ttls
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._memory = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._counters = {'fresh': 0, 'stale': 0, 'misses': 0, 'refreshes': 0, 'refresh_errors': 0}
+        self._db = None
+
+        if enabled:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS instagram_profiles ('
+                'username TEXT PRIMARY KEY, data TEXT NOT NULL, field_times TEXT NOT NULL, '
+                'updated_at REAL NOT NULL)'
+            )
+            self._db.commit()
+
+    def get(self, username):
+        """Snapshot do username (memória, depois SQLite) ou None"""
+        with self._lock:
+            return self._lookup(username)
+
+    def _lookup(self, username):
+        snapshot = self._memory.get(username)
+        if snapshot is not None:
+            self._memory.move_to_end(username)
+            return snapshot
+        row = self._db.execute(
+            'SELECT data, field_times FROM instagram_profiles WHERE username = ?', (username,)
+        ).fetchone()
+        if not row:
+            return None
+        snapshot = ProfileSnapshot(username, json.loads(row[0]), json.loads(row[1]))
+        self._remember(snapshot)
+        return snapshot
+
+    def store(self, username, data):
+        """Mescla o resultado de um scrape no snapshot; campos ausentes mantêm o valor anterior.
+        Campos que um resultado parcial não trouxe ficam sem data e contam como vencidos"""
+        if data.get('error'):
+            return None
+        now = time.time()
+        unresolved = set(data.get('missing_fields') or ())
+        with self._lock:
+            previous = self._lookup(username)
+            merged = dict(previous.data) if previous else {}
+            field_times = dict(previous.field_times) if previous else {}
+            for field, value in data.items():
+                if field in TRANSIENT_FIELDS:
+                    continue
+                if value is None and merged.get(field) is not None:
+                    continue
+                merged[field] = value
+                if field in unresolved or (value is None and data.get('partial')):
+                    continue
+                if field in self.field_ttls:
+                    field_times[field] = now
+            snapshot = ProfileSnapshot(username, merged, field_times)
+            self._db.execute(
+                'INSERT OR REPLACE INTO instagram_profiles (username, data, field_times, updated_at) '
+                'VALUES (?, ?, ?, ?)',
+                (username, json.dumps(merged, ensure_ascii=False, default=str), json.dumps(field_times), now)
+            )
+            self._db.commit()
+            self._remember(snapshot)
+            return snapshot
+
+    def _remember(self, snapshot):
+        self._memory[snapshot.username] = snapshot
+        self._memory.move_to_end(snapshot.username)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get_or_refresh(self, username, fetch, refresh=False):
+        """Dados do perfil com 'snapshot' (idade e status); snapshots vencidos voltam na hora e
+        são atualizados em segundo plano"""
+        if not self.enabled or not username:
+            return fetch()
+
+        snapshot = None if refresh else self.get(username)
+        now = time.time()
+        if snapshot is not None and snapshot.age_seconds(now) is not None \
+                and snapshot.age_seconds(now) <= self.max_stale:
+            stale_fields = snapshot.stale_fields(self.field_ttls, now)
+            if not stale_fields:
+                self._counters['fresh'] += 1
+                return self._response(snapshot, STATUS_FRESH, now)
+            self._counters['stale'] += 1
+            refreshing = self._refresh_in_background(username, fetch)
+            return self._response(snapshot, STATUS_STALE, now, stale_fields, refreshing)
+
+        self._counters['misses'] += 1
+        data = fetch()
+        snapshot = self.store(username, data)
+        if snapshot is None:
+            return data
+        response = self._response(snapshot, STATUS_MISS, time.time())
+        response.update({field: data[field] for field in TRANSIENT_FIELDS if field in data})
+        return response
+
+    def _response(self, snapshot, status, now, stale_fields=None, refreshing=False):
+        data = dict(snapshot.data)
+        data['snapshot'] = {
+            'status': status,
+            'age_seconds': snapshot.age_seconds(now),
+            'stale_fields': stale_fields or [],
+            'refreshing': refreshing
+        }
+        return data
+
+    def _refresh_in_background(self, username, fetch):
+        # Uma atualização por username de cada vez
+        with self._lock:
+            if username in self._refreshing:
+                return True
+            self._refreshing.add(username)
+
+        def refresh():
+            try:
+                data = fetch()
+                if data.get('error'):
+                    raise RuntimeError(data['error'])
+                self.store(username, data)
+                self._counters['refreshes'] += 1
+                logger.info(f"🔄 Snapshot do Instagram atualizado: @{username}")
+            except Exception as e:
+                self._counters['refresh_errors'] += 1
+                logger.warning(f"Falha ao atualizar snapshot de @{username}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(username)
+
+        threading.Thread(target=refresh, name=f'instagram-refresh-{username}', daemon=True).start()
+        return True
+
+    def stats(self):
+        if not self.enabled:
+            return {'enabled': False}
+        with self._lock:
+            entries = self._db.execute('SELECT COUNT(*) FROM instagram_profiles').fetchone()[0]
+            return {'enabled': True, **self._counters, 'entries': entries,
+                    'in_memory': len(self._memory), 'refreshing': len(self._refreshing)}
+
+
+# Cache compartilhado pelo processo
+if PROFILE_CACHE_CONFIG['enabled']:
+    profile_cache = open_cache(
+        ProfileCache, NullProfileCache, 'Cache de perfis do Instagram',
+        PROFILE_CACHE_CONFIG['path'], PROFILE_CACHE_CONFIG['field_ttls'],
+        max_stale=PROFILE_CACHE_CONFIG['max_stale'],
+        max_entries=PROFILE_CACHE_CONFIG['max_entries']
+    )
+else:
+    profile_cache = NullProfileCache()
@@ -0,0 +1,62 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+class TokenBucket:
+    """Limitador de taxa token bucket, seguro para uso entre threads"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = max(1, int(capacity))
+        self._tokens = float(self.capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self, timeout=None):
+        """Aguarda um token; retorna False se o tempo limite expirar antes"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_time = (1 - self._tokens) / self.rate if self.rate > 0 else 1.0
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait_time = min(wait_time, remaining)
+            time.sleep(wait_time)
+
+
+class QueryScheduler:
+    """Executa buscas em paralelo respeitando um token bucket compartilhado"""
+
+    def __init__(self, rate_limiter, max_workers, max_sections):
+        self.rate_limiter = rate_limiter
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='google-query')
+        # Pool separado para as seções: elas aguardam as buscas, que nunca submetem tarefas
+        self._section_pool = ThreadPoolExecutor(max_workers=max_sections, thread_name_prefix='google-section')
+
+    def map(self, fn, queries):
+        """Aplica fn a cada query em paralelo e retorna os resultados na ordem original"""
+        futures = [self._pool.submit(fn, query) for query in queries]
+        return [future.result() for future in futures]
+
+    def run_sections(self, sections, on_section=None):
+        """Executa {nome: callable} em paralelo e retorna {nome: resultado} na mesma ordem"""
+        futures = {name: self._section_pool.submit(fn) for name, fn in sections.items()}
+        if on_section is not None:
+            # Notifica cada seção assim que termina, na ordem de conclusão
+            names = {future: name for name, future in futures.items()}
+            for future in as_completed(names):
+                on_section(names[future], future.result())
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,151 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+from .cache_store import cache_path
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Estatísticas dos seletores do Instagram (sobrescrevível por variáveis de ambiente)
+SELECTOR_REGISTRY_CONFIG = {
+    # Reordena as listas pelo acerto observado; False mantém a ordem fixa do código
+    'adaptive': os.getenv('INSTAGRAM_ADAPTIVE_SELECTORS', 'true').lower() == 'true',
+    'path': os.getenv('INSTAGRAM_SELECTOR_STATS_PATH', cache_path('selector_stats.json')),
+    # Intervalo mínimo entre gravações do arquivo de estatísticas
+    'save_interval': float(os.getenv('INSTAGRAM_SELECTOR_SAVE_INTERVAL', '30')),
+    # Tentativas sem nenhum acerto para um seletor ser considerado morto
+    'dead_after': int(os.getenv('INSTAGRAM_SELECTOR_DEAD_AFTER', '20')),
+    # Peso de cada nova tentativa na taxa de acerto (média móvel exponencial): ~1/peso tentativas recentes
+    'decay': float(os.getenv('INSTAGRAM_SELECTOR_DECAY', '0.1'))
+}
+
+
+class SelectorRegistry:
+    """Acertos, erros e latência por seletor, persistidos em JSON e usados para ordenar as listas.
+
+    A ordem usa a taxa de acerto recente (média móvel exponencial), não o histórico inteiro:
+    quando o Instagram muda o layout, o seletor que passou a funcionar sobe em poucas tentativas.
+    """
+
+    def __init__(self, path=None, adaptive=True, save_interval=30.0, dead_after=20, decay=0.1):
+        self.path = path
+        self.adaptive = adaptive
+        self.save_interval = save_interval
+        self.dead_after = dead_after
+        self.decay = decay
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as stats_file:
+                self._stats = json.load(stats_file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Estatísticas de seletores ignoradas ({self.path}): {e}")
+            self._stats = {}
+
+    def save(self):
+        """Grava as estatísticas (arquivo temporário + rename para não corromper em quedas)"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = json.dumps(self._stats, ensure_ascii=False, indent=1)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as stats_file:
+                stats_file.write(snapshot)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Não foi possível salvar estatísticas de seletores: {e}")
+
+    def _score(self, field, selector):
+        entry = self._stats.get(field, {}).get(selector)
+        if not entry:
+            return 0.5
+        if 'recent' not in entry:
+            # Arquivo de versões anteriores: parte da taxa histórica suavizada
+            entry['recent'] = (entry['hits'] + 1) / (entry['hits'] + entry['misses'] + 2)
+        # Seletores novos (0.5) ficam entre os vencedores e os mortos
+        return entry['recent']
+
+    def ordered(self, field, selectors, fallbacks=()):
+        """Seletores do campo com os de maior acerto recente primeiro; empates mantêm a ordem do código.
+        Os seletores em fallbacks (genéricos, podem casar com a contagem de outro campo) nunca passam
+        à frente dos específicos"""
+        if not self.adaptive:
+            return list(selectors)
+        with self._lock:
+            scores = {selector: self._score(field, selector) for selector in selectors}
+        return sorted(selectors, key=lambda selector: (selector in fallbacks, -scores[selector]))
+
+    def record(self, field, selector, hit, elapsed_ms=None):
+        """Registra uma tentativa do seletor (hit=True quando entregou um valor válido)"""
+        with self._lock:
+            entry = self._stats.setdefault(field, {}).setdefault(
+                selector, {'hits': 0, 'misses': 0, 'total_ms': 0.0, 'timed': 0, 'last_hit': None}
+            )
+            entry['recent'] = self._score(field, selector) * (1 - self.decay) + (self.decay if hit else 0.0)
+            if hit:
+                entry['hits'] += 1
+                entry['last_hit'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+            else:
+                entry['misses'] += 1
+            if elapsed_ms is not None:
+                entry['total_ms'] += elapsed_ms
+                entry['timed'] += 1
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= self.save_interval
+        if due:
+            self.save()
+
+    def stats(self):
+        """Estatísticas por campo e lista de seletores mortos (muitas tentativas, nenhum acerto)"""
+        fields = {}
+        dead = []
+        with self._lock:
+            for field, selectors in self._stats.items():
+                rows = []
+                for selector, entry in selectors.items():
+                    attempts = entry['hits'] + entry['misses']
+                    is_dead = entry['hits'] == 0 and attempts >= self.dead_after
+                    rows.append({
+                        'selector': selector,
+                        'hits': entry['hits'],
+                        'misses': entry['misses'],
+                        'hit_rate': round(entry['hits'] / attempts, 3) if attempts else None,
+                        'recent_hit_rate': round(self._score(field, selector), 3),
+                        'avg_ms': round(entry['total_ms'] / entry['timed'], 2) if entry['timed'] else None,
+                        'last_hit': entry['last_hit'],
+                        'dead': is_dead
+                    })
+                    if is_dead:
+                        dead.append({'field': field, 'selector': selector, 'attempts': attempts})
+                rows.sort(key=lambda row: -self._score(field, row['selector']))
+                fields[field] = rows
+        return {'adaptive': self.adaptive, 'fields': fields, 'dead': dead}
+
+
+# Registro compartilhado pelo processo
+selector_registry = SelectorRegistry(
+    path=SELECTOR_REGISTRY_CONFIG['path'],
+    adaptive=SELECTOR_REGISTRY_CONFIG['adaptive'],
+    save_interval=SELECTOR_REGISTRY_CONFIG['save_interval'],
+    dead_after=SELECTOR_REGISTRY_CONFIG['dead_after'],
+    decay=SELECTOR_REGISTRY_CONFIG['decay']
+)
+atexit.register(selector_registry.save)
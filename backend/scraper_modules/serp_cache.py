@@ -0,0 +1,125 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+
+class NullSerpCache:
+    """Cache que não armazena nada (desativa o cache de buscas)"""
+
+    def get(self, query, num_results=10):
+        return None
+
+    def set(self, query, results, num_results=10, ttl=None):
+        pass
+
+    def stats(self):
+        return {'enabled': False}
+
+
+class SerpCache:
+    """Cache de resultados do Google em dois níveis: LRU em memória + SQLite com TTL"""
+
+    def __init__(self, path=None, max_memory_entries=512, default_ttl=86400):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.default_ttl = default_ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'expired': 0, 'stores': 0}
+        self._db = None
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS serp_cache ('
+                'key TEXT PRIMARY KEY, results TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._db.commit()
+
+    @staticmethod
+    def normalize_query(query):
+        """Normaliza a query: unicode NFC, minúsculas e espaços colapsados"""
+        query = unicodedata.normalize('NFC', query or '')
+        return re.sub(r'\s+', ' ', query).strip().lower()
+
+    def _key(self, query, num_results):
+        return f'{num_results}|{self.normalize_query(query)}'
+
+    def get(self, query, num_results=10):
+        """Retorna a lista [{title, url, snippet}] em cache ou None"""
+        key = self._key(query, num_results)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, results = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._counters['memory_hits'] += 1
+                    return results
+                del self._memory[key]
+                self._counters['expired'] += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT results, expires_at FROM serp_cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row:
+                    if row[1] > now:
+                        results = json.loads(row[0])
+                        self._remember(key, row[1], results)
+                        self._counters['disk_hits'] += 1
+                        return results
+                    self._db.execute('DELETE FROM serp_cache WHERE key = ?', (key,))
+                    self._db.commit()
+                    self._counters['expired'] += 1
+
+            self._counters['misses'] += 1
+            return None
+
+    def set(self, query, results, num_results=10, ttl=None):
+        """Armazena os resultados com TTL próprio (ou o padrão do cache)"""
+        key = self._key(query, num_results)
+        expires_at = time.time() + (ttl if ttl is not None else self.default_ttl)
+
+        with self._lock:
+            self._remember(key, expires_at, results)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO serp_cache (key, results, expires_at) VALUES (?, ?, ?)',
+                    (key, json.dumps(results, ensure_ascii=False), expires_at)
+                )
+                self._db.commit()
+            self._counters['stores'] += 1
+
+    def _remember(self, key, expires_at, results):
+        self._memory[key] = (expires_at, results)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self):
+        """Remove do disco as entradas vencidas"""
+        with self._lock:
+            if self._db is not None:
+                self._db.execute('DELETE FROM serp_cache WHERE expires_at <= ?', (time.time(),))
+                self._db.commit()
+
+    def stats(self):
+        """Contadores de acerto/erro do cache"""
+        with self._lock:
+            lookups = self._counters['memory_hits'] + self._counters['disk_hits'] + self._counters['misses']
+            hits = self._counters['memory_hits'] + self._counters['disk_hits']
+            return {
+                'enabled': True,
+                **self._counters,
+                'memory_entries': len(self._memory),
+                'hit_rate': round(hits / lookups, 3) if lookups else 0.0
+            }
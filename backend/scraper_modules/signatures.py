@@ -0,0 +1,130 @@
+import re
+from bisect import bisect_right
+
+
+class Regex(str):
+    """Marca um indicador como expressão regular (os demais são texto literal)"""
+
+
+def _trie_pattern(literals):
+    """Monta uma regex fatorada por prefixos comuns (trie) para um conjunto de literais"""
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def branches(node):
+        return [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+
+    def build(node):
+        if list(node) == ['']:
+            return ''
+        options = branches(node)
+        pattern = options[0] if len(options) == 1 else '(?:' + '|'.join(options) + ')'
+        # Literal que é prefixo de outro: o ramo mais longo é tentado primeiro
+        return f'(?:{pattern})?' if '' in node else pattern
+
+    return '(?:' + '|'.join(branches(trie)) + ')'
+
+
+class SignatureSet:
+    """Conjunto de assinaturas compilado uma vez; encontra todas as ocorrências em uma passada.
+
+    groups: {rótulo: [indicador, ...]} na ordem de precedência. Indicadores comuns
+    são literais; Regex(...) declara uma expressão regular. A busca ignora maiúsculas.
+
+    Os literais são procurados em todas as posições do texto (lookahead), então
+    ocorrências sobrepostas também contam: em 'gtmagento' aparecem 'gtm' e 'magento',
+    como na busca por substring. As poucas Regex são verificadas à parte.
+    """
+
+    def __init__(self, groups):
+        self.groups = groups
+        self._literals = {}
+        self._regexes = []
+        self._resolved = {}
+
+        for label, indicators in groups.items():
+            for indicator in indicators:
+                if isinstance(indicator, Regex):
+                    self._regexes.append((re.compile(indicator.lower()), label, indicator))
+                else:
+                    self._literals.setdefault(indicator.lower(), []).append((label, indicator))
+
+        # Lookahead de largura zero: o finditer avança um caractere por vez e não consome o trecho encontrado
+        self._pattern = re.compile(f'(?=({_trie_pattern(self._literals)}))')
+
+    def _resolve(self, matched):
+        """Assinaturas (rótulo, indicador) presentes em um trecho encontrado"""
+        hits = self._resolved.get(matched)
+        if hits is None:
+            # Um trecho encontrado pode conter outras assinaturas (ex.: 'cdn.shopify.com' contém 'shopify')
+            hits = set()
+            for literal, owners in self._literals.items():
+                if literal in matched:
+                    hits.update(owners)
+            self._resolved[matched] = hits
+        return hits
+
+    def _ordered(self, hits):
+        return {
+            label: [indicator for indicator in indicators if (label, indicator) in hits]
+            for label, indicators in self.groups.items()
+            if any((label, indicator) in hits for indicator in indicators)
+        }
+
+    def scan(self, text):
+        """Retorna {rótulo: [indicadores encontrados]} na ordem declarada"""
+        if not text:
+            return {}
+        text = text.lower()
+        hits = set()
+        for matched in {match.group(1) for match in self._pattern.finditer(text)}:
+            hits |= self._resolve(matched)
+        hits.update((label, indicator) for regex, label, indicator in self._regexes if regex.search(text))
+        return self._ordered(hits)
+
+    def first(self, *texts):
+        """Primeiro rótulo (na ordem declarada) encontrado em algum dos textos, com as evidências"""
+        return self.first_of([self.scan(text) for text in texts])
+
+    def first_of(self, results, labels=None):
+        """Primeiro rótulo entre resultados de scan() já calculados, opcionalmente restrito a labels"""
+        found = {}
+        for result in results:
+            for label, indicators in result.items():
+                if labels is None or label in labels:
+                    found.setdefault(label, set()).update(indicators)
+        return self._first_label(found)
+
+    def first_each(self, texts):
+        """Como first(), para cada texto de uma lista curta (ex.: hrefs), em uma única varredura"""
+        lowered = [text.lower().replace('\n', ' ') for text in texts]
+        offsets = []
+        position = 0
+        for text in lowered:
+            offsets.append(position)
+            position += len(text) + 1
+
+        found = [dict() for _ in texts]
+        for match in self._pattern.finditer('\n'.join(lowered)):
+            index = bisect_right(offsets, match.start()) - 1
+            for label, indicator in self._resolve(match.group(1)):
+                found[index].setdefault(label, set()).add(indicator)
+        if self._regexes:
+            for index, text in enumerate(lowered):
+                for regex, label, indicator in self._regexes:
+                    if regex.search(text):
+                        found[index].setdefault(label, set()).add(indicator)
+        return [self._first_label(hits) for hits in found]
+
+    def _first_label(self, found):
+        if not found:
+            return None, []
+        for label, indicators in self.groups.items():
+            evidence = [indicator for indicator in indicators if indicator in found.get(label, ())]
+            if evidence:
+                return label, evidence
+        return None, []
@@ -0,0 +1,254 @@
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from .instagram_config import SELENIUM_CONFIG
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LEAN_BROWSING = SELENIUM_CONFIG['lean_browsing']
+
+# Padrões de URL bloqueados via CDP (Network.setBlockedURLs)
+MEDIA_URL_PATTERNS = ['*.mp4*', '*.webm*', '*.m4a*', '*.m4v*', '*.mp3*']
+FONT_URL_PATTERNS = ['*.woff*', '*.ttf*', '*.otf*', '*.eot*']
+
+# Contagem, no navegador, dos recursos que a navegação enxuta deixou de baixar e do que foi baixado
+# (Resource Timing: transferSize é 0 para recursos de outra origem sem Timing-Allow-Origin)
+LEAN_BROWSING_REPORT_SCRIPT = """
+const spec = arguments[0];
+const blocked = {image: 0, media: 0, font: 0, tracker: 0};
+if (spec.block_images) {
+    blocked.image = Array.from(document.images).filter(img => img.getAttribute('src')).length;
+}
+if (spec.block_media) {
+    blocked.media = document.querySelectorAll('video, audio').length;
+}
+if (spec.block_fonts && document.fonts) {
+    blocked.font = Array.from(document.fonts).filter(font => font.status === 'error').length;
+}
+if (spec.block_trackers) {
+    blocked.tracker = Array.from(document.scripts).filter(
+        script => spec.tracker_hosts.some(host => script.src.includes(host))
+    ).length;
+}
+const resources = performance.getEntriesByType('resource');
+return {
+    blocked: blocked,
+    loaded_bytes: resources.reduce((total, entry) => total + (entry.transferSize || 0), 0),
+    loaded_ms: resources.reduce((total, entry) => total + entry.duration, 0)
+};
+"""
+
+
+def _blocked_url_patterns():
+    patterns = []
+    if LEAN_BROWSING['block_media']:
+        patterns += MEDIA_URL_PATTERNS
+    if LEAN_BROWSING['block_fonts']:
+        patterns += FONT_URL_PATTERNS
+    if LEAN_BROWSING['block_trackers']:
+        patterns += [f'*{host}*' for host in LEAN_BROWSING['tracker_hosts']]
+    return patterns
+
+
+def _execute_cdp(driver, cmd, params=None):
+    """Envia um comando CDP pelo Selenium Grid (webdriver.Remote não expõe execute_cdp_cmd)"""
+    executor = driver.command_executor
+    if hasattr(executor, 'add_command'):
+        executor.add_command('executeCdpCommand', 'POST', '/session/$sessionId/goog/cdp/execute')
+    else:
+        executor._commands['executeCdpCommand'] = ('POST', '/session/$sessionId/goog/cdp/execute')
+    return driver.execute('executeCdpCommand', {'cmd': cmd, 'params': params or {}})['value']
+
+
+def apply_lean_browsing(driver):
+    """Bloqueia mídia, fontes e rastreadores na sessão (imagens já são bloqueadas pelas prefs)"""
+    patterns = _blocked_url_patterns()
+    if not patterns:
+        return
+    try:
+        _execute_cdp(driver, 'Network.enable')
+        _execute_cdp(driver, 'Network.setBlockedURLs', {'urls': patterns})
+    except Exception as e:
+        # Grid sem suporte a CDP: segue apenas com as prefs do Chrome
+        logger.warning(f"Não foi possível bloquear recursos via CDP: {e}")
+
+
+def lean_browsing_report(driver):
+    """Recursos bloqueados e transferência medida na página atual; None se desativado.
+
+    Só as contagens e o que foi baixado são medidos. O tamanho dos recursos bloqueados é uma
+    estimativa (tamanho médio por tipo); a economia real é medida por
+    benchmarks/bench_lean_browsing.py, que carrega o mesmo perfil com e sem bloqueio.
+    """
+    if not LEAN_BROWSING['enabled']:
+        return None
+    raw = driver.execute_script(LEAN_BROWSING_REPORT_SCRIPT, {
+        'block_images': LEAN_BROWSING['block_images'],
+        'block_media': LEAN_BROWSING['block_media'],
+        'block_fonts': LEAN_BROWSING['block_fonts'],
+        'block_trackers': LEAN_BROWSING['block_trackers'],
+        'tracker_hosts': LEAN_BROWSING['tracker_hosts']
+    })
+    blocked = raw.get('blocked') or {}
+    return {
+        'blocked_resources': blocked,
+        # Estimativa: contagem x tamanho médio configurado por tipo, não uma medição
+        'blocked_bytes_estimate': sum(count * LEAN_BROWSING['estimated_bytes'].get(kind, 0)
+                                      for kind, count in blocked.items()),
+        'loaded_bytes': raw.get('loaded_bytes') or 0,
+        'loaded_resources_ms': round(raw.get('loaded_ms') or 0)
+    }
+
+
+def create_driver(lean_browsing=None, performance_log=False):
+    """Abre uma nova sessão no Selenium Grid com as opções anti-detecção.
+
+    lean_browsing=None segue a configuração; performance_log habilita o log de eventos de rede
+    (usado pelo benchmark de navegação enxuta)."""
+    lean = LEAN_BROWSING['enabled'] if lean_browsing is None else lean_browsing
+    chrome_options = Options()
+    chrome_options.add_argument('--headless' if SELENIUM_CONFIG['headless'] else '--no-headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument(f'--user-agent={SELENIUM_CONFIG["user_agent"]}')
+    
+    if performance_log:
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    if lean and LEAN_BROWSING['block_images']:
+        # Imagens bloqueadas pelas configurações de conteúdo do Chrome
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2
+        })
+
+    # Conectar ao container Selenium
+    driver = webdriver.Remote(
+        command_executor=SELENIUM_CONFIG['command_executor'],
+        options=chrome_options
+    )
+
+    # Executar script para remover detecção de webdriver
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    
+    if lean:
+        apply_lean_browsing(driver)
+    return driver
+
+
+class PooledDriver:
+    """Sessão do pool com contagem de usos"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+        self.broken = False
+
+
+class WebDriverPool:
+    """Pool de sessões WebDriver reaproveitadas entre análises (checkout/checkin)"""
+
+    def __init__(self, factory=None, size=None, max_uses=None, checkout_timeout=None):
+        self.factory = factory or create_driver
+        self.size = size or SELENIUM_CONFIG['pool_size']
+        self.max_uses = max_uses or SELENIUM_CONFIG['max_uses']
+        self.checkout_timeout = checkout_timeout or SELENIUM_CONFIG['checkout_timeout']
+        self._idle = deque()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._counters = {'created': 0, 'reused': 0, 'recycled': 0, 'unhealthy': 0}
+
+    def checkout(self, timeout=None):
+        """Retorna uma sessão saudável, reaproveitando uma ociosa ou criando uma nova"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f'Nenhuma sessão do Selenium livre em {timeout:g}s')
+
+        try:
+            while True:
+                with self._lock:
+                    pooled = self._idle.popleft() if self._idle else None
+                if pooled is None:
+                    break
+                if self._is_healthy(pooled):
+                    self._count('reused')
+                    return pooled
+                self._count('unhealthy')
+                self._quit(pooled)
+
+            pooled = PooledDriver(self.factory())
+            self._count('created')
+            logger.info("🌐 Nova sessão do Selenium criada para o pool")
+            return pooled
+        except Exception:
+            self._slots.release()
+            raise
+
+    def checkin(self, pooled, broken=False):
+        """Devolve a sessão ao pool; sessões com falha ou muito usadas são recicladas"""
+        try:
+            pooled.uses += 1
+            if broken or pooled.broken or pooled.uses >= self.max_uses:
+                self._count('recycled')
+                self._quit(pooled)
+                return
+            try:
+                # Página em branco interrompe scripts do perfil anterior
+                pooled.driver.get('about:blank')
+            except Exception as e:
+                logger.warning(f"Sessão descartada ao devolver ao pool: {e}")
+                self._count('recycled')
+                self._quit(pooled)
+                return
+            with self._lock:
+                self._idle.append(pooled)
+        finally:
+            self._slots.release()
+
+    def _count(self, name):
+        # checkout/checkin rodam em várias threads ao mesmo tempo
+        with self._lock:
+            self._counters[name] += 1
+
+    def _is_healthy(self, pooled):
+        try:
+            pooled.driver.execute_script('return 1')
+            return True
+        except Exception as e:
+            logger.warning(f"Sessão do Selenium inválida no pool: {e}")
+            return False
+
+    def _quit(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.debug(f"Erro ao fechar sessão: {e}")
+
+    def close_all(self):
+        """Encerra todas as sessões ociosas"""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for pooled in idle:
+            self._quit(pooled)
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, 'idle': len(self._idle), 'size': self.size}
+
+
+# Pool compartilhado pelo processo; sessões são criadas sob demanda
+webdriver_pool = WebDriverPool()
+atexit.register(webdriver_pool.close_all)
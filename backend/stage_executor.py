@@ -0,0 +1,160 @@
+# stage_executor.py - Execução concorrente dos estágios de análise
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Optional
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuração do executor (sobrescrevível por variáveis de ambiente)
+STAGE_CONFIG = {
+    'max_workers': int(os.getenv('STAGE_MAX_WORKERS', '8')),
+    # Threads extras para estágios abandonados após o tempo limite (Python não interrompe threads);
+    # com todas ocupadas, novos estágios recebem o fallback na hora em vez de esperar na fila
+    'max_abandoned': int(os.getenv('STAGE_MAX_ABANDONED', '4')),
+    'default_timeout': float(os.getenv('STAGE_DEFAULT_TIMEOUT', '60')),
+    'timeouts': {
+        'website': float(os.getenv('STAGE_TIMEOUT_WEBSITE', '20')),
+        'google': float(os.getenv('STAGE_TIMEOUT_GOOGLE', '90')),
+        'instagram': float(os.getenv('STAGE_TIMEOUT_INSTAGRAM', '60'))
+    }
+}
+
+
+class StageTimeoutError(Exception):
+    """Estágio não terminou dentro do tempo limite"""
+
+
+class StageRejectedError(Exception):
+    """Pool ocupado por estágios abandonados: o estágio não foi executado"""
+
+
+class Stage:
+    """Estágio independente da análise: função principal + fallback"""
+
+    def __init__(self, name: str, run: Callable[[], Any],
+                 fallback: Callable[[Exception], Any],
+                 timeout: Optional[float] = None,
+                 host: Optional[str] = None):
+        self.name = name
+        self.run = run
+        self.fallback = fallback
+        # Host acessado pelo estágio (limite de concorrência por host nos lotes)
+        self.host = host or name
+        self.timeout = timeout if timeout is not None else STAGE_CONFIG['timeouts'].get(
+            name, STAGE_CONFIG['default_timeout']
+        )
+
+
+class StageRun:
+    """Estágio agendado no pool: o tempo limite conta a partir de quando ele começa a rodar"""
+
+    def __init__(self, stage: Stage):
+        self.stage = stage
+        self.submitted = time.monotonic()
+        self.started = None
+        self.future = None
+
+    def __call__(self):
+        self.started = time.monotonic()
+        return self.stage.run()
+
+    def deadline(self) -> Optional[float]:
+        """Fim do prazo do estágio, ou None enquanto ele espera na fila do pool"""
+        if self.started is None:
+            return None
+        return self.started + self.stage.timeout
+
+    def expires_at(self) -> float:
+        """Prazo a partir do início; na fila, a espera também não passa do tempo limite"""
+        return (self.started if self.started is not None else self.submitted) + self.stage.timeout
+
+
+class StageExecutor:
+    """Distribui estágios independentes em um pool de threads limitado"""
+
+    def __init__(self, max_workers: Optional[int] = None, max_abandoned: Optional[int] = None,
+                 thread_name_prefix: str = 'stage'):
+        self.max_workers = max_workers or STAGE_CONFIG['max_workers']
+        self.max_abandoned = max_abandoned if max_abandoned is not None else STAGE_CONFIG['max_abandoned']
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers + self.max_abandoned,
+                                        thread_name_prefix=thread_name_prefix)
+        self._abandoned = 0
+        self._lock = threading.Lock()
+
+    def submit(self, stage: Stage) -> StageRun:
+        """Agenda um único estágio no pool compartilhado"""
+        run = StageRun(stage)
+        run.future = self._pool.submit(run)
+        return run
+
+    def abandon(self, run: StageRun):
+        """Desiste de um estágio após o tempo limite; se já estiver rodando, a thread fica contada até terminar"""
+        if run.future.cancel():
+            return
+        with self._lock:
+            self._abandoned += 1
+        run.future.add_done_callback(self._release_abandoned)
+
+    def _release_abandoned(self, future: Future):
+        with self._lock:
+            self._abandoned -= 1
+
+    @property
+    def abandoned(self) -> int:
+        """Threads ainda ocupadas por estágios que já receberam o fallback"""
+        return self._abandoned
+
+    def saturated(self) -> bool:
+        return self._abandoned >= self.max_abandoned
+
+    def run(self, stages: Dict[str, Stage]) -> Dict[str, Any]:
+        """Executa os estágios em paralelo e retorna {nome: resultado ou fallback}"""
+        started = time.monotonic()
+        results = {}
+        runs = {}
+        for name, stage in stages.items():
+            if self.saturated():
+                logger.error(f"🚫 Estágio '{name}' recusado: {self._abandoned} threads presas em estágios abandonados")
+                results[name] = stage.fallback(StageRejectedError('pool ocupado por estágios abandonados'))
+                continue
+            runs[name] = self.submit(stage)
+        futures = {run.future: name for name, run in runs.items()}
+
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            next_deadline = min(runs[futures[f]].expires_at() for f in pending)
+            done, pending = wait(pending, timeout=max(0, next_deadline - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                    logger.info(f"✅ Estágio '{name}' concluído em {time.monotonic() - started:.2f}s")
+                except Exception as e:
+                    logger.error(f"❌ Erro no estágio '{name}': {e}")
+                    results[name] = stages[name].fallback(e)
+
+            # Estágios que estouraram o prazo recebem o fallback imediatamente
+            now = time.monotonic()
+            for future in list(pending):
+                name = futures[future]
+                if now >= runs[name].expires_at():
+                    self.abandon(runs[name])
+                    pending.discard(future)
+                    logger.warning(f"⏱️ Estágio '{name}' excedeu {stages[name].timeout:.0f}s")
+                    results[name] = stages[name].fallback(
+                        StageTimeoutError(f"tempo limite de {stages[name].timeout:.0f}s excedido")
+                    )
+
+        return results
+
+
+# Pool compartilhado pelo processo
+stage_executor = StageExecutor()
@@ -0,0 +1,33 @@
+import threading
+import time
+
+from batch_scheduler import BatchScheduler
+from stage_executor import Stage, StageExecutor
+
+
+def fallback(error):
+    return f'fallback:{type(error).__name__}'
+
+
+def test_hung_stage_does_not_block_the_batch():
+    release = threading.Event()
+    executor = StageExecutor(max_workers=2, max_abandoned=2, thread_name_prefix='test-batch')
+    hung = lambda: release.wait(10) and 'tarde'
+    items = [
+        {'website': Stage('website', hung, fallback, timeout=0.2, host='loja.com')},
+        {'website': Stage('website', lambda: 'ok', fallback, timeout=1, host='loja.com')},
+        {'website': Stage('website', hung, fallback, timeout=5, host='outra.com')}
+    ]
+    scheduler = BatchScheduler(executor, per_host=1, abandoned_slot_seconds=0.3, max_seconds=1.5)
+    started = time.monotonic()
+    try:
+        results = {index: stage_results for index, stage_results, _ in scheduler.run(items)}
+    finally:
+        release.set()
+
+    # A vaga de loja.com presa pelo estágio abandonado expira e o item seguinte roda
+    assert results[1] == {'website': 'ok'}
+    assert results[0] == {'website': 'fallback:StageTimeoutError'}
+    # O estágio que nunca termina recebe o fallback no prazo do lote
+    assert results[2] == {'website': 'fallback:StageTimeoutError'}
+    assert time.monotonic() - started < 3
@@ -0,0 +1,52 @@
+import html
+
+import pytest
+
+from scraper_modules.html_features import PAGE_SIGNATURES, SOCIAL_SIGNATURES
+
+# Páginas em que a detecção deve coincidir com a extração original (substring em str(soup).lower())
+PARITY_PAGES = [
+    '<html><body><script>var gtmagento = 1;</script></body></html>',
+    '<html><head><link href="/wp&#45;content/themes/a.css"></head><body></body></html>',
+    '<html><head><script src="https://cdn.shopify.com/s/app.js"></script></head><body></body></html>',
+    '<html><head><meta name="generator" content="Joomla! 4"></head><body>'
+    '<a href="https://www.instagram.com/loja">Instagram</a></body></html>',
+    '<html><body><p>Drupal e WordPress</p><script>ga("create")</script>'
+    '<a href="https://x.com/loja">X</a><a href="https://wa.me/5584999999999">WhatsApp</a></body></html>',
+    '<html><body><img src="https://static.wixstatic.com/a.png">'
+    '<footer>Desenvolvido por Agência Exemplo | 2024</footer></body></html>',
+    '<html><body><p>Nenhum indicador aqui</p></body></html>'
+]
+
+
+def test_overlapping_indicators_are_all_found():
+    hits = PAGE_SIGNATURES.scan('<script>var gtmagento = 1;</script>')
+    assert hits['Magento'] == ['magento']
+    assert hits['analytics'] == ['gtm']
+
+
+def test_contained_and_regex_indicators():
+    hits = PAGE_SIGNATURES.scan('<meta name="generator" content="WordPress 6.4">')
+    assert 'wordpress' in hits['WordPress']
+    assert PAGE_SIGNATURES.scan('https://cdn.shopify.com/s/app.js')['Shopify'] == ['shopify', 'cdn.shopify.com']
+
+
+def test_character_references_match_after_unescape():
+    assert PAGE_SIGNATURES.scan(html.unescape('/wp&#45;content/a.css')) == {'WordPress': ['wp-content']}
+
+
+def test_first_each_keeps_links_apart():
+    assert SOCIAL_SIGNATURES.first_each(['https://fb.com/loja', '/contato', 'https://wa.me/55']) == [
+        ('facebook', ['fb.com']), (None, []), ('whatsapp', ['wa.me'])
+    ]
+
+
+@pytest.mark.parametrize('page', PARITY_PAGES)
+def test_parity_with_legacy_extractor(page):
+    pytest.importorskip('bs4')
+    from benchmarks.bench_html_extraction import run_legacy, run_single_pass
+
+    content = page.encode('utf-8')
+    legacy = run_legacy(content)
+    current = run_single_pass(content)
+    assert {key: current[key] for key in legacy} == legacy
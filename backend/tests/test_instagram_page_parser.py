@@ -0,0 +1,67 @@
+import json
+
+from scraper_modules.instagram_page_parser import parse_profile_info, parse_profile_page
+
+
+def profile_info(user):
+    return json.dumps({'data': {'user': user}, 'status': 'ok'})
+
+
+def test_profile_info_reads_the_requested_user():
+    body = profile_info({
+        # Perfis relacionados vêm antes dos campos do próprio usuário no payload
+        'edge_related_profiles': {'edges': [{'node': {'username': 'outra_loja', 'follower_count': 999999,
+                                                      'edge_followed_by': {'count': 999999}}}]},
+        'username': 'loja',
+        'biography': 'Moda praia feita em Natal/RN',
+        'profile_pic_url_hd': 'https://cdn.example/loja.jpg',
+        'is_business_account': True,
+        'edge_followed_by': {'count': 1520},
+        'edge_follow': {'count': 310},
+        'edge_owner_to_timeline_media': {'count': 87, 'edges': [
+            {'node': {'taken_at_timestamp': 1700000000}},
+            {'node': {'taken_at_timestamp': 1710000000}}
+        ]}
+    })
+    assert parse_profile_info(body) == {
+        'followers': 1520,
+        'following': 310,
+        'posts_count': 87,
+        'username': 'loja',
+        'biography': 'Moda praia feita em Natal/RN',
+        'profile_pic_url': 'https://cdn.example/loja.jpg',
+        'is_business_account': True,
+        'last_post_date': '2024-03-09'
+    }
+    # No HTML, o mesmo objeto aparece dentro do blob da página
+    page = f'<html><script type="application/json">{body}</script></html>'
+    assert parse_profile_page(page, 'loja') == parse_profile_info(body)
+    assert parse_profile_page(page)['followers'] == 1520
+
+
+def test_profile_info_api_count_fields():
+    parsed = parse_profile_info(profile_info({'username': 'loja', 'follower_count': 10,
+                                              'following_count': 2, 'media_count': 3}))
+    assert (parsed['followers'], parsed['following'], parsed['posts_count']) == (10, 2, 3)
+
+
+def test_profile_info_without_user():
+    assert parse_profile_info('{"data": {"user": null}}') == {}
+    assert parse_profile_info('<html>login</html>') == {}
+
+
+def test_profile_page_ignores_other_users():
+    page = ('<meta property="og:description" content="1,520 Followers, 310 Following, 87 Posts - '
+            'See Instagram photos and videos from Loja (@loja)">'
+            '<script>{"related": [{"user": {"username": "outra_loja", "follower_count": 999999,'
+            ' "biography": "Outra bio qualquer", "is_business_account": true}}],'
+            ' "node": {"taken_at_timestamp": 1710000000}}</script>')
+    # Sem o objeto do dono, só a meta description
+    assert parse_profile_page(page, 'loja') == {'followers': 1520, 'following': 310,
+                                                'posts_count': 87, 'username': 'loja'}
+
+
+def test_profile_page_meta_of_another_profile():
+    page = ('<meta name="description" content="5 seguidores, 1 seguindo, 2 publicações - '
+            'Veja as fotos e vídeos do Instagram de Outra (@outra_loja)">')
+    assert parse_profile_page(page, 'loja') == {}
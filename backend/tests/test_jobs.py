@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+from jobs import (JobManager, STATUS_DONE, STATUS_FAILED, STATUS_QUEUED, STATUS_RUNNING,
+                  create_job_backend)
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def backend(request):
+    if request.param == 'redis':
+        fakeredis = pytest.importorskip('fakeredis')
+        return create_job_backend(redis_client=fakeredis.FakeRedis())
+    return create_job_backend('memory')
+
+
+def wait_status(manager, job_id, statuses, timeout=5.0):
+    end = time.time() + timeout
+    job = manager.get(job_id)
+    while job['status'] not in statuses and time.time() < end:
+        time.sleep(0.02)
+        job = manager.get(job_id)
+    return job
+
+
+def test_worker_runs_job(backend):
+    manager = JobManager(backend, workers=1)
+    manager.register('soma', lambda payload: payload['a'] + payload['b'])
+    try:
+        job = manager.submit('soma', {'a': 2, 'b': 3})
+        assert job['status'] == STATUS_QUEUED
+        job = wait_status(manager, job['id'], (STATUS_DONE, STATUS_FAILED))
+        assert job['status'] == STATUS_DONE
+        assert job['result'] == 5
+    finally:
+        manager.stop()
+
+
+def test_failed_job_keeps_error(backend):
+    manager = JobManager(backend, workers=0)
+
+    def falha(payload):
+        raise RuntimeError('site fora do ar')
+
+    manager.register('falha', falha)
+    job = manager.submit('falha', {})
+    manager.run_job(backend.get(job['id']))
+    job = manager.get(job['id'])
+    assert job['status'] == STATUS_FAILED
+    assert job['error'] == 'site fora do ar'
+
+
+def test_running_job_without_heartbeat_is_marked_failed(backend):
+    manager = JobManager(backend, workers=0, stale_after=30)
+    manager.register('analisar', lambda payload: None)
+    job = manager.submit('analisar', {})
+    # Worker que marcou o job como 'running' e morreu há um minuto
+    job.update(status=STATUS_RUNNING, started_ts=time.time() - 60, heartbeat_at=time.time() - 60)
+    backend.save(job)
+
+    job = manager.get(job['id'])
+    assert job['status'] == STATUS_FAILED
+    assert 'heartbeat' in job['error']
+    assert backend.get(job['id'])['status'] == STATUS_FAILED
+
+
+def test_heartbeat_keeps_long_job_running(backend):
+    manager = JobManager(backend, workers=1, heartbeat_interval=0.05, stale_after=0.2)
+    manager.register('lento', lambda payload: time.sleep(0.6) or 'ok')
+    try:
+        job = manager.submit('lento', {})
+        job = wait_status(manager, job['id'], (STATUS_RUNNING,))
+        time.sleep(0.4)
+        assert manager.get(job['id'])['status'] == STATUS_RUNNING
+        assert wait_status(manager, job['id'], (STATUS_DONE, STATUS_FAILED))['status'] == STATUS_DONE
+    finally:
+        manager.stop()
+
+
+def test_job_over_max_runtime_is_marked_failed(backend):
+    manager = JobManager(backend, workers=0, max_runtime=10)
+    manager.register('analisar', lambda payload: None)
+    job = manager.submit('analisar', {})
+    job.update(status=STATUS_RUNNING, started_ts=time.time() - 20, heartbeat_at=time.time())
+    backend.save(job)
+    assert manager.get(job['id'])['status'] == STATUS_FAILED
+
+
+def test_job_marked_failed_stays_failed(backend):
+    manager = JobManager(backend, workers=1, heartbeat_interval=0.05)
+    release = threading.Event()
+    manager.register('travado', lambda payload: release.wait(5) and 'ok')
+    try:
+        job = manager.submit('travado', {})
+        wait_status(manager, job['id'], (STATUS_RUNNING,))
+        manager.max_runtime = 0.01
+        time.sleep(0.05)
+        assert manager.get(job['id'])['status'] == STATUS_FAILED
+        manager.max_runtime = 900
+
+        # Os heartbeats seguintes não devolvem o job para 'running'
+        time.sleep(0.3)
+        assert backend.get(job['id'])['status'] == STATUS_FAILED
+
+        # Nem a gravação final do worker sobrescreve a falha
+        release.set()
+        time.sleep(0.3)
+        job = manager.get(job['id'])
+        assert job['status'] == STATUS_FAILED
+        assert 'Tempo máximo' in job['error']
+        assert job['result'] is None
+    finally:
+        release.set()
+        manager.stop()
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from persistence import PERSIST_CONFIG, WriteBehindPersister, _try_lock
+
+
+class FlakyInsert:
+    """insert_batch que falha nas primeiras chamadas e registra as linhas gravadas"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.rows = []
+
+    def __call__(self, rows):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('banco indisponível')
+        self.rows.extend(rows)
+
+
+@pytest.fixture
+def persister_factory(tmp_path, monkeypatch):
+    monkeypatch.setitem(PERSIST_CONFIG, 'replay_interval', 0)
+    persisters = []
+
+    def factory(insert):
+        persister = WriteBehindPersister(insert, journal_path=str(tmp_path / 'journal.jsonl'),
+                                         flush_interval=0.05, max_retries=0)
+        persisters.append(persister)
+        return persister
+
+    yield factory
+    for persister in persisters:
+        persister._stop.set()
+
+
+def write_journal(path, entries):
+    with open(path, 'w', encoding='utf-8') as journal:
+        for entry in entries:
+            journal.write(json.dumps(entry) + '\n')
+
+
+def test_failed_batch_is_replayed_once(persister_factory):
+    insert = FlakyInsert(failures=1)
+    persister = persister_factory(insert)
+    persister.enqueue({'website_url': 'https://loja.com'})
+    persister.enqueue({'website_url': 'https://outra.com'})
+
+    assert persister.flush(timeout=5)
+    assert sorted(row['website_url'] for row in insert.rows) == ['https://loja.com', 'https://outra.com']
+    assert persister.stats()['failed_attempts'] == 1
+    # Tudo confirmado: o journal foi reescrito vazio
+    assert WriteBehindPersister._read_journal(persister.journal_path) == {}
+
+
+def test_orphan_journal_is_adopted(tmp_path, persister_factory):
+    orphan = tmp_path / 'journal.99999.jsonl'
+    write_journal(orphan, [
+        {'id': 'a', 'row': {'website_url': 'https://gravada.com'}},
+        {'id': 'b', 'row': {'website_url': 'https://pendente.com'}},
+        {'ack': ['a']}
+    ])
+    insert = FlakyInsert()
+    persister = persister_factory(insert)
+    persister.start()
+
+    assert persister.flush(timeout=5)
+    # Só a linha sem 'ack' é reenviada, e o journal do processo encerrado some
+    assert insert.rows == [{'website_url': 'https://pendente.com'}]
+    assert not orphan.exists()
+
+
+def test_journal_of_live_process_is_left_alone(tmp_path, persister_factory):
+    journal = tmp_path / 'journal.99999.jsonl'
+    write_journal(journal, [{'id': 'a', 'row': {'website_url': 'https://loja.com'}}])
+    with open(str(journal) + '.lock', 'a') as lock_handle:
+        assert _try_lock(lock_handle)
+        insert = FlakyInsert()
+        persister = persister_factory(insert)
+        persister.start()
+        assert persister.flush(timeout=1)
+
+    assert insert.rows == []
+    assert journal.exists()
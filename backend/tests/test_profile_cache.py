@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from scraper_modules.profile_cache import ProfileCache, STATUS_FRESH, STATUS_MISS, STATUS_STALE
+
+FIELD_TTLS = {'followers': 3600, 'following': 3600, 'posts_count': 3600, 'bio_complete': 3600}
+
+
+def make_cache(tmp_path):
+    return ProfileCache(str(tmp_path / 'profiles.sqlite'), FIELD_TTLS)
+
+
+def complete_profile():
+    return {'followers': 120, 'following': 80, 'posts_count': 15, 'bio_complete': True}
+
+
+def wait_refresh(cache, username, timeout=2.0):
+    end = time.time() + timeout
+    while username in cache._refreshing and time.time() < end:
+        time.sleep(0.01)
+
+
+def test_complete_profile_is_served_fresh(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.get_or_refresh('loja', complete_profile)['snapshot']['status'] == STATUS_MISS
+    response = cache.get_or_refresh('loja', lambda: pytest.fail('não deveria buscar'))
+    assert response['snapshot']['status'] == STATUS_FRESH
+    assert response['followers'] == 120
+
+
+def test_partial_result_is_not_served_fresh(tmp_path):
+    cache = make_cache(tmp_path)
+    partial = {'followers': None, 'following': None, 'posts_count': 15, 'bio_complete': True,
+               'partial': True, 'missing_fields': ['followers', 'following']}
+    first = cache.get_or_refresh('loja', lambda: partial)
+    assert first['snapshot']['status'] == STATUS_MISS
+    assert first['partial'] is True
+
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return complete_profile()
+
+    second = cache.get_or_refresh('loja', fetch)
+    assert second['snapshot']['status'] == STATUS_STALE
+    assert set(second['snapshot']['stale_fields']) == {'followers', 'following'}
+
+    wait_refresh(cache, 'loja')
+    assert fetches == [1]
+    third = cache.get_or_refresh('loja', fetch)
+    assert third['snapshot']['status'] == STATUS_FRESH
+    assert third['followers'] == 120
+
+
+def test_partial_result_keeps_previous_values(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.store('loja', complete_profile())
+    snapshot = cache.store('loja', {'followers': None, 'posts_count': 16, 'partial': True,
+                                    'missing_fields': ['followers']})
+    assert snapshot.data['followers'] == 120
+    assert snapshot.data['posts_count'] == 16
+    assert 'partial' not in snapshot.data